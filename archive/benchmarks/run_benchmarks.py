@@ -0,0 +1,214 @@
+"""
+End-to-end benchmark suite for CyberSentinel.
+
+Times preprocessing, every trainer method, the scan pipeline at several
+batch sizes, SHAP/LIME explanations and report generation on synthetic
+MalMem-shaped data. Records wall time, peak RSS and throughput, and
+compares the run against a stored baseline.
+
+Usage:
+    python benchmarks/run_benchmarks.py --rows 20000 --save-baseline
+    python benchmarks/run_benchmarks.py --rows 20000 --compare
+    python benchmarks/run_benchmarks.py --rows 5000 --skip-slow
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import numpy as np
+import pandas as pd
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BASE_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, os.path.join(BASE_DIR, 'src'))
+
+from data_preprocessing import DataPreprocessor
+from base_models import BaseModelTrainer
+from advanced_models import AdvancedModelTrainer
+from scan_pipeline import ScanPreprocessor, ThreatScanner
+from fast_mlp import accelerate
+from report_generator import ForensicsReportGenerator
+from synthetic_data import load_synthesizer
+from tracing import rss_bytes
+
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, 'baseline.json')
+class Sampler:
+    """Tracks peak RSS on a background thread while a benchmark case runs."""
+
+    def __init__(self, interval=0.01):
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, rss_bytes())
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self.start_rss = rss_bytes()
+        self.peak = self.start_rss
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, rss_bytes())
+
+class BenchmarkSuite:
+    def __init__(self, synth, rows, scan_sizes, skip_slow=False, workdir=None):
+        self.synth = synth
+        self.rows = rows
+        self.scan_sizes = scan_sizes
+        self.skip_slow = skip_slow
+        self.workdir = workdir
+        self.results = {}
+
+    def measure(self, name, fn, n_rows=None):
+        """Runs fn once and records wall time, peak RSS and rows/s."""
+        with Sampler() as s:
+            start = time.perf_counter()
+            out = fn()
+            wall = time.perf_counter() - start
+        rec = {
+            'wall_s': wall,
+            'peak_rss_mb': s.peak / 2**20,
+            'rss_delta_mb': (s.peak - s.start_rss) / 2**20,
+        }
+        if n_rows:
+            rec['rows'] = n_rows
+            rec['rows_per_s'] = n_rows / wall if wall > 0 else float('inf')
+        self.results[name] = rec
+        print(f"{name:<45} {wall:>9.3f}s {rec['peak_rss_mb']:>9.1f} MB"
+              + (f" {rec['rows_per_s']:>12,.0f} rows/s" if n_rows else ""))
+        return out
+
+    def run(self):
+        csv_path = os.path.join(self.workdir, 'malmem_synthetic.csv')
+        self.synth.write_csv(csv_path, self.rows)
+
+        # Preprocessing
+        dp = DataPreprocessor(csv_path)
+        self.measure('preprocess.load_data', dp.load_data, self.rows)
+        self.measure('preprocess.clean_and_encode', dp.clean_and_encode, self.rows)
+        X_train, X_test, y_train, y_test, y_mal_train, y_mal_test = self.measure(
+            'preprocess.split_data', dp.split_data, self.rows)
+        n_train = len(X_train)
+
+        # Base models
+        base = BaseModelTrainer(X_train, y_train, X_test, y_test)
+        self.measure('base.train_models', base.train_models, n_train)
+        self.measure('base.save_models', lambda: base.save_models(os.path.join(self.workdir, 'models')))
+
+        # Advanced models (save_models writes to ./models, i.e. the temporary workdir)
+        adv = AdvancedModelTrainer(X_train, y_train, X_test, y_test, y_mal_train, y_mal_test)
+        if not self.skip_slow:
+            self.measure('advanced.build_and_optimize_mlp', adv.build_and_optimize_mlp, n_train)
+        self.measure('advanced.train_malware_type_model', adv.train_malware_type_model, n_train)
+        self.measure('advanced.train_ensemble_model', adv.train_ensemble_model, n_train)
+        self.measure('advanced.train_anomaly_detector', adv.train_anomaly_detector, n_train)
+        self.measure('advanced.save_models', adv.save_models)
+
+        # Explanations
+        if adv.best_model is not None:
+            self.measure('explain.shap', adv.explain_with_shap, 1)
+            self.measure('explain.lime', adv.explain_with_lime, 1)
+
+        # Scan pipeline
+        scanner = ThreatScanner(ScanPreprocessor(dp.scaler, X_train.columns, dp.dtype),
+                                adv.ensemble_model, adv.anomaly_model, adv.malware_model,
+                                dp.get_malware_classes())
+        results = None
+        for size in self.scan_sizes:
+            upload = pd.concat(self.synth.generate(size, seed=size)).drop(columns=['Class', 'Category'])
+            results = self.measure(f'scan.rows_{size}', lambda: scanner.scan(upload), size)
+        fast = ThreatScanner(scanner.preprocessor, accelerate(adv.ensemble_model), adv.anomaly_model,
+                             accelerate(adv.malware_model), dp.get_malware_classes())
+        for size in self.scan_sizes:
+            upload = pd.concat(self.synth.generate(size, seed=size)).drop(columns=['Class', 'Category'])
+            self.measure(f'scan.fast_mlp.rows_{size}', lambda: fast.scan(upload), size)
+
+        # Reporting
+        gen = ForensicsReportGenerator()
+        self.measure('report.generate_report', lambda: gen.generate_report(results), len(results))
+        return self.results
+
+def metadata(args):
+    return {
+        'rows': args.rows,
+        'scan_sizes': args.scan_sizes,
+        'skip_slow': args.skip_slow,
+        'synthesizer': args.profile or args.data or 'data_info.txt prior',
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+    }
+
+def compare(results, baseline, threshold):
+    """Prints the wall-time ratio per case; returns the cases slower than baseline by more than threshold."""
+    regressions = []
+    print(f"\n{'case':<45} {'baseline':>10} {'current':>10} {'ratio':>7}")
+    for name, rec in results.items():
+        base = baseline.get(name)
+        if base is None:
+            print(f"{name:<45} {'-':>10} {rec['wall_s']:>9.3f}s {'new':>7}")
+            continue
+        ratio = rec['wall_s'] / base['wall_s'] if base['wall_s'] > 0 else float('inf')
+        flag = " !" if ratio > 1 + threshold else ""
+        print(f"{name:<45} {base['wall_s']:>9.3f}s {rec['wall_s']:>9.3f}s {ratio:>6.2f}x{flag}")
+        if flag:
+            regressions.append(name)
+    return regressions
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="CyberSentinel benchmark suite")
+    parser.add_argument("--rows", type=int, default=20000, help="synthetic training rows")
+    parser.add_argument("--data", help="real MalMem CSV to fit the synthesizer on")
+    parser.add_argument("--profile", help="saved synthesizer profile (see src/synthetic_data.py)")
+    parser.add_argument("--scan-sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--skip-slow", action="store_true", help="skip the MLP hyperparameter search and explanations")
+    parser.add_argument("--out", help="write results JSON here")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--compare", action="store_true")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown before a case is flagged")
+    args = parser.parse_args()
+
+    synth = load_synthesizer(args.data, args.profile)
+    workdir = tempfile.mkdtemp(prefix="cybersentinel_bench_")
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        results = BenchmarkSuite(synth, args.rows, args.scan_sizes, args.skip_slow, workdir).run()
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {'meta': metadata(args), 'results': results}
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump(report, f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+    if args.compare:
+        if not os.path.exists(args.baseline):
+            sys.exit(f"No baseline at {args.baseline}; run with --save-baseline first")
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline['meta'].get('rows') != args.rows:
+            print(f"Warning: baseline used {baseline['meta'].get('rows')} rows, this run used {args.rows}")
+        regressions = compare(results, baseline['results'], args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}: {', '.join(regressions)}")
+            sys.exit(1)
@@ -0,0 +1,66 @@
+"""
+Microbenchmark: pandas scan preprocessing vs. the ScanPreprocessor NumPy path.
+
+Usage:
+    python benchmarks/scan_preprocess_bench.py [rows ...]
+"""
+
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import StandardScaler
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BASE_DIR, 'src'))
+
+from scan_pipeline import ScanPreprocessor
+
+def feature_names():
+    return pd.read_csv(os.path.join(BASE_DIR, 'test_sample.csv'), nrows=0).columns.tolist()
+
+def make_upload(n_rows, features, seed=0):
+    """Uploaded-CSV-shaped frame: shuffled column order, label columns, mixed int/float dtypes."""
+    rng = np.random.default_rng(seed)
+    data = {}
+    for i, f in enumerate(features):
+        col = rng.gamma(2.0, 50.0, n_rows)
+        data[f] = col.astype(np.int64) if i % 2 == 0 else col
+    df = pd.DataFrame(data)
+    df['Category'] = 'Benign'
+    df['Class'] = 'Benign'
+    return df[list(rng.permutation(df.columns))]
+
+def pandas_path(input_df, scaler, columns):
+    """The scan handler's original preprocessing chain."""
+    scan_df = input_df.copy()
+    for c in ['Class', 'Category']:
+        if c in scan_df.columns: scan_df = scan_df.drop(columns=[c])
+    scan_df = scan_df[columns]
+    return scaler.transform(scan_df)
+
+def best_of(fn, repeats):
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def run(sizes=(1_000, 100_000, 1_000_000), repeats=3):
+    features = feature_names()
+    scaler = StandardScaler().fit(make_upload(1_000, features, seed=1)[features])
+    prep = ScanPreprocessor(scaler, features)
+
+    print(f"{'rows':>10} {'pandas (s)':>12} {'numpy (s)':>12} {'speedup':>8}")
+    for n in sizes:
+        upload = make_upload(n, features)
+        assert np.allclose(pandas_path(upload, scaler, features), prep.transform(upload))
+        t_pd = best_of(lambda: pandas_path(upload, scaler, features), repeats)
+        t_np = best_of(lambda: prep.transform(upload), repeats)
+        print(f"{n:>10,} {t_pd:>12.4f} {t_np:>12.4f} {t_pd / t_np:>7.1f}x")
+
+if __name__ == "__main__":
+    sizes = [int(a) for a in sys.argv[1:]] or (1_000, 100_000, 1_000_000)
+    run(sizes)
@@ -0,0 +1,126 @@
+"""
+Startup-time budget check for the Streamlit app.
+
+Streamlit re-executes src/app.py on every interaction, and the first run
+pays for every module-level import. This script replays the app's
+module-level imports (which include ui.py, but not the page modules in
+views/) in a fresh interpreter (no Streamlit server needed),
+times them, and fails if they exceed the budget or pull in any of the
+heavy modules that should only load on the page that needs them.
+
+Each page module (views.<page>) is also imported on its own in a fresh
+interpreter, and may load only the deferred modules listed for it in
+PAGE_ALLOWED. tests/test_startup_imports.py runs the same checks under
+pytest.
+
+Usage:
+    python benchmarks/startup_budget.py                 # default 2.5 s budget
+    python benchmarks/startup_budget.py --budget 1.5 --repeats 5
+    python benchmarks/startup_budget.py --top 15        # slowest imports (python -X importtime)
+"""
+
+import argparse
+import ast
+import json
+import os
+import re
+import subprocess
+import sys
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC_DIR = os.path.join(BASE_DIR, 'src')
+APP = os.path.join(SRC_DIR, 'app.py')
+
+# Seconds allowed for app.py's module-level imports in a cold interpreter (best of a few runs)
+BUDGET_SECONDS = 2.5
+
+# Must not be imported until a page that uses them is opened
+DEFERRED = ('shap', 'lime', 'matplotlib', 'plotly', 'sklearn.neural_network',
+            'sklearn.model_selection', 'sklearn.decomposition', 'advanced_models', 'report_generator',
+            'data_preprocessing', 'views')
+
+PAGES = ('dashboard', 'scan', 'train', 'history', 'diagnostics')
+
+# Deferred modules a page may load when it is opened; everything else in DEFERRED must stay unloaded.
+# scan and train load scikit-learn estimators, which import model_selection and decomposition themselves.
+PAGE_ALLOWED = {
+    'dashboard': ('plotly',),
+    'scan': ('sklearn.model_selection', 'sklearn.decomposition'),
+    'train': ('advanced_models', 'sklearn.neural_network', 'sklearn.model_selection', 'sklearn.decomposition'),
+    'history': (),
+    'diagnostics': (),
+}
+
+def module_level_imports(path=APP):
+    """Source of the import statements executed when the app script starts."""
+    with open(path, encoding='utf-8') as f:
+        tree = ast.parse(f.read())
+    return [ast.unparse(node) for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom))]
+
+PROBE = """
+import json, sys, time
+sys.path.insert(0, {src!r})
+start = time.perf_counter()
+{imports}
+elapsed = time.perf_counter() - start
+print(json.dumps({{'seconds': elapsed, 'loaded': [m for m in {deferred!r}
+                                              if m in sys.modules or any(k.startswith(m + '.') for k in sys.modules)]}}))
+"""
+
+def probe(imports, extra_args=()):
+    code = PROBE.format(src=SRC_DIR, imports="\n".join(imports), deferred=DEFERRED)
+    proc = subprocess.run([sys.executable, *extra_args, '-c', code], capture_output=True, text=True, cwd=BASE_DIR)
+    if proc.returncode != 0:
+        sys.exit(f"App imports failed:\n{proc.stderr}")
+    return json.loads(proc.stdout.strip().splitlines()[-1]), proc.stderr
+
+def measure(imports=None, repeats=3):
+    """Best cold import time of `imports` (app.py's by default) and the deferred modules any run loaded."""
+    imports = module_level_imports() if imports is None else imports
+    runs = [probe(imports)[0] for _ in range(repeats)]
+    return min(r['seconds'] for r in runs), sorted(set(m for r in runs for m in r['loaded']))
+
+def page_violations(page):
+    """Deferred modules that importing views.<page> loads but the page is not allowed to."""
+    result, _ = probe([f"import views.{page}"])
+    return [m for m in result['loaded'] if m != 'views' and m not in PAGE_ALLOWED[page]]
+
+def slowest_imports(imports, top):
+    """Top-level packages by cumulative import time, from python -X importtime."""
+    _, stderr = probe(imports, ('-X', 'importtime'))
+    rows = []
+    for line in stderr.splitlines():
+        m = re.match(r"import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)", line)
+        if m and not m.group(3):  # top-level entries only
+            rows.append((int(m.group(2)) / 1e6, m.group(4)))
+    return sorted(rows, reverse=True)[:top]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check app.py startup imports against a time budget")
+    parser.add_argument("--budget", type=float, default=BUDGET_SECONDS, help="seconds allowed for the app's module-level imports")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--top", type=int, default=0, help="also list the N slowest imports")
+    args = parser.parse_args()
+
+    imports = module_level_imports()
+    best, loaded = measure(imports, args.repeats)
+
+    print(f"{len(imports)} module-level imports in app.py")
+    print(f"Cold import time: best {best:.3f}s of {args.repeats} (budget {args.budget:.3f}s)")
+    if args.top:
+        print(f"\n{'seconds':>9}  module")
+        for seconds, name in slowest_imports(imports, args.top):
+            print(f"{seconds:>9.3f}  {name}")
+
+    failures = []
+    if best > args.budget:
+        failures.append(f"startup imports took {best:.3f}s, over the {args.budget:.3f}s budget")
+    if loaded:
+        failures.append(f"deferred modules imported at startup: {', '.join(loaded)}")
+    for page in PAGES:
+        extra = page_violations(page)
+        if extra:
+            failures.append(f"views.{page} imports {', '.join(extra)}")
+    if failures:
+        sys.exit("FAIL: " + "; ".join(failures))
+    print("OK")
@@ -0,0 +1,210 @@
+"""
+Anomaly detection against a benign baseline, with a calibrated threshold.
+
+The old detector was an IsolationForest(contamination=0.1) fitted on all
+training rows, malware included, and the scan path flagged
+decision_function < 0. The threshold had nothing to do with how often
+benign rows are flagged, so the anomaly queue was large and noisy.
+
+AnomalyDetector:
+
+- fits the forest on benign rows only (baseline='benign'), sub-sampled
+  (max_samples rows per tree) and in parallel (n_jobs)
+- holds out part of the baseline as a validation split and sets the
+  threshold so that `target_fpr` of those benign rows are flagged
+- keeps decision_function's sign convention (negative = anomaly), so the
+  scanner, history and reports are unchanged
+- scores through FlatForest: every tree flattened into a few shared
+  NumPy arrays and walked level by level for a whole batch at once, in
+  streaming batches of `batch_size` rows
+
+The flattened arrays are plain ndarrays, so load_detector() can
+memory-map them from an uncompressed joblib file. Processes scoring with
+the same model share the pages, and repeated loads of an unchanged file
+hit a cache.
+
+    python src/anomaly.py --data malmem.csv                     # fit, calibrate, save models/anomaly_detector.pkl
+    python src/anomaly.py --data malmem.csv --target-fpr 0.005 --baseline all
+"""
+
+import argparse
+import os
+import numpy as np
+from sklearn.base import BaseEstimator
+from sklearn.ensemble import IsolationForest
+
+def average_path_length(n):
+    """Expected path length of an unsuccessful BST search over n points (IsolationForest's c(n))."""
+    n = np.asarray(n, dtype=np.float64)
+    out = np.zeros_like(n)
+    out[n == 2] = 1.0
+    big = n > 2
+    out[big] = 2.0 * (np.log(n[big] - 1.0) + np.euler_gamma) - 2.0 * (n[big] - 1.0) / n[big]
+    return out
+
+class FlatForest:
+    """The trees of a fitted IsolationForest as concatenated node arrays, scored a batch at a time."""
+
+    def __init__(self, forest):
+        lefts, rights, features, thresholds, path_lengths, roots = [], [], [], [], [], []
+        offset = 0
+        subsample = any(len(f) != forest.n_features_in_ for f in forest.estimators_features_)
+        for est, feats in zip(forest.estimators_, forest.estimators_features_):
+            tree = est.tree_
+            n = tree.node_count
+            left, right = tree.children_left.astype(np.int64), tree.children_right.astype(np.int64)
+            leaf = left == -1
+            idx = np.arange(n)
+            depth = np.zeros(n, dtype=np.float64)
+            for node in range(n):  # children always come after their parent
+                if not leaf[node]:
+                    depth[left[node]] = depth[right[node]] = depth[node] + 1
+            # Leaves point to themselves, so walking max_depth levels leaves every row on its leaf
+            lefts.append(np.where(leaf, idx, left) + offset)
+            rights.append(np.where(leaf, idx, right) + offset)
+            feature = np.where(leaf, 0, tree.feature)
+            features.append(np.asarray(feats)[feature] if subsample else feature)
+            thresholds.append(np.where(leaf, np.inf, tree.threshold))
+            path_lengths.append(depth + average_path_length(tree.n_node_samples))
+            roots.append(offset)
+            offset += n
+        self.left = np.concatenate(lefts).astype(np.int32)
+        self.right = np.concatenate(rights).astype(np.int32)
+        self.feature = np.concatenate(features).astype(np.int32)
+        self.threshold = np.concatenate(thresholds)
+        self.path_length = np.concatenate(path_lengths)
+        self.roots = np.asarray(roots, dtype=np.int32)
+        self.max_depth = max(est.tree_.max_depth for est in forest.estimators_)
+        self.denominator = len(forest.estimators_) * float(average_path_length([forest.max_samples_])[0])
+        self.n_features_in_ = forest.n_features_in_
+
+    def score_samples(self, X):
+        """Same values as IsolationForest.score_samples (lower = more anomalous)."""
+        # Trees compare float32 features against float64 thresholds, as sklearn does. Row-major,
+        # so each row's feature lookups stay within one cache line run
+        X = np.asarray(X, dtype=np.float32, order='C')
+        node = np.broadcast_to(self.roots, (len(X), len(self.roots))).copy()
+        for _ in range(self.max_depth):
+            values = np.take_along_axis(X, self.feature[node], axis=1)
+            node = np.where(values <= self.threshold[node], self.left[node], self.right[node])
+        return -np.exp2(-self.path_length[node].sum(axis=1) / self.denominator)
+
+class AnomalyDetector(BaseEstimator):
+    """IsolationForest on a benign baseline with a threshold calibrated to a target benign flag rate."""
+
+    def __init__(self, baseline='benign', target_fpr=0.01, n_estimators=100, max_samples=256, validation_size=0.2,
+                 n_jobs=-1, batch_size=8192, random_state=42):
+        self.baseline = baseline
+        self.target_fpr = target_fpr
+        self.n_estimators = n_estimators
+        self.max_samples = max_samples
+        self.validation_size = validation_size
+        self.n_jobs = n_jobs
+        self.batch_size = batch_size
+        self.random_state = random_state
+
+    def fit(self, X, y=None):
+        if hasattr(X, 'columns'):
+            self.feature_names_in_ = np.asarray(X.columns, dtype=object)
+        X = np.asarray(X)
+        if self.baseline == 'benign':
+            if y is None:
+                raise ValueError("baseline='benign' needs the binary labels (y) to select benign rows")
+            y = np.asarray(y)
+            base = np.flatnonzero(y == 0)
+        elif self.baseline == 'all':
+            base = np.arange(len(X))
+        else:
+            raise ValueError(f"baseline must be 'benign' or 'all', got {self.baseline!r}")
+        rng = np.random.default_rng(self.random_state)
+        base = rng.permutation(base)
+        n_val = int(len(base) * self.validation_size)
+        fit_rows, val_rows = base[n_val:], base[:n_val]
+
+        forest = IsolationForest(n_estimators=self.n_estimators, max_samples=min(self.max_samples, len(fit_rows)),
+                                 n_jobs=self.n_jobs, random_state=self.random_state).fit(X[fit_rows])
+        self.flat_ = FlatForest(forest)
+        self.n_features_in_ = forest.n_features_in_
+
+        # Validation: the held-out baseline rows, plus the malware rows the forest never saw
+        if y is not None and self.baseline == 'benign':
+            val_rows = np.concatenate([val_rows, np.flatnonzero(y != 0)])
+        self.calibrate(X[val_rows], None if y is None else y[val_rows])
+        return self
+
+    def calibrate(self, X_val, y_val=None):
+        """Sets threshold_ so that target_fpr of the benign (or, without labels, all) validation rows are flagged."""
+        scores = self.score_samples(X_val)
+        benign = scores if y_val is None else scores[np.asarray(y_val) == 0]
+        if not len(benign):
+            raise ValueError("no benign rows to calibrate the threshold on")
+        self.threshold_ = float(np.quantile(benign, self.target_fpr))
+        flagged = scores < self.threshold_
+        self.calibration_ = {
+            'threshold': self.threshold_,
+            'target_fpr': self.target_fpr,
+            'rows': int(len(scores)),
+            'benign_flag_rate': float(np.mean(benign < self.threshold_)),
+            'flag_rate': float(np.mean(flagged)),
+        }
+        if y_val is not None and np.any(np.asarray(y_val) != 0):
+            self.calibration_['malware_flag_rate'] = float(np.mean(flagged[np.asarray(y_val) != 0]))
+        return self.calibration_
+
+    def score_samples(self, X):
+        """Raw forest scores in streaming batches (lower = more anomalous)."""
+        X = X.to_numpy() if hasattr(X, 'to_numpy') else np.asarray(X)
+        out = np.empty(len(X), dtype=np.float64)
+        for start in range(0, len(X), self.batch_size):
+            out[start:start + self.batch_size] = self.flat_.score_samples(X[start:start + self.batch_size])
+        return out
+
+    def decision_function(self, X):
+        """Score relative to the calibrated threshold; negative means anomalous."""
+        return self.score_samples(X) - self.threshold_
+
+    def predict(self, X):
+        return np.where(self.decision_function(X) < 0, -1, 1)
+
+_loaded = {}
+
+def load_detector(path):
+    """Anomaly model with its arrays memory-mapped read-only, cached per file (path, mtime and size)."""
+    import joblib
+    st = os.stat(path)
+    key = (os.path.abspath(path), st.st_mtime_ns, st.st_size)
+    model = _loaded.get(key)
+    if model is None:
+        model = joblib.load(path, mmap_mode='r')
+        for old in [k for k in _loaded if k[0] == key[0]]:
+            del _loaded[old]
+        _loaded[key] = model
+    return model
+
+if __name__ == "__main__":
+    import time
+    import joblib
+    from data_preprocessing import DataPreprocessor
+
+    parser = argparse.ArgumentParser(description="Fit and calibrate the anomaly detector")
+    parser.add_argument("--data", default="malmem.csv")
+    parser.add_argument("--out", default="models/anomaly_detector.pkl")
+    parser.add_argument("--baseline", choices=["benign", "all"], default="benign")
+    parser.add_argument("--target-fpr", type=float, default=0.01, help="share of benign validation rows to flag")
+    parser.add_argument("--max-samples", type=int, default=256, help="rows sub-sampled per tree")
+    parser.add_argument("--jobs", type=int, default=-1)
+    args = parser.parse_args()
+
+    dp = DataPreprocessor(args.data)
+    X_train, X_test, y_train, y_test, _, _ = dp.split_data()
+    t0 = time.perf_counter()
+    detector = AnomalyDetector(baseline=args.baseline, target_fpr=args.target_fpr, max_samples=args.max_samples,
+                               n_jobs=args.jobs).fit(X_train, y_train)
+    print(f"Fitted in {time.perf_counter() - t0:.1f}s; calibration: {detector.calibration_}")
+    flagged = detector.predict(X_test) == -1
+    y_test = np.asarray(y_test)
+    print(f"Test split: {flagged.mean():.2%} flagged, benign {flagged[y_test == 0].mean():.2%}, "
+          f"malware {flagged[y_test != 0].mean():.2%}")
+    os.makedirs(os.path.dirname(args.out) or '.', exist_ok=True)
+    joblib.dump(detector, args.out)  # uncompressed, so load_detector can memory-map it
+    print(f"Saved to {args.out}")
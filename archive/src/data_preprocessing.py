@@ -1,88 +1,179 @@
-import pandas as pd
-import numpy as np
-from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import StandardScaler, LabelEncoder
-import os
-
-class DataPreprocessor:
-    def __init__(self, file_path):
-        self.file_path = file_path
-        self.df = None
-        self.target = 'Class'
-        self.malware_type_col = 'MalwareType'
-        self.X_train = None
-        self.X_test = None
-        self.y_train = None
-        self.y_test = None
-        self.y_mal_train = None
-        self.y_mal_test = None
-        self.scaler = StandardScaler()
-        self.label_encoder = LabelEncoder()
-        self.malware_encoder = LabelEncoder()
-
-    def load_data(self):
-        """Loads dataset from csv file."""
-        if not os.path.exists(self.file_path):
-            raise FileNotFoundError(f"File not found: {self.file_path}")
-        self.df = pd.read_csv(self.file_path)
-        print(f"Data loaded. Shape: {self.df.shape}")
-        return self.df
-
-    def clean_and_encode(self):
-        """Cleans data, encodes categorical columns and extracts MalwareType."""
-        if self.df is None:
-            self.load_data()
-            
-        # Extract Malware Type from Category
-        # Example: Ransomware-Ako-... -> Ransomware
-        if 'Category' in self.df.columns:
-            self.df[self.malware_type_col] = self.df['Category'].apply(lambda x: x.split('-')[0] if '-' in str(x) else x)
-            print(f"Extracted MalwareType. Unique values: {self.df[self.malware_type_col].unique()}")
-            
-            # Encode MalwareType
-            self.df[self.malware_type_col] = self.malware_encoder.fit_transform(self.df[self.malware_type_col])
-            print(f"MalwareType encoded. Classes: {self.malware_encoder.classes_}")
-            
-            # Drop original Category column
-            self.df = self.df.drop(columns=['Category'])
-
-        # Encode Target (Binary)
-        if self.target in self.df.columns:
-            self.df[self.target] = self.label_encoder.fit_transform(self.df[self.target])
-            # print(f"Target '{self.target}' encoded. Classes: {self.label_encoder.classes_}")
-            
-        return self.df
-
-    def split_data(self, test_size=0.2, random_state=42):
-        """Splits data into train and test sets for both binary and multiclass tasks."""
-        if self.df is None:
-            self.clean_and_encode()
-            
-        # Features
-        X = self.df.drop(columns=[self.target, self.malware_type_col])
-        
-        # Targets
-        y_binary = self.df[self.target]
-        y_malware = self.df[self.malware_type_col]
-        
-        # Scale features
-        X_scaled = self.scaler.fit_transform(X)
-        X = pd.DataFrame(X_scaled, columns=X.columns)
-        
-        # Split (stratified by binary class for now to ensure good benign/malware split)
-        self.X_train, self.X_test, self.y_train, self.y_test, self.y_mal_train, self.y_mal_test = train_test_split(
-            X, y_binary, y_malware, test_size=test_size, random_state=random_state, stratify=y_binary
-        )
-        
-        print(f"Data split. Train shape: {self.X_train.shape}")
-        return self.X_train, self.X_test, self.y_train, self.y_test, self.y_mal_train, self.y_mal_test
-
-    def get_malware_classes(self):
-        return self.malware_encoder.classes_
-
-if __name__ == "__main__":
-    # Test
-    dp = DataPreprocessor('malmem.csv')
-    dp.load_data()
-    dp.clean_and_encode()
-    dp.split_data()
+import pandas as pd
+import numpy as np
+from sklearn.model_selection import train_test_split
+from sklearn.preprocessing import StandardScaler, LabelEncoder
+import hashlib
+import joblib
+import os
+from tracing import traced
+
+def split_indices(labels, test_size=0.2, random_state=42):
+    """Stratified train/test row positions as int32 arrays."""
+    idx = np.arange(len(labels), dtype=np.int32)
+    train_idx, test_idx = train_test_split(idx, test_size=test_size, random_state=random_state, stratify=labels)
+    return train_idx, test_idx
+
+def split_key(labels, test_size, random_state, stratify):
+    """Identifies a split: it depends only on the labels it is stratified on and the split settings."""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(f"{len(labels)}|{test_size}|{random_state}|{stratify}".encode())
+    h.update(np.ascontiguousarray(labels).tobytes())
+    return h.hexdigest()
+
+def load_split(path, key):
+    """Saved (train_idx, test_idx) for `key`, or (None, None) if missing or made for other data."""
+    if not os.path.exists(path):
+        return None, None
+    with np.load(path) as saved:
+        if str(saved['key']) != key:
+            return None, None
+        return saved['train'], saved['test']
+
+def save_split(path, train_idx, test_idx, key):
+    directory = os.path.dirname(path)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory)
+    tmp = path + '.tmp.npz'
+    np.savez_compressed(tmp, train=train_idx, test=test_idx, key=np.array(key))
+    os.replace(tmp, path)
+
+class DataPreprocessor:
+    def __init__(self, file_path, dtype=np.float64):
+        self.file_path = file_path
+        # Opt-in float32 halves memory bandwidth for training and scanning
+        self.dtype = np.dtype(dtype)
+        self.df = None
+        self.target = 'Class'
+        self.malware_type_col = 'MalwareType'
+        self.train_idx = None
+        self.test_idx = None
+        self.feature_names = None
+        self._X_train = None
+        self._X_test = None
+        self.y_train = None
+        self.y_test = None
+        self.y_mal_train = None
+        self.y_mal_test = None
+        self.scaler = StandardScaler()
+        self.label_encoder = LabelEncoder()
+        self.malware_encoder = LabelEncoder()
+
+    @traced('preprocess.load_data')
+    def load_data(self):
+        """Loads dataset from csv file."""
+        if not os.path.exists(self.file_path):
+            raise FileNotFoundError(f"File not found: {self.file_path}")
+        self.df = pd.read_csv(self.file_path)
+        print(f"Data loaded. Shape: {self.df.shape}")
+        return self.df
+
+    @traced('preprocess.clean_and_encode')
+    def clean_and_encode(self):
+        """Cleans data, encodes categorical columns and extracts MalwareType."""
+        if self.df is None:
+            self.load_data()
+            
+        # Extract Malware Type from Category
+        # Example: Ransomware-Ako-... -> Ransomware
+        if 'Category' in self.df.columns:
+            self.df[self.malware_type_col] = self.df['Category'].apply(lambda x: x.split('-')[0] if '-' in str(x) else x)
+            print(f"Extracted MalwareType. Unique values: {self.df[self.malware_type_col].unique()}")
+            
+            # Encode MalwareType
+            self.df[self.malware_type_col] = self.malware_encoder.fit_transform(self.df[self.malware_type_col])
+            print(f"MalwareType encoded. Classes: {self.malware_encoder.classes_}")
+            
+            # Drop original Category column
+            self.df = self.df.drop(columns=['Category'])
+
+        # Encode Target (Binary)
+        if self.target in self.df.columns:
+            self.df[self.target] = self.label_encoder.fit_transform(self.df[self.target])
+            # print(f"Target '{self.target}' encoded. Classes: {self.label_encoder.classes_}")
+            
+        return self.df
+
+    @traced('preprocess.split_data')
+    def split_data(self, test_size=0.2, random_state=42, stratify=None, split_path='models/split_indices.npz'):
+        """Splits data into train and test sets for both binary and multiclass tasks.
+
+        The split is stratified on `stratify` (the binary Class by default,
+        or MalwareType, which keeps both the family and the benign/malware
+        balance). Its indices are saved to `split_path` and reused while the
+        labels and split settings are unchanged. The scaler is fitted on the
+        training rows only; X_test is scaled on first access.
+        """
+        if self.df is None:
+            self.clean_and_encode()
+        stratify = stratify or self.target
+        labels = self.df[stratify].to_numpy()
+        key = split_key(labels, test_size, random_state, stratify)
+        self.train_idx, self.test_idx = load_split(split_path, key) if split_path else (None, None)
+        if self.train_idx is None:
+            self.train_idx, self.test_idx = split_indices(labels, test_size, random_state)
+            if split_path:
+                save_split(split_path, self.train_idx, self.test_idx, key)
+
+        self.feature_names = [c for c in self.df.columns if c not in (self.target, self.malware_type_col)]
+        self.y_train, self.y_test = self.df[self.target].iloc[self.train_idx], self.df[self.target].iloc[self.test_idx]
+        self.y_mal_train = self.df[self.malware_type_col].iloc[self.train_idx]
+        self.y_mal_test = self.df[self.malware_type_col].iloc[self.test_idx]
+
+        # Fit on the training rows only and scale them in place (StandardScaler keeps float32 input as float32)
+        self._X_train = self._rows(self.train_idx)
+        self.scaler.fit(self._X_train)
+        self.scaler.transform(self._X_train, copy=False)
+        self._X_test = None
+
+        print(f"Data split. Train shape: {self._X_train.shape}")
+        return self.X_train, self.X_test, self.y_train, self.y_test, self.y_mal_train, self.y_mal_test
+
+    def _rows(self, idx):
+        """Feature rows as one array of the working dtype, without copying the whole frame first."""
+        cols = [self.df.columns.get_loc(c) for c in self.feature_names]
+        return np.ascontiguousarray(self.df.iloc[idx, cols].to_numpy(dtype=self.dtype))
+
+    def _frame(self, X, idx):
+        return pd.DataFrame(X, columns=self.feature_names, index=self.df.index[idx], copy=False)
+
+    @property
+    def X_train(self):
+        return None if self._X_train is None else self._frame(self._X_train, self.train_idx)
+
+    @property
+    def X_test(self):
+        if self.test_idx is None:
+            return None
+        if self._X_test is None:
+            self._X_test = self.scaler.transform(self._rows(self.test_idx), copy=False)
+        return self._frame(self._X_test, self.test_idx)
+
+    def get_malware_classes(self):
+        return self.malware_encoder.classes_
+
+    def save_artifacts(self, path='models/preprocessor.pkl'):
+        """Saves what the scan path needs (scaler, feature order, family names) so it can run without the dataset."""
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        joblib.dump({
+            'scaler': self.scaler,
+            'feature_names': list(self.feature_names),
+            'malware_classes': list(self.malware_encoder.classes_),
+            'dtype': self.dtype.name
+        }, path)
+        print(f"Saved preprocessing artifacts to {path}")
+        return path
+
+    @staticmethod
+    def load_artifacts(path='models/preprocessor.pkl'):
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"File not found: {path}")
+        return joblib.load(path)
+
+if __name__ == "__main__":
+    # Test
+    dp = DataPreprocessor('malmem.csv')
+    dp.load_data()
+    dp.clean_and_encode()
+    dp.split_data()
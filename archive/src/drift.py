@@ -0,0 +1,214 @@
+"""
+Feature drift monitoring for scanned rows.
+
+The training distribution is summarised once per feature: quantile bin
+edges, the share of training rows in each bin, and the mean and variance.
+Scanned rows (scaled, as the models see them) are folded into the same
+bins with one searchsorted per feature per batch. Mean and variance are
+merged with Chan's parallel update. State is a fixed number of counters
+per feature, however many rows are scanned.
+
+check() compares the two distributions per feature:
+
+- PSI over the quantile bins
+- KS distance between the binned CDFs (at the training quantiles)
+- mean shift in training standard deviations, and the ratio of standard
+  deviations
+
+It raises an alert when any feature's PSI or KS crosses its threshold.
+Scanned counts are halved every `window` rows, so the comparison
+follows recent traffic. State is saved to an .npz next to the models.
+
+    python src/drift.py --data malmem.csv --scan new_dumps.csv
+"""
+
+import argparse
+import os
+import tempfile
+import threading
+import time
+import numpy as np
+import metrics
+
+class DriftMonitor:
+    """Streaming per-feature histograms and moments of scanned rows, compared against the training rows."""
+
+    def __init__(self, feature_names, edges, ref_props, ref_mean, ref_var, n_bins=20, window=100000,
+                 psi_threshold=0.2, ks_threshold=0.1, min_rows=500):
+        self.feature_names = list(feature_names)
+        self.edges = edges                  # (k, n_bins - 1) inner bin edges
+        self.ref_props = ref_props          # (k, n_bins) share of training rows per bin
+        self.ref_mean = ref_mean
+        self.ref_var = ref_var
+        self.n_bins = n_bins
+        self.window = window
+        self.psi_threshold = psi_threshold
+        self.ks_threshold = ks_threshold
+        self.min_rows = min_rows
+        self.path = None
+        self.reference_key = ""             # identifies the training data the reference was built from
+        self._lock = threading.Lock()
+        # Held across snapshot, write and replace, so saves at the end of concurrent scans cannot interleave
+        self._save_lock = threading.Lock()
+        self.reset()
+
+    @classmethod
+    def from_training(cls, X_train, n_bins=20, **kwargs):
+        """Reference profile from the (scaled) training rows, e.g. DataPreprocessor.X_train."""
+        names = list(X_train.columns) if hasattr(X_train, 'columns') else [f"f{i}" for i in range(X_train.shape[1])]
+        X = np.asarray(X_train, dtype=np.float64)
+        edges = np.quantile(X, np.linspace(0, 1, n_bins + 1)[1:-1], axis=0).T.copy()
+        counts = _bin_counts(X, edges, n_bins)
+        return cls(names, edges, counts / len(X), X.mean(axis=0), X.var(axis=0), n_bins=n_bins, **kwargs)
+
+    def reset(self):
+        k = len(self.feature_names)
+        self.counts = np.zeros((k, self.n_bins), dtype=np.float64)
+        self.n = 0.0
+        self.mean = np.zeros(k)
+        self.m2 = np.zeros(k)
+        self.rows_seen = 0
+        self.updated = None
+
+    def update(self, X):
+        """Folds a scaled batch (n, k) into the sketches; cheap enough to call on every scan batch."""
+        X = np.asarray(X, dtype=np.float64)
+        if not len(X):
+            return
+        counts = _bin_counts(X, self.edges, self.n_bins)
+        n_b, mean_b, m2_b = len(X), X.mean(axis=0), X.var(axis=0) * len(X)
+        with self._lock:
+            if self.n + n_b > self.window:
+                # Exponential forgetting: older traffic keeps half its weight
+                self.counts *= 0.5
+                self.n *= 0.5
+                self.m2 *= 0.5
+            total = self.n + n_b
+            delta = mean_b - self.mean
+            self.mean += delta * n_b / total
+            self.m2 += m2_b + delta ** 2 * self.n * n_b / total
+            self.n = total
+            self.counts += counts
+            self.rows_seen += n_b
+            self.updated = time.time()
+
+    def check(self):
+        """Per-feature PSI, KS and mean shift; sets the drift gauges and returns the report."""
+        with self._lock:
+            n, counts, mean, m2 = self.n, self.counts.copy(), self.mean.copy(), self.m2.copy()
+        if n == 0:
+            return {'rows': 0, 'alert': False, 'drifted': [], 'features': []}
+        eps = 1e-4
+        cur = counts / counts.sum(axis=1, keepdims=True)
+        ref = self.ref_props
+        p, q = np.clip(cur, eps, None), np.clip(ref, eps, None)
+        psi = ((p - q) * np.log(p / q)).sum(axis=1)
+        ks = np.abs(np.cumsum(cur, axis=1) - np.cumsum(ref, axis=1)).max(axis=1)
+        ref_std = np.sqrt(np.maximum(self.ref_var, 1e-12))
+        shift = (mean - self.ref_mean) / ref_std
+        std_ratio = np.sqrt(m2 / n) / ref_std
+        enough = n >= self.min_rows
+        drifted = (psi > self.psi_threshold) | (ks > self.ks_threshold) if enough else np.zeros(len(psi), bool)
+        features = sorted(({'feature': f, 'psi': float(a), 'ks': float(b), 'mean_shift': float(c), 'std_ratio': float(r),
+                            'drifted': bool(d)}
+                           for f, a, b, c, r, d in zip(self.feature_names, psi, ks, shift, std_ratio, drifted)),
+                          key=lambda r: r['psi'], reverse=True)
+        metrics.DRIFT_MAX_PSI.set(float(psi.max()))
+        metrics.DRIFT_FEATURES.set(int(drifted.sum()))
+        return {'rows': int(round(n)), 'rows_seen': self.rows_seen, 'alert': bool(drifted.any()),
+                'drifted': [r['feature'] for r in features if r['drifted']], 'features': features,
+                'psi_threshold': self.psi_threshold, 'ks_threshold': self.ks_threshold}
+
+    def save(self, path=None):
+        """Writes reference and scanned state (fixed size) atomically, by default to the path it was loaded for."""
+        path = path or self.path
+        with self._save_lock:
+            with self._lock:
+                state = dict(feature_names=np.array(self.feature_names), edges=self.edges, ref_props=self.ref_props,
+                             ref_mean=self.ref_mean, ref_var=self.ref_var, counts=self.counts.copy(),
+                             moments=np.array([self.n, self.rows_seen, self.updated or 0.0]), mean=self.mean.copy(),
+                             m2=self.m2.copy(), reference_key=np.array(self.reference_key),
+                             config=np.array([self.n_bins, self.window, self.psi_threshold, self.ks_threshold,
+                                              self.min_rows], dtype=np.float64))
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            # Unique temp file, so another process saving the same state does not collide with this one
+            fd, tmp = tempfile.mkstemp(dir=directory or '.', prefix=os.path.basename(path) + '.', suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    np.savez(f, **state)
+                os.replace(tmp, path)
+            except BaseException:
+                if os.path.exists(tmp):
+                    os.remove(tmp)
+                raise
+        return path
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as s:
+            n_bins, window, psi_t, ks_t, min_rows = s['config']
+            monitor = cls(s['feature_names'].tolist(), s['edges'], s['ref_props'], s['ref_mean'], s['ref_var'],
+                          n_bins=int(n_bins), window=int(window), psi_threshold=float(psi_t),
+                          ks_threshold=float(ks_t), min_rows=int(min_rows))
+            monitor.counts = s['counts'].copy()
+            monitor.n, rows_seen, updated = s['moments']
+            monitor.rows_seen, monitor.updated = int(rows_seen), (float(updated) or None)
+            monitor.mean, monitor.m2 = s['mean'].copy(), s['m2'].copy()
+            if 'reference_key' in s.files:
+                monitor.reference_key = str(s['reference_key'])
+        return monitor
+
+    def same_reference(self, other):
+        return (self.feature_names == other.feature_names and self.edges.shape == other.edges.shape
+                and np.allclose(self.edges, other.edges) and np.allclose(self.ref_mean, other.ref_mean))
+
+def _bin_counts(X, edges, n_bins):
+    """(k, n_bins) histogram of each column of X over its own bin edges."""
+    out = np.empty((X.shape[1], n_bins), dtype=np.float64)
+    for j in range(X.shape[1]):
+        out[j] = np.bincount(np.searchsorted(edges[j], X[:, j], side='right'), minlength=n_bins)
+    return out
+
+def load_or_create(path, X_train, reference_key="", **kwargs):
+    """Saved monitor if it was built on the same training profile, else a fresh one from X_train.
+
+    X_train may be a callable returning the training rows. With a
+    `reference_key` (e.g. dataset path, mtime and dtype) that matches the
+    saved state, the saved monitor is returned without calling it, so
+    no dataset has to be loaded.
+    """
+    saved = DriftMonitor.load(path) if os.path.exists(path) else None
+    if saved is not None and reference_key and saved.reference_key == reference_key:
+        saved.path = path
+        return saved
+    monitor = DriftMonitor.from_training(X_train() if callable(X_train) else X_train, **kwargs)
+    if saved is not None and saved.same_reference(monitor):
+        monitor = saved
+    monitor.reference_key = reference_key
+    monitor.path = path
+    return monitor
+
+if __name__ == "__main__":
+    import pandas as pd
+    from data_preprocessing import DataPreprocessor
+    from scan_pipeline import ScanPreprocessor
+
+    parser = argparse.ArgumentParser(description="Compare scanned rows against the training distribution")
+    parser.add_argument("--data", default="malmem.csv")
+    parser.add_argument("--scan", required=True, help="CSV of rows to check")
+    parser.add_argument("--state", default="models/drift_state.npz")
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    dp = DataPreprocessor(args.data)
+    dp.split_data()
+    monitor = load_or_create(args.state, dp.X_train)
+    prep = ScanPreprocessor(dp.scaler, dp.feature_names, dp.dtype)
+    for chunk in pd.read_csv(args.scan, chunksize=10000):
+        monitor.update(prep.transform(chunk))
+    monitor.save()
+    report = monitor.check()
+    print(f"{report['rows']:,} rows in window; alert: {report['alert']}; drifted: {report['drifted']}")
+    print(pd.DataFrame(report['features'][:args.top]).to_string(index=False))
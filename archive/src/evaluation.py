@@ -0,0 +1,206 @@
+"""
+Cross-validated evaluation and benchmark report for every model.
+
+Runs stratified k-fold CV (stratified on MalwareType, which also keeps the
+benign/malware balance) over the training split. Folds run in parallel;
+inside a fold each model is fitted once and the soft-voting ensemble is
+assembled from that fold's fitted members, as in TrainingOrchestrator.
+
+Per model it records, as the mean and standard deviation across folds:
+
+- accuracy and ROC-AUC (one-vs-rest for the malware-type model)
+- per-family F1: for the binary models, F1 on the benign rows plus the
+  rows of one family; for the malware-type model, the per-class F1
+
+Inference latency per 1k rows and pickled size are measured afterwards
+in the main process on the first fold's models, so parallel folds do not
+skew the timings.
+
+The report is saved as JSON next to the models, keyed on a hash of the
+data, the fold setup and the model definitions. The TRAIN page renders it
+from there, and reruns on unchanged data return the saved report.
+
+    python src/evaluation.py --data malmem.csv
+    python src/evaluation.py --data malmem.csv --folds 10 --jobs 4 --force
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import os
+import tempfile
+import time
+import joblib
+import numpy as np
+from joblib import Parallel, delayed
+from sklearn.base import clone
+from sklearn.metrics import accuracy_score, f1_score, roc_auc_score
+from sklearn.model_selection import StratifiedKFold
+from tracing import stage
+from training_orchestrator import DEFAULT_MLP, ENSEMBLE_MEMBERS, MEMBERS, MULTICLASS_MLP, data_hash, prefit_voting
+
+REPORT_PATH = 'models/cv_report.json'
+
+def candidates():
+    """Binary models to compare, plus the malware-type model; the ensemble is built from the fitted members."""
+    binary = dict(MEMBERS, MLP=DEFAULT_MLP)
+    return binary, {'Multiclass': MULTICLASS_MLP}
+
+def model_size(model):
+    buf = io.BytesIO()
+    joblib.dump(model, buf)
+    return buf.tell()
+
+def latency_per_1k(model, X, repeats=3):
+    """Best-of-`repeats` milliseconds for predict_proba on 1,000 rows."""
+    batch = X[:1000]
+    best = float('inf')
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        model.predict_proba(batch)
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000 * 1000 / len(batch)
+
+def family_f1(y_true, y_pred, families, family_names, benign):
+    """Binary F1 on the benign rows plus each malware family's rows."""
+    out = {}
+    for i, name in enumerate(family_names):
+        if i == benign:
+            continue
+        mask = (families == i) | (families == benign)
+        out[name] = float(f1_score(y_true[mask], y_pred[mask], zero_division=0))
+    return out
+
+def _score(model, X, y, families, family_names, benign, multiclass=False):
+    proba = model.predict_proba(X)
+    y_pred = model.classes_[proba.argmax(axis=1)]
+    if multiclass:
+        auc = roc_auc_score(y, proba, multi_class='ovr', labels=model.classes_)
+        per_family = dict(zip(family_names, map(float, f1_score(y, y_pred, labels=range(len(family_names)),
+                                                                 average=None, zero_division=0))))
+    else:
+        auc = roc_auc_score(y, proba[:, 1])
+        per_family = family_f1(y, y_pred, families, family_names, benign)
+    return {'accuracy': float(accuracy_score(y, y_pred)), 'roc_auc': float(auc), 'family_f1': per_family}
+
+def _run_fold(fold, X, y, y_mal, train_idx, test_idx, family_names, benign, keep_models):
+    """Fits every candidate on one fold; returns the fold's scores (and the fitted models for fold 0)."""
+    binary, multiclass = candidates()
+    X_tr, X_te = X[train_idx], X[test_idx]
+    fitted = {}
+    with stage(f'evaluate.fold{fold}', rows=len(train_idx)):
+        for name, est in binary.items():
+            fitted[name] = clone(est).fit(X_tr, y[train_idx])
+        fitted['Ensemble'] = prefit_voting([(short, fitted[name]) for short, name in ENSEMBLE_MEMBERS], y[train_idx])
+        for name, est in multiclass.items():
+            fitted[name] = clone(est).fit(X_tr, y_mal[train_idx])
+    scores = {name: _score(model, X_te, y_mal[test_idx] if name in multiclass else y[test_idx],
+                           y_mal[test_idx], family_names, benign, multiclass=name in multiclass)
+              for name, model in fitted.items()}
+    return scores, (fitted if keep_models else None)
+
+def _summarize(values):
+    values = np.asarray(values, dtype=float)
+    return {'mean': float(values.mean()), 'std': float(values.std())}
+
+def report_key(X, y_mal, n_splits, random_state):
+    binary, multiclass = candidates()
+    specs = sorted((name, type(est).__name__, sorted((k, repr(v)) for k, v in est.get_params().items()))
+                   for name, est in {**binary, **multiclass}.items())
+    raw = f"{data_hash(X, y_mal)}|{n_splits}|{random_state}|{ENSEMBLE_MEMBERS}|{specs}"
+    return hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
+
+def load_report(path=REPORT_PATH):
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+def cross_validate(X, y, y_mal, family_names, n_splits=5, n_jobs=-1, random_state=42, path=REPORT_PATH, force=False):
+    """CV report for every model; returns the saved report when data, folds and models are unchanged."""
+    X = np.ascontiguousarray(X.to_numpy() if hasattr(X, 'to_numpy') else X)
+    y = np.asarray(y)
+    y_mal = np.asarray(y_mal)
+    family_names = [str(n) for n in family_names]
+    key = report_key(X, y_mal, n_splits, random_state)
+    cached = None if force else load_report(path)
+    if cached and cached.get('key') == key:
+        print(f"CV report is up to date ({path})")
+        return cached
+
+    # Benign is the family whose rows are all labelled 0
+    benign = next((i for i in range(len(family_names)) if np.any(y_mal == i) and not np.any(y[y_mal == i])), -1)
+    folds = StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=random_state).split(X, y_mal)
+    t0 = time.perf_counter()
+    with stage('evaluate.cross_validate', rows=len(X)):
+        runs = Parallel(n_jobs=n_jobs)(
+            delayed(_run_fold)(i, X, y, y_mal, train_idx, test_idx, family_names, benign, i == 0)
+            for i, (train_idx, test_idx) in enumerate(folds))
+    print(f"{n_splits}-fold CV finished in {time.perf_counter() - t0:.1f}s")
+
+    fold_scores = [scores for scores, _ in runs]
+    models = runs[0][1]
+    multiclass = candidates()[1]
+    results = {}
+    for name, model in models.items():
+        per_fold = [s[name] for s in fold_scores]
+        results[name] = {
+            'task': 'malware_type' if name in multiclass else 'binary',
+            'accuracy': _summarize([s['accuracy'] for s in per_fold]),
+            'roc_auc': _summarize([s['roc_auc'] for s in per_fold]),
+            'family_f1': {fam: _summarize([s['family_f1'][fam] for s in per_fold])
+                          for fam in per_fold[0]['family_f1']},
+            'latency_ms_per_1k': latency_per_1k(model, X),
+            'size_bytes': model_size(model),
+        }
+        print(f"{name}: accuracy {results[name]['accuracy']['mean']:.4f} "
+              f"+/- {results[name]['accuracy']['std']:.4f}, {results[name]['latency_ms_per_1k']:.1f} ms/1k rows")
+
+    report = {'key': key, 'created': time.strftime('%Y-%m-%d %H:%M:%S'), 'n_splits': n_splits, 'rows': len(X),
+              'families': family_names, 'models': results}
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    # Unique temp name, so two runs finishing together cannot interleave into one file
+    fd, tmp = tempfile.mkstemp(dir=directory or '.', prefix=os.path.basename(path) + '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    return report
+
+def comparison_table(report):
+    """One row per model: mean scores, per-family F1, latency and size (a DataFrame)."""
+    import pandas as pd
+    rows = []
+    for name, r in report['models'].items():
+        row = {'model': name, 'task': r['task'],
+               'accuracy': r['accuracy']['mean'], 'accuracy_std': r['accuracy']['std'],
+               'roc_auc': r['roc_auc']['mean']}
+        row.update({f"f1_{fam}": v['mean'] for fam, v in r['family_f1'].items()})
+        row['ms_per_1k'] = r['latency_ms_per_1k']
+        row['size_kb'] = r['size_bytes'] / 1024
+        rows.append(row)
+    return pd.DataFrame(rows).sort_values(['task', 'accuracy'], ascending=[True, False])
+
+if __name__ == "__main__":
+    from data_preprocessing import DataPreprocessor
+
+    parser = argparse.ArgumentParser(description="Stratified k-fold CV report for every model")
+    parser.add_argument("--data", default="malmem.csv")
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--jobs", type=int, default=-1, help="folds evaluated in parallel (-1 = all cores)")
+    parser.add_argument("--out", default=REPORT_PATH)
+    parser.add_argument("--force", action="store_true", help="recompute even if the saved report is up to date")
+    args = parser.parse_args()
+
+    dp = DataPreprocessor(args.data)
+    X_train, X_test, y_train, y_test, y_mal_train, y_mal_test = dp.split_data()
+    report = cross_validate(X_train, y_train, y_mal_train, dp.get_malware_classes(), n_splits=args.folds,
+                            n_jobs=args.jobs, path=args.out, force=args.force)
+    print(comparison_table(report).to_string(index=False, float_format=lambda v: f"{v:.4f}"))
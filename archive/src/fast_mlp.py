@@ -0,0 +1,176 @@
+"""
+Lightweight CPU inference for the fitted MLPClassifier models.
+
+sklearn's predict_proba validates its input and allocates every hidden
+layer's activations on each call. FastMLP copies the weights of a fitted
+MLPClassifier into contiguous float32 arrays once and runs the forward
+pass in fixed-size chunks through buffers preallocated per thread:
+one matrix product into the layer buffer, then the bias and activation
+applied in place. Outputs match sklearn's to float32 precision (pass
+dtype=np.float64 for a bit-for-bit comparable forward pass).
+
+accelerate() swaps FastMLP in for the MLP members of a VotingClassifier
+(or for a bare MLPClassifier) and leaves every other model untouched, so
+ThreatScanner can use it without other changes.
+
+    python src/fast_mlp.py --data malmem.csv          # agreement with sklearn and speedup on the test split
+"""
+
+import argparse
+import copy
+import threading
+import time
+import numpy as np
+
+def _relu(x):
+    np.maximum(x, 0, out=x)
+
+def _tanh(x):
+    np.tanh(x, out=x)
+
+def _logistic(x):
+    with np.errstate(over='ignore'):
+        np.negative(x, out=x)
+        np.exp(x, out=x)
+    x += 1
+    np.reciprocal(x, out=x)
+
+def _softmax(x):
+    x -= x.max(axis=1, keepdims=True)
+    np.exp(x, out=x)
+    x /= x.sum(axis=1, keepdims=True)
+
+ACTIVATIONS = {'relu': _relu, 'tanh': _tanh, 'logistic': _logistic, 'identity': None, 'softmax': _softmax}
+
+def is_mlp(model):
+    return hasattr(model, 'coefs_') and hasattr(model, 'out_activation_')
+
+class FastMLP:
+    """Batched forward pass of a fitted MLPClassifier with preallocated, per-thread layer buffers."""
+
+    def __init__(self, mlp, dtype=np.float32, max_batch=4096):
+        self.dtype = np.dtype(dtype)
+        self.max_batch = max_batch
+        self.weights = [np.ascontiguousarray(w, dtype=self.dtype) for w in mlp.coefs_]
+        self.biases = [np.ascontiguousarray(b, dtype=self.dtype) for b in mlp.intercepts_]
+        self.hidden = ACTIVATIONS[mlp.activation]
+        self.output = ACTIVATIONS[mlp.out_activation_]
+        self.classes_ = mlp.classes_
+        self.n_features_in_ = self.weights[0].shape[0]
+        if hasattr(mlp, 'feature_names_in_'):
+            self.feature_names_in_ = mlp.feature_names_in_
+        self._local = threading.local()
+
+    def _buffers(self):
+        # Each scan worker thread gets its own buffers, so concurrent scans do not share them
+        bufs = getattr(self._local, 'bufs', None)
+        if bufs is None:
+            bufs = [np.empty((self.max_batch, self.n_features_in_), dtype=self.dtype)]
+            bufs += [np.empty((self.max_batch, w.shape[1]), dtype=self.dtype) for w in self.weights]
+            self._local.bufs = bufs
+        return bufs
+
+    def _forward(self, X, out):
+        bufs = self._buffers()
+        last = len(self.weights) - 1
+        for start in range(0, len(X), self.max_batch):
+            n = min(self.max_batch, len(X) - start)
+            a = bufs[0][:n]
+            a[...] = X[start:start + n]
+            for i, (w, b) in enumerate(zip(self.weights, self.biases)):
+                z = bufs[i + 1][:n]
+                np.dot(a, w, out=z)
+                z += b
+                act = self.output if i == last else self.hidden
+                if act is not None:
+                    act(z)
+                a = z
+            out[start:start + n] = a
+        return out
+
+    def predict_proba(self, X):
+        X = np.asarray(X)
+        if X.ndim != 2 or X.shape[1] != self.n_features_in_:
+            raise ValueError(f"X has shape {X.shape}, expected (n, {self.n_features_in_})")
+        n_out = self.weights[-1].shape[1]
+        out = self._forward(X, np.empty((len(X), n_out), dtype=self.dtype))
+        if n_out == 1:
+            # Binary logistic output, laid out as [P(class 0), P(class 1)] like sklearn
+            return np.hstack([1 - out, out])
+        return out
+
+    def predict(self, X):
+        return self.classes_[self.predict_proba(X).argmax(axis=1)]
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_local']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._local = threading.local()
+
+def accelerate(model, dtype=np.float32, max_batch=4096):
+    """FastMLP for an MLPClassifier, or a shallow copy of a fitted ensemble with its MLP members replaced.
+
+    Any other model is returned unchanged.
+    """
+    if is_mlp(model):
+        return FastMLP(model, dtype, max_batch)
+    members = getattr(model, 'estimators_', None)
+    if not isinstance(members, list) or not any(is_mlp(m) for m in members):
+        return model
+    fast = copy.copy(model)
+    fast.estimators_ = [FastMLP(m, dtype, max_batch) if is_mlp(m) else m for m in members]
+    if hasattr(model, 'named_estimators_'):
+        fast.named_estimators_ = copy.copy(model.named_estimators_)
+        for name, est in model.named_estimators_.items():
+            if is_mlp(est):
+                fast.named_estimators_[name] = fast.estimators_[members.index(est)]
+    return fast
+
+def compare(model, fast, X, repeats=3):
+    """Max probability difference, prediction agreement and best-of timings of sklearn vs the fast path."""
+    def best(fn):
+        times = []
+        for _ in range(repeats):
+            t0 = time.perf_counter()
+            result = fn(X)
+            times.append(time.perf_counter() - t0)
+        return result, min(times)
+    ref, t_ref = best(model.predict_proba)
+    got, t_fast = best(fast.predict_proba)
+    return {'max_abs_diff': float(np.abs(ref - got).max()),
+            'agreement': float(np.mean(ref.argmax(axis=1) == got.argmax(axis=1))),
+            'sklearn_ms_per_1k': t_ref * 1e6 / len(X), 'fast_ms_per_1k': t_fast * 1e6 / len(X),
+            'speedup': t_ref / t_fast if t_fast else float('inf')}
+
+if __name__ == "__main__":
+    import os
+    import joblib
+    from data_preprocessing import DataPreprocessor
+
+    parser = argparse.ArgumentParser(description="Compare FastMLP with sklearn on the held-out split")
+    parser.add_argument("--data", default="malmem.csv")
+    parser.add_argument("--models", default="models")
+    parser.add_argument("--float64", action="store_true", help="run the fast path in float64")
+    args = parser.parse_args()
+
+    dp = DataPreprocessor(args.data)
+    dp.split_data()
+    X = dp.X_test.to_numpy()
+    dtype = np.float64 if args.float64 else np.float32
+    print(f"{'model':<20} {'max|dp|':>10} {'agree':>8} {'sklearn ms/1k':>14} {'fast ms/1k':>11} {'speedup':>8}")
+    for filename in ('mlp_optimized.pkl', 'mlp_multiclass.pkl', 'ensemble.pkl'):
+        path = os.path.join(args.models, filename)
+        if not os.path.exists(path):
+            continue
+        model = joblib.load(path)
+        fast = accelerate(model, dtype)
+        if fast is model:
+            print(f"{filename:<20} no MLP to accelerate")
+            continue
+        r = compare(model, fast, X)
+        print(f"{filename:<20} {r['max_abs_diff']:>10.2e} {r['agreement']:>8.4f} {r['sklearn_ms_per_1k']:>14.2f} "
+              f"{r['fast_ms_per_1k']:>11.2f} {r['speedup']:>7.1f}x")
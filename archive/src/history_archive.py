@@ -0,0 +1,231 @@
+"""
+Compressed, columnar long-term archive for scan history.
+
+Verdicts older than a few days are rolled out of the SQLite history store
+into daily Parquet partitions:
+
+    history_archive/day=2025-03-01/part-000000001201-000000004800.parquet
+
+- timestamps are int64 epoch seconds, not strings
+- status, type and model_version are dictionary-encoded
+- confidence and anomaly_score are float32
+- files are zstd-compressed
+
+A part file is named after the id range of the rows it holds. Re-running
+an interrupted roll-up rewrites the same file rather than duplicating
+rows, and the rows leave SQLite only after their files are written.
+compact() merges a day's part files into one. Until the old parts are
+removed, readers skip any part whose id range another part covers.
+
+Analytics read only the columns they need and only the partitions inside
+the date range (the day of a partition is in its directory name, so
+detection rates by family never touch the timestamp column):
+
+    python src/history_archive.py roll --days 7          # archive verdicts older than 7 days
+    python src/history_archive.py compact
+    python src/history_archive.py rate --start 2025-03-01 --freq W
+    python src/history_archive.py stats
+
+pyarrow is optional: the live history store works without it.
+"""
+
+import argparse
+import os
+import re
+import time
+from datetime import date, datetime, timedelta
+
+PART_RE = re.compile(r"part-(\d+)-(\d+)\.parquet$")
+
+def _pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("The history archive needs pyarrow: pip install pyarrow")
+    return pa, pq
+
+def _schema(pa):
+    text = pa.dictionary(pa.int32(), pa.string())
+    return pa.schema([('ts', pa.int64()), ('sample_id', pa.int64()), ('status', text), ('type', text),
+                      ('confidence', pa.float32()), ('anomaly_score', pa.float32()), ('is_anomaly', pa.bool_()),
+                      ('model_version', text)])
+
+def _day(ts):
+    return datetime.fromtimestamp(ts).date()
+
+class HistoryArchive:
+    """Daily Parquet partitions of archived verdicts, with roll-up from the history store and compaction."""
+
+    def __init__(self, root='history_archive', compression='zstd'):
+        self.root = root
+        self.compression = compression
+
+    def partition(self, day):
+        return os.path.join(self.root, f"day={day.isoformat()}")
+
+    def days(self, start_date=None, end_date=None):
+        """Archived days within the inclusive date bounds, oldest first; no file is opened."""
+        if not os.path.isdir(self.root):
+            return []
+        out = []
+        for name in os.listdir(self.root):
+            if not name.startswith('day='):
+                continue
+            day = date.fromisoformat(name[4:])
+            if (start_date is None or day >= start_date) and (end_date is None or day <= end_date):
+                out.append(day)
+        return sorted(out)
+
+    def parts(self, day):
+        """Part files of one day, skipping any whose id range is covered by another (a finished compaction)."""
+        directory = self.partition(day)
+        ranges = []
+        for name in os.listdir(directory):
+            m = PART_RE.match(name)
+            if m:
+                ranges.append((int(m.group(1)), int(m.group(2)), os.path.join(directory, name)))
+        return sorted(path for lo, hi, path in ranges
+                      if not any(l <= lo and hi <= h and (l, h) != (lo, hi) for l, h, _ in ranges))
+
+    def _write(self, day, rows):
+        pa, pq = _pyarrow()
+        ids = [r[0] for r in rows]
+        cols = list(zip(*rows))
+        table = pa.table({
+            'ts': pa.array(cols[1], pa.int64()),
+            'sample_id': pa.array(cols[2], pa.int64()),
+            'status': pa.array(cols[3], pa.string()).dictionary_encode(),
+            'type': pa.array(cols[4], pa.string()).dictionary_encode(),
+            'confidence': pa.array(cols[5], pa.float32()),
+            'anomaly_score': pa.array(cols[6], pa.float32()),
+            'is_anomaly': pa.array([bool(v) for v in cols[7]], pa.bool_()),
+            'model_version': pa.array(cols[8], pa.string()).dictionary_encode(),
+        }, schema=_schema(pa))
+        return self._write_table(day, table, min(ids), max(ids))
+
+    def _write_table(self, day, table, lo, hi):
+        _, pq = _pyarrow()
+        directory = self.partition(day)
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"part-{lo:012d}-{hi:012d}.parquet")
+        tmp = path + '.tmp'
+        pq.write_table(table, tmp, compression=self.compression)
+        os.replace(tmp, path)
+        return path
+
+    def roll(self, store, older_than_days=7, chunk_size=200000):
+        """Moves verdicts from before midnight `older_than_days` ago out of the store into the archive."""
+        cutoff = datetime.combine(date.today() - timedelta(days=older_than_days), datetime.min.time())
+        before_ts = int(time.mktime(cutoff.timetuple()))
+        moved = 0
+        for rows in store.iter_rows(before_ts=before_ts, chunk_size=chunk_size):
+            by_day = {}
+            for r in rows:
+                by_day.setdefault(_day(r[1]), []).append(r)
+            for day, day_rows in by_day.items():
+                self._write(day, day_rows)
+            # Deleted only once the files are in place; a rerun rewrites the same part names
+            store.delete_rows(rows[-1][0], before_ts)
+            moved += len(rows)
+        if moved:
+            print(f"Archived {moved:,} verdicts from before {cutoff:%Y-%m-%d} to {self.root}")
+        return moved
+
+    def compact(self, start_date=None, end_date=None, min_parts=2):
+        """Merges each day's part files into one (sorted by time); returns the number of days compacted."""
+        _, pq = _pyarrow()
+        compacted = 0
+        for day in self.days(start_date, end_date):
+            paths = self.parts(day)
+            if len(paths) < min_parts:
+                continue
+            ranges = [tuple(int(g) for g in PART_RE.search(p).groups()) for p in paths]
+            table = pq.ParquetDataset(paths).read().sort_by('ts')
+            merged = self._write_table(day, table.unify_dictionaries().combine_chunks(),
+                                       min(lo for lo, _ in ranges), max(hi for _, hi in ranges))
+            for p in paths:
+                if p != merged:
+                    os.remove(p)
+            compacted += 1
+        return compacted
+
+    def read(self, columns, start_date=None, end_date=None):
+        """Selected columns of the archived verdicts in the date range, as one pyarrow Table (or None)."""
+        pa, pq = _pyarrow()
+        paths = [p for day in self.days(start_date, end_date) for p in self.parts(day)]
+        if not paths:
+            return None
+        return pa.concat_tables([pq.read_table(p, columns=columns) for p in paths]).unify_dictionaries()
+
+    def daily_counts(self, start_date=None, end_date=None):
+        """(day, status, type, count) rows; the day comes from the partition, so only status and type are read."""
+        _, pq = _pyarrow()
+        out = []
+        for day in self.days(start_date, end_date):
+            for path in self.parts(day):
+                frame = pq.read_table(path, columns=['status', 'type']).to_pandas()
+                counts = frame.groupby(['status', 'type'], observed=True).size()
+                out += [(day.isoformat(), s, t, int(n)) for (s, t), n in counts.items()]
+        return out
+
+    def stats(self):
+        days = self.days()
+        files = [p for day in days for p in self.parts(day)]
+        rows = 0
+        if files:
+            _, pq = _pyarrow()
+            rows = sum(pq.ParquetFile(p).metadata.num_rows for p in files)
+        return {'days': len(days), 'files': len(files), 'rows': rows,
+                'bytes': sum(os.path.getsize(p) for p in files)}
+
+def detection_rate(store, archive=None, start_date=None, end_date=None, freq='D'):
+    """Share of scans flagged as each malware family per period, over the live store and the archive.
+
+    Returns a DataFrame with period, family, malware, scans and rate.
+    """
+    import pandas as pd
+    counts = store.daily_counts(start_date, end_date)
+    if archive is not None and os.path.isdir(archive.root):
+        counts += archive.daily_counts(start_date, end_date)
+    if not counts:
+        return pd.DataFrame(columns=['period', 'family', 'malware', 'scans', 'rate'])
+    frame = pd.DataFrame(counts, columns=['day', 'status', 'type', 'count'])
+    frame['period'] = pd.to_datetime(frame['day']).dt.to_period(freq).dt.start_time
+    scans = frame.groupby('period')['count'].sum().rename('scans')
+    malware = (frame[frame['status'] == 'Malware'].groupby(['period', 'type'])['count'].sum()
+               .rename('malware').reset_index().rename(columns={'type': 'family'}))
+    out = malware.join(scans, on='period')
+    out['rate'] = out['malware'] / out['scans']
+    return out.sort_values(['period', 'family']).reset_index(drop=True)
+
+if __name__ == "__main__":
+    from history_store import HistoryStore
+
+    parser = argparse.ArgumentParser(description="Roll scan history into compressed daily Parquet partitions")
+    parser.add_argument("--db", default="scan_history.db")
+    parser.add_argument("--archive", default="history_archive")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    roll = sub.add_parser("roll", help="archive verdicts older than --days")
+    roll.add_argument("--days", type=int, default=7)
+    sub.add_parser("compact", help="merge each day's part files into one")
+    rate = sub.add_parser("rate", help="detection rate by family over time")
+    rate.add_argument("--start", type=date.fromisoformat)
+    rate.add_argument("--end", type=date.fromisoformat)
+    rate.add_argument("--freq", default="D", help="pandas period: D, W or M")
+    sub.add_parser("stats")
+    args = parser.parse_args()
+
+    archive = HistoryArchive(args.archive)
+    if args.cmd == "roll":
+        archive.roll(HistoryStore(args.db), args.days)
+    elif args.cmd == "compact":
+        print(f"Compacted {archive.compact()} days")
+    elif args.cmd == "rate":
+        t0 = time.perf_counter()
+        table = detection_rate(HistoryStore(args.db), archive, args.start, args.end, args.freq)
+        print(table.to_string(index=False, float_format=lambda v: f"{v:.4f}"))
+        print(f"{time.perf_counter() - t0:.2f}s")
+    elif args.cmd == "stats":
+        s = archive.stats()
+        print(f"{s['rows']:,} verdicts in {s['files']} files over {s['days']} days, {s['bytes'] / 1e6:.1f} MB")
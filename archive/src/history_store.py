@@ -0,0 +1,473 @@
+import csv
+import io
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+COLUMNS = ["timestamp", "sample_id", "status", "type", "confidence", "anomaly_score", "is_anomaly", "model_version"]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS verdicts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts INTEGER NOT NULL,
+    sample_id INTEGER,
+    status TEXT NOT NULL,
+    type TEXT,
+    confidence REAL,
+    anomaly_score REAL,
+    is_anomaly INTEGER NOT NULL,
+    model_version TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_verdicts_ts ON verdicts (ts);
+-- Filter column then id, so keyset pages (ORDER BY id DESC) are read straight from the index without a sort
+DROP INDEX IF EXISTS idx_verdicts_status;
+DROP INDEX IF EXISTS idx_verdicts_type;
+DROP INDEX IF EXISTS idx_verdicts_anomaly;
+CREATE INDEX IF NOT EXISTS idx_verdicts_status_id ON verdicts (status, id);
+CREATE INDEX IF NOT EXISTS idx_verdicts_type_id ON verdicts (type, id);
+CREATE INDEX IF NOT EXISTS idx_verdicts_anomaly_id ON verdicts (is_anomaly, id);
+CREATE INDEX IF NOT EXISTS idx_verdicts_status_type ON verdicts (status, type);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+def to_epoch(timestamp):
+    return int(time.mktime(datetime.strptime(timestamp, TIME_FORMAT).timetuple()))
+
+def from_epoch(ts):
+    return datetime.fromtimestamp(ts).strftime(TIME_FORMAT)
+
+class HistoryFilter:
+    """Filters applied by the storage layer. Dates are inclusive datetime.date bounds."""
+
+    def __init__(self, status="All", malware_type="All", start_date=None, end_date=None, anomaly=None):
+        self.status = status
+        self.malware_type = malware_type
+        self.start_date = start_date
+        self.end_date = end_date
+        self.anomaly = anomaly
+
+    def where(self):
+        clauses, params = [], []
+        if self.status and self.status != "All":
+            clauses.append("status = ?"); params.append(self.status)
+        if self.malware_type and self.malware_type != "All":
+            clauses.append("type = ?"); params.append(self.malware_type)
+        if self.start_date is not None:
+            clauses.append("ts >= ?"); params.append(to_epoch(f"{self.start_date} 00:00:00"))
+        if self.end_date is not None:
+            clauses.append("ts <= ?"); params.append(to_epoch(f"{self.end_date} 23:59:59"))
+        if self.anomaly is not None:
+            clauses.append("is_anomaly = ?"); params.append(int(bool(self.anomaly)))
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+def salvage_json_records(text):
+    """Complete JSON objects from a truncated or partly overwritten JSON list."""
+    decoder = json.JSONDecoder()
+    records, pos = [], text.find('{')
+    while pos != -1:
+        try:
+            obj, end = decoder.raw_decode(text, pos)
+        except ValueError:
+            pos = text.find('{', pos + 1)
+            continue
+        if isinstance(obj, dict) and 'timestamp' in obj and 'status' in obj:
+            records.append(obj)
+        pos = text.find('{', end)
+    return records
+
+class HistoryStore:
+    """SQLite-backed scan history. Paging, filtering and export run in the database, not in Python lists.
+
+    Counts and the malware type list scan an index, so with `cache_ttl`
+    they are reused for that many seconds (by every session sharing the
+    store) instead of being recomputed on each rerun. The unfiltered total
+    is a running counter: this store's own appends add to it, and it is
+    recounted every `recount_seconds` to pick up other processes' writes.
+    clear() and archiving drop the cached values at once.
+    """
+
+    def __init__(self, db_path, legacy_json=None, verify=False, cache_ttl=0, recount_seconds=60):
+        self.db_path = db_path
+        self.cache_ttl = cache_ttl
+        self.recount_seconds = recount_seconds
+        self._cache = {}
+        self._total = None
+        self._cache_lock = threading.Lock()
+        if verify:
+            self.verify()
+        with self._session() as con:
+            con.executescript(SCHEMA)
+            # Databases created before verdicts were tagged with the model version
+            if 'model_version' not in [r[1] for r in con.execute("PRAGMA table_info(verdicts)")]:
+                con.execute("ALTER TABLE verdicts ADD COLUMN model_version TEXT")
+        if legacy_json:
+            self.import_legacy_json(legacy_json)
+
+    def verify(self):
+        """Runs PRAGMA quick_check and moves a corrupt database (with its WAL) aside so a fresh one is used.
+
+        Scans the whole file, so it is run on demand (once per app process),
+        not on every open. A locked or busy database is left alone.
+        Returns True if the database is usable as it is.
+        """
+        if not os.path.exists(self.db_path):
+            return True
+        try:
+            con = sqlite3.connect(self.db_path, timeout=30)
+            try:
+                result = con.execute("PRAGMA quick_check").fetchone()[0]
+            finally:
+                con.close()
+        except sqlite3.OperationalError as e:
+            # Locked, busy or unopenable: not evidence of corruption, and another process may be writing
+            print(f"History database integrity check skipped: {e}")
+            return True
+        except sqlite3.DatabaseError as e:
+            result = str(e)
+        if result == "ok":
+            return True
+        backup = f"{self.db_path}.corrupt-{time.strftime('%Y%m%d-%H%M%S')}"
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(self.db_path + suffix):
+                os.replace(self.db_path + suffix, backup + suffix)
+        print(f"History database failed its integrity check ({result}); moved to {backup}")
+        return False
+
+    def _cached(self, key, compute):
+        if not self.cache_ttl:
+            return compute()
+        now = time.monotonic()
+        with self._cache_lock:
+            hit = self._cache.get(key)
+        if hit is not None and now - hit[0] < self.cache_ttl:
+            return hit[1]
+        value = compute()
+        with self._cache_lock:
+            self._cache = {k: v for k, v in self._cache.items() if now - v[0] < self.cache_ttl}
+            self._cache[key] = (now, value)
+        return value
+
+    @staticmethod
+    def _removed(con):
+        """Bumps the removal generation, part of revision()."""
+        con.execute("INSERT INTO meta VALUES ('generation', '1') "
+                    "ON CONFLICT(key) DO UPDATE SET value = CAST(value AS INTEGER) + 1")
+
+    def _invalidate(self):
+        with self._cache_lock:
+            self._cache = {}
+            self._total = None
+
+    def _connect(self):
+        # One short-lived connection per call, so scan worker threads can write safely
+        con = sqlite3.connect(self.db_path, timeout=30)
+        con.execute("PRAGMA journal_mode=WAL")
+        con.execute("PRAGMA synchronous=NORMAL")
+        return con
+
+    @contextmanager
+    def _session(self):
+        con = self._connect()
+        try:
+            with con:
+                yield con
+        finally:
+            con.close()
+
+    @staticmethod
+    def _row(record):
+        return (
+            to_epoch(record["timestamp"]),
+            int(record.get("sample_id", 0)),
+            record["status"],
+            record.get("type", "N/A"),
+            float(record.get("confidence", 0.0)),
+            float(record.get("anomaly_score", 0.0)),
+            int(bool(record.get("is_anomaly", False))),
+            record.get("model_version"),
+        )
+
+    @staticmethod
+    def _record(row):
+        return {
+            "timestamp": from_epoch(row[1]),
+            "sample_id": row[2],
+            "status": row[3],
+            "type": row[4],
+            "confidence": row[5],
+            "anomaly_score": row[6],
+            "is_anomaly": bool(row[7]),
+            "model_version": row[8] or "",
+        }
+
+    def append_many(self, records):
+        """Inserts a batch of verdicts in one transaction."""
+        rows = [self._row(r) for r in records]
+        with self._session() as con:
+            self._insert(con, rows)
+        with self._cache_lock:
+            if self._total is not None:
+                self._total = (self._total[0], self._total[1] + len(rows))
+        return len(rows)
+
+    @staticmethod
+    def _insert(con, rows):
+        con.executemany(
+            "INSERT INTO verdicts (ts, sample_id, status, type, confidence, anomaly_score, is_anomaly, model_version) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+
+    def append(self, record):
+        return self.append_many([record])
+
+    def import_legacy_json(self, path):
+        """One-time import of the old scan_history.json list; the file itself is left untouched."""
+        if not os.path.exists(path):
+            return 0
+        with self._session() as con:
+            done = con.execute("SELECT value FROM meta WHERE key = 'legacy_json_imported'").fetchone()
+        if done:
+            return 0
+        with open(path, 'r') as f:
+            text = f.read()
+        try:
+            history = json.loads(text) if text.strip() else []
+        except ValueError:
+            # A write cut short leaves a truncated list; keep every record that is complete
+            history = salvage_json_records(text)
+            print(f"{path} is truncated or corrupt; recovered {len(history)} complete records")
+        rows = [self._row(r) for r in history]
+        # Records and the imported marker commit together, so a crash mid-import is retried cleanly
+        with self._session() as con:
+            self._insert(con, rows)
+            con.execute("INSERT OR REPLACE INTO meta VALUES ('legacy_json_imported', ?)", (path,))
+        self._invalidate()
+        print(f"Imported {len(rows)} legacy history records from {path}")
+        return len(rows)
+
+    def count(self, flt=None):
+        where, params = (flt or HistoryFilter()).where()
+        if not where:
+            return self.total()
+
+        def compute():
+            with self._session() as con:
+                return con.execute(f"SELECT COUNT(*) FROM verdicts{where}", params).fetchone()[0]
+        return self._cached(('count', where, tuple(params)), compute)
+
+    def total(self):
+        """Number of verdicts. With `cache_ttl` this is the running counter, recounted every `recount_seconds`."""
+        now = time.monotonic()
+        if self.cache_ttl:
+            with self._cache_lock:
+                if self._total is not None and now - self._total[0] < self.recount_seconds:
+                    return self._total[1]
+        with self._session() as con:
+            value = con.execute("SELECT COUNT(*) FROM verdicts").fetchone()[0]
+        if self.cache_ttl:
+            with self._cache_lock:
+                self._total = (now, value)
+        return value
+
+    def revision(self):
+        """(newest id, removal generation): changes whenever verdicts are added, archived or cleared.
+
+        Both are index or key lookups, so this is cheap enough to use as a cache key on every rerun.
+        """
+        with self._session() as con:
+            newest = con.execute("SELECT COALESCE(MAX(id), 0) FROM verdicts").fetchone()[0]
+            generation = con.execute("SELECT value FROM meta WHERE key = 'generation'").fetchone()
+        return newest, int(generation[0]) if generation else 0
+
+    def summary(self, flt=None):
+        """Total and malware counts for the metric cards."""
+        total = self.count(flt)
+        flt = flt or HistoryFilter()
+        if flt.status not in ("All", "Malware", None):
+            return {'total': total, 'malware': 0}
+        mal = HistoryFilter("Malware", flt.malware_type, flt.start_date, flt.end_date, flt.anomaly)
+        return {'total': total, 'malware': self.count(mal)}
+
+    def malware_types(self):
+        return self._cached(('malware_types',), self._malware_types)
+
+    def _malware_types(self):
+        # Skip scan over the (status, type) index: one seek per distinct type rather than one step per row
+        types = []
+        with self._session() as con:
+            row = con.execute("SELECT type FROM verdicts WHERE status = 'Malware' AND type IS NOT NULL "
+                              "ORDER BY type LIMIT 1").fetchone()
+            while row is not None:
+                types.append(row[0])
+                row = con.execute("SELECT type FROM verdicts WHERE status = 'Malware' AND type > ? "
+                                  "ORDER BY type LIMIT 1", (row[0],)).fetchone()
+        return types
+
+    def page(self, flt=None, limit=50, before_id=None):
+        """Newest-first page using keyset pagination (cost does not grow with page depth).
+
+        Returns (records, ids); pass ids[-1] as before_id to fetch the next page.
+        """
+        where, params = (flt or HistoryFilter()).where()
+        if before_id is not None:
+            where += (" AND " if where else " WHERE ") + "id < ?"
+            params = params + [before_id]
+        sql = (f"SELECT id, ts, sample_id, status, type, confidence, anomaly_score, is_anomaly, model_version "
+               f"FROM verdicts{where} ORDER BY id DESC LIMIT ?")
+        with self._session() as con:
+            rows = con.execute(sql, params + [limit]).fetchall()
+        return [self._record(r) for r in rows], [r[0] for r in rows]
+
+    def iter_csv(self, flt=None, chunk_size=50000):
+        """Yields the filtered history as CSV text, `chunk_size` rows at a time."""
+        where, params = (flt or HistoryFilter()).where()
+        sql = (f"SELECT id, ts, sample_id, status, type, confidence, anomaly_score, is_anomaly, model_version "
+               f"FROM verdicts{where} ORDER BY id")
+        buf = io.StringIO()
+        writer = csv.writer(buf)
+        writer.writerow(COLUMNS)
+        con = self._connect()
+        try:
+            cur = con.execute(sql, params)
+            while True:
+                rows = cur.fetchmany(chunk_size)
+                if not rows:
+                    break
+                for r in rows:
+                    rec = self._record(r)
+                    writer.writerow([rec[c] for c in COLUMNS])
+                yield buf.getvalue()
+                buf.seek(0); buf.truncate(0)
+        finally:
+            con.close()
+        if buf.tell():
+            yield buf.getvalue()
+
+    def export_csv(self, path, flt=None, chunk_size=50000):
+        """Streams the filtered history to a CSV file without building a DataFrame."""
+        with open(path, 'w', newline='') as f:
+            for chunk in self.iter_csv(flt, chunk_size):
+                f.write(chunk)
+        return path
+
+    def daily_counts(self, start_date=None, end_date=None):
+        """(day, status, type, count) rows for the detection-rate analytics, grouped in the database."""
+        where, params = HistoryFilter(start_date=start_date, end_date=end_date).where()
+        sql = (f"SELECT date(ts, 'unixepoch', 'localtime') AS day, status, type, COUNT(*) "
+               f"FROM verdicts{where} GROUP BY day, status, type")
+        with self._session() as con:
+            return con.execute(sql, params).fetchall()
+
+    def iter_rows(self, before_ts, chunk_size=200000):
+        """Raw (id, ts, ...) rows older than `before_ts` in id order, one keyset-paged chunk at a time."""
+        last_id = 0
+        while True:
+            with self._session() as con:
+                rows = con.execute(
+                    "SELECT id, ts, sample_id, status, type, confidence, anomaly_score, is_anomaly, model_version "
+                    "FROM verdicts WHERE ts < ? AND id > ? ORDER BY id LIMIT ?",
+                    (before_ts, last_id, chunk_size)).fetchall()
+            if not rows:
+                return
+            yield rows
+            last_id = rows[-1][0]
+
+    def delete_rows(self, max_id, before_ts):
+        """Deletes rows older than `before_ts` up to `max_id` (after they were archived)."""
+        with self._session() as con:
+            self._removed(con)
+            deleted = con.execute("DELETE FROM verdicts WHERE ts < ? AND id <= ?", (before_ts, max_id)).rowcount
+        self._invalidate()
+        return deleted
+
+    def clear(self):
+        with self._session() as con:
+            self._removed(con)
+            deleted = con.execute("DELETE FROM verdicts").rowcount
+        self._invalidate()
+        return deleted
+
+class HistoryWriter:
+    """Single background writer for a HistoryStore, shared by every session and scan job in the process.
+
+    submit() only queues the records, so scan threads never wait on the
+    database lock. The writer commits everything queued since its last
+    transaction in one transaction, and retries when another process
+    holds the lock. submit() blocks only when `max_pending` rows are
+    already waiting.
+    """
+
+    def __init__(self, store, max_pending=200000, retry_seconds=1.0, max_retries=60):
+        self.store = store
+        self.max_pending = max_pending
+        self.retry_seconds = retry_seconds
+        self.max_retries = max_retries
+        self._pending = []
+        self._in_flight = 0
+        self._cond = threading.Condition()
+        self.written = 0
+        self.dropped = 0
+        self.transactions = 0
+        self.last_error = None
+        self._thread = threading.Thread(target=self._run, name="history-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, records):
+        records = list(records)
+        with self._cond:
+            while len(self._pending) >= self.max_pending:
+                self._cond.wait()
+            self._pending.extend(records)
+            self._cond.notify_all()
+        return len(records)
+
+    def pending(self):
+        with self._cond:
+            return len(self._pending) + self._in_flight
+
+    def flush(self, timeout=None):
+        """Waits until every submitted record is committed; False if `timeout` ran out first."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self._pending or self._in_flight:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+                batch, self._pending = self._pending, []
+                self._in_flight = len(batch)
+                self._cond.notify_all()
+            ok = False
+            for _ in range(self.max_retries + 1):
+                try:
+                    self.store.append_many(batch)
+                    ok = True
+                    break
+                except sqlite3.OperationalError as e:
+                    # Usually locked by another process (e.g. the scoring service); the batch is kept and retried
+                    self.last_error = str(e)
+                    time.sleep(self.retry_seconds)
+                except Exception as e:
+                    self.last_error = str(e)
+                    break
+            if not ok:
+                print(f"History write of {len(batch)} records failed: {self.last_error}")
+            with self._cond:
+                if ok:
+                    self.written += len(batch)
+                    self.transactions += 1
+                else:
+                    self.dropped += len(batch)
+                self._in_flight = 0
+                self._cond.notify_all()
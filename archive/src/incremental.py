@@ -0,0 +1,231 @@
+"""
+Incremental model updates from analyst-confirmed scan verdicts.
+
+Confirmed rows (raw features, binary label, malware type) go into a
+ReplayBuffer table next to the scan history. IncrementalUpdater folds the
+rows that have not been used yet into copies of the saved scan models:
+
+- MLPs (the ensemble member and the malware-type model) take a few
+  partial_fit epochs.
+- The ensemble's RandomForest is warm-started with extra trees grown on
+  the new rows.
+- The LogisticRegression member has no incremental path and is left as is.
+
+Each update mixes in a sample of older confirmed rows so the models do not
+drift toward the latest batch. A candidate replaces the saved model only if
+its accuracy on the held-out split is no worse than the current model's
+(within `tolerance`). The previous files are kept in models/previous/.
+
+    python src/incremental.py --data malmem.csv --history scan_history.db
+"""
+
+import argparse
+import copy
+import os
+import shutil
+import sqlite3
+import time
+from contextlib import contextmanager
+import joblib
+import numpy as np
+from sklearn.metrics import accuracy_score
+from scan_pipeline import ScanPreprocessor
+
+REPLAY_SCHEMA = """
+CREATE TABLE IF NOT EXISTS replay (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    confirmed_at INTEGER NOT NULL,
+    label INTEGER NOT NULL,
+    malware_type TEXT,
+    features BLOB NOT NULL,
+    used INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_replay_used ON replay (used, id);
+"""
+
+class ReplayBuffer:
+    """Analyst-confirmed feature rows, stored unscaled in the trained feature order.
+
+    Lives in the history database. Rows start as pending and are marked
+    used once an update has consumed them; used rows stay available as
+    replay samples. `capacity` bounds all rows: past it the oldest used
+    rows are dropped first, then the oldest pending ones.
+    """
+
+    def __init__(self, db_path, n_features, capacity=50000):
+        self.db_path = db_path
+        self.n_features = n_features
+        self.capacity = capacity
+        with self._session() as con:
+            con.executescript(REPLAY_SCHEMA)
+
+    def _connect(self):
+        con = sqlite3.connect(self.db_path, timeout=30)
+        con.execute("PRAGMA journal_mode=WAL")
+        con.execute("PRAGMA synchronous=NORMAL")
+        return con
+
+    @contextmanager
+    def _session(self):
+        con = self._connect()
+        try:
+            with con:
+                yield con
+        finally:
+            con.close()
+
+    def add(self, X_raw, labels, malware_types):
+        """Stores confirmed rows; malware_types entries may be None when only the binary label is known."""
+        X_raw = np.asarray(X_raw, dtype=np.float64)
+        if X_raw.ndim != 2 or X_raw.shape[1] != self.n_features:
+            raise ValueError(f"expected rows with {self.n_features} features, got shape {X_raw.shape}")
+        now = int(time.time())
+        rows = [(now, int(y), t, x.tobytes()) for x, y, t in zip(X_raw, labels, malware_types)]
+        with self._session() as con:
+            con.executemany("INSERT INTO replay (confirmed_at, label, malware_type, features) VALUES (?, ?, ?, ?)", rows)
+            excess = con.execute("SELECT COUNT(*) FROM replay").fetchone()[0] - self.capacity
+            if excess > 0:
+                excess -= con.execute("DELETE FROM replay WHERE id IN "
+                                      "(SELECT id FROM replay WHERE used = 1 ORDER BY id LIMIT ?)", (excess,)).rowcount
+            if excess > 0:
+                con.execute("DELETE FROM replay WHERE id IN (SELECT id FROM replay ORDER BY id LIMIT ?)", (excess,))
+                print(f"Replay buffer full: dropped the {excess:,} oldest pending rows")
+        return len(rows)
+
+    def counts(self):
+        with self._session() as con:
+            pending, used = con.execute(
+                "SELECT COALESCE(SUM(used = 0), 0), COALESCE(SUM(used = 1), 0) FROM replay").fetchone()
+        return {'pending': pending, 'used': used}
+
+    def _fetch(self, sql, params=()):
+        with self._session() as con:
+            rows = con.execute(sql, params).fetchall()
+        ids = np.array([r[0] for r in rows], dtype=np.int64)
+        y = np.array([r[1] for r in rows], dtype=np.int64)
+        types = [r[2] for r in rows]
+        X = np.frombuffer(b"".join(r[3] for r in rows), dtype=np.float64).reshape(len(rows), self.n_features)
+        return ids, X, y, types
+
+    def pending(self):
+        return self._fetch("SELECT id, label, malware_type, features FROM replay WHERE used = 0 ORDER BY id")
+
+    def sample_used(self, n):
+        """Up to n random rows that earlier updates already consumed."""
+        if n <= 0:
+            return self._fetch("SELECT id, label, malware_type, features FROM replay WHERE 0")
+        return self._fetch("SELECT id, label, malware_type, features FROM replay WHERE used = 1 "
+                           "ORDER BY RANDOM() LIMIT ?", (int(n),))
+
+    def mark_used(self, ids):
+        with self._session() as con:
+            con.executemany("UPDATE replay SET used = 1 WHERE id = ?", [(int(i),) for i in ids])
+
+    def clear(self):
+        with self._session() as con:
+            con.execute("DELETE FROM replay")
+
+class IncrementalUpdater:
+    """Folds pending confirmed rows into the saved ensemble and malware-type models, gated on validation accuracy."""
+
+    def __init__(self, scaler, feature_names, malware_classes, model_dir='models', dtype=np.float64,
+                 rf_trees_per_update=10, mlp_epochs=5, replay_ratio=1.0, tolerance=0.005):
+        self.preprocessor = ScanPreprocessor(scaler, feature_names, dtype)
+        self.malware_classes = list(malware_classes)
+        self.model_dir = model_dir
+        self.rf_trees_per_update = rf_trees_per_update
+        self.mlp_epochs = mlp_epochs
+        self.replay_ratio = replay_ratio
+        self.tolerance = tolerance
+
+    def _path(self, name):
+        return os.path.join(self.model_dir, name)
+
+    def _update_member(self, est, X, y):
+        """Updates one fitted estimator in place; returns how, or None if it has no incremental path."""
+        if hasattr(est, 'partial_fit') and getattr(est, 'solver', 'adam') in ('adam', 'sgd'):
+            for _ in range(self.mlp_epochs):
+                est.partial_fit(X, y)
+            return f"partial_fit x{self.mlp_epochs}"
+        if hasattr(est, 'estimators_') and 'warm_start' in est.get_params():
+            # New trees must see every class, or their probability outputs would not line up
+            if len(np.unique(y)) < len(est.classes_):
+                return None
+            est.set_params(warm_start=True, n_estimators=len(est.estimators_) + self.rf_trees_per_update)
+            est.fit(X, y)
+            return f"+{self.rf_trees_per_update} trees"
+        return None
+
+    def _publish(self, model, name):
+        """Keeps the current file in models/previous/ and atomically replaces it."""
+        path = self._path(name)
+        backup_dir = self._path('previous')
+        os.makedirs(backup_dir, exist_ok=True)
+        if os.path.exists(path):
+            shutil.copy2(path, os.path.join(backup_dir, name))
+        tmp = path + ".tmp"
+        joblib.dump(model, tmp)
+        os.replace(tmp, path)
+
+    def update(self, buffer, X_val, y_val, y_mal_val=None):
+        """Runs one update round; returns a report with per-model accuracies and whether each was accepted."""
+        ids, X_new, y_new, t_new = buffer.pending()
+        if not len(ids):
+            return {'status': 'no_data', 'rows': 0, 'models': []}
+        _, X_old, y_old, t_old = buffer.sample_used(int(len(ids) * self.replay_ratio))
+        X = self.preprocessor.scale_inplace(np.vstack([X_new, X_old]).astype(self.preprocessor.dtype))
+        y = np.concatenate([y_new, y_old])
+        types = t_new + t_old
+
+        report = {'status': 'done', 'rows': len(ids), 'replayed': len(X_old), 'models': []}
+
+        ensemble = joblib.load(self._path('ensemble.pkl'))
+        candidate = copy.deepcopy(ensemble)
+        members = getattr(candidate, 'named_estimators_', {})
+        changes = {name: self._update_member(est, X, y) for name, est in members.items()}
+        report['models'].append(self._gate('ensemble.pkl', ensemble, candidate, X_val, y_val,
+                                           {k: v for k, v in changes.items() if v}))
+
+        if y_mal_val is not None and os.path.exists(self._path('mlp_multiclass.pkl')):
+            known = [i for i, t in enumerate(types) if t in self.malware_classes]
+            if known:
+                multiclass = joblib.load(self._path('mlp_multiclass.pkl'))
+                candidate = copy.deepcopy(multiclass)
+                y_mal = np.array([self.malware_classes.index(types[i]) for i in known])
+                how = self._update_member(candidate, X[known], y_mal)
+                if how:
+                    report['models'].append(self._gate('mlp_multiclass.pkl', multiclass, candidate,
+                                                       X_val, y_mal_val, {'mlp': how}))
+
+        buffer.mark_used(ids)
+        return report
+
+    def _gate(self, name, current, candidate, X_val, y_val, changes):
+        old_acc = accuracy_score(y_val, current.predict(X_val))
+        new_acc = accuracy_score(y_val, candidate.predict(X_val))
+        accepted = bool(changes) and new_acc >= old_acc - self.tolerance
+        if accepted:
+            self._publish(candidate, name)
+        print(f"{name}: accuracy {old_acc:.4f} -> {new_acc:.4f} ({'accepted' if accepted else 'rejected'})")
+        return {'model': name, 'changes': changes, 'old_accuracy': old_acc, 'new_accuracy': new_acc,
+                'accepted': accepted}
+
+if __name__ == "__main__":
+    from data_preprocessing import DataPreprocessor
+
+    parser = argparse.ArgumentParser(description="Fold confirmed verdicts into the saved scan models")
+    parser.add_argument("--data", default="malmem.csv", help="dataset for the validation split")
+    parser.add_argument("--history", default="scan_history.db")
+    parser.add_argument("--models", default="models")
+    parser.add_argument("--tolerance", type=float, default=0.005, help="allowed validation accuracy drop")
+    args = parser.parse_args()
+
+    dp = DataPreprocessor(args.data)
+    X_train, X_test, y_train, y_test, y_mal_train, y_mal_test = dp.split_data()
+    buffer = ReplayBuffer(args.history, X_train.shape[1])
+    print(f"Replay buffer: {buffer.counts()}")
+    updater = IncrementalUpdater(dp.scaler, X_train.columns, dp.get_malware_classes(), model_dir=args.models,
+                                 dtype=dp.dtype, tolerance=args.tolerance)
+    report = updater.update(buffer, X_test, y_test, y_mal_test)
+    if report['status'] == 'no_data':
+        print("No pending confirmed rows.")
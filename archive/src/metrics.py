@@ -0,0 +1,214 @@
+"""
+Prometheus-style metrics for scans and model loads.
+
+A small in-process registry (no prometheus_client dependency) with
+counters, gauges and histograms, rendered in the Prometheus text
+exposition format. Metrics can be served from a local HTTP endpoint
+(start_http_server) or written to a file for node_exporter's textfile
+collector (write_textfile).
+"""
+
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0)
+
+def _escape(v):
+    return str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _labels(names, values):
+    if not names:
+        return ""
+    return "{" + ",".join(f'{n}="{_escape(v)}"' for n, v in zip(names, values)) + "}"
+
+def _value(v):
+    return str(int(v)) if float(v).is_integer() else repr(float(v))
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self.lock = threading.Lock()
+
+    def _key(self, labels):
+        return tuple(labels.get(n, "") for n in self.labelnames)
+
+    def header(self):
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name, help_text, labelnames=()):
+        super().__init__(name, help_text, labelnames)
+        self.values = {}
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def get(self, **labels):
+        return self.values.get(self._key(labels), 0)
+
+    def total(self):
+        return sum(self.values.values())
+
+    def render(self):
+        with self.lock:
+            items = list(self.values.items())
+        return self.header() + [f"{self.name}{_labels(self.labelnames, k)} {_value(v)}" for k, v in items]
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value, **labels):
+        with self.lock:
+            self.values[self._key(labels)] = value
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, help_text, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self.series = {}
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self.lock:
+            s = self.series.get(key)
+            if s is None:
+                s = self.series[key] = {'counts': [0] * len(self.buckets), 'sum': 0.0, 'count': 0}
+            for i, b in enumerate(self.buckets):
+                if value <= b:
+                    s['counts'][i] += 1
+                    break
+            s['sum'] += value
+            s['count'] += 1
+
+    def summary(self, **labels):
+        s = self.series.get(self._key(labels))
+        if not s or not s['count']:
+            return {'count': 0, 'sum': 0.0, 'mean': 0.0}
+        return {'count': s['count'], 'sum': s['sum'], 'mean': s['sum'] / s['count']}
+
+    def render(self):
+        lines = self.header()
+        with self.lock:
+            items = [(k, dict(v, counts=list(v['counts']))) for k, v in self.series.items()]
+        for key, s in items:
+            cumulative = 0
+            for b, c in zip(self.buckets, s['counts']):
+                cumulative += c
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames + ('le',), key + (b,))} {cumulative}")
+            lines.append(f"{self.name}_bucket{_labels(self.labelnames + ('le',), key + ('+Inf',))} {s['count']}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {_value(s['sum'])}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {s['count']}")
+        return lines
+
+class Registry:
+    def __init__(self):
+        self.metrics = {}
+        self.collectors = []
+
+    def register(self, metric):
+        self.metrics.setdefault(metric.name, metric)
+        return self.metrics[metric.name]
+
+    def add_collector(self, fn):
+        """fn() is called before every render to refresh gauges (e.g. history store size)."""
+        self.collectors.append(fn)
+
+    def render(self):
+        for fn in self.collectors:
+            try:
+                fn()
+            except Exception as e:
+                print(f"Metrics collector failed: {e}")
+        lines = []
+        for metric in self.metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+REGISTRY = Registry()
+
+ROWS_SCANNED = REGISTRY.register(Counter(
+    "cybersentinel_rows_scanned_total", "Rows scored by the scan pipeline"))
+VERDICTS = REGISTRY.register(Counter(
+    "cybersentinel_verdicts_total", "Verdicts by status and malware family", ("status", "family")))
+ANOMALIES = REGISTRY.register(Counter(
+    "cybersentinel_anomalies_total", "Rows flagged by the anomaly detector"))
+SCAN_SECONDS = REGISTRY.register(Histogram(
+    "cybersentinel_scan_duration_seconds", "Wall time of a complete scan job"))
+SCAN_THROUGHPUT = REGISTRY.register(Gauge(
+    "cybersentinel_scan_rows_per_second", "Throughput of the most recent scan job"))
+INFERENCE_SECONDS = REGISTRY.register(Histogram(
+    "cybersentinel_inference_seconds", "Model inference time per batch", ("model",)))
+MODEL_LOAD_SECONDS = REGISTRY.register(Histogram(
+    "cybersentinel_model_load_seconds", "Time to load the scan models from disk"))
+MODEL_MEMORY = REGISTRY.register(Gauge(
+    "cybersentinel_model_memory_bytes", "Approximate size of loaded models (pickle size)", ("model",)))
+HISTORY_ROWS = REGISTRY.register(Gauge(
+    "cybersentinel_history_rows", "Verdicts stored in the history store"))
+HISTORY_BYTES = REGISTRY.register(Gauge(
+    "cybersentinel_history_store_bytes", "On-disk size of the history store"))
+HISTORY_PENDING = REGISTRY.register(Gauge(
+    "cybersentinel_history_pending_rows", "Verdicts queued for the history writer"))
+DRIFT_MAX_PSI = REGISTRY.register(Gauge(
+    "cybersentinel_drift_max_psi", "Largest per-feature PSI of scanned rows against the training data"))
+DRIFT_FEATURES = REGISTRY.register(Gauge(
+    "cybersentinel_drift_features", "Features over the PSI or KS drift threshold"))
+
+def record_verdicts(records):
+    ROWS_SCANNED.inc(len(records))
+    for r in records:
+        VERDICTS.inc(status=r['status'], family=r['type'])
+        if r['is_anomaly']:
+            ANOMALIES.inc()
+
+def write_textfile(path, registry=REGISTRY):
+    """Atomically writes the metrics for node_exporter's textfile collector."""
+    tmp = path + ".tmp"
+    with open(tmp, 'w') as f:
+        f.write(registry.render())
+    os.replace(tmp, path)
+    return path
+
+def start_textfile_writer(path, interval=15.0, registry=REGISTRY):
+    """Rewrites the textfile every `interval` seconds on a daemon thread."""
+    def loop():
+        while True:
+            try:
+                write_textfile(path, registry)
+            except OSError as e:
+                print(f"Could not write metrics to {path}: {e}")
+            time.sleep(interval)
+    threading.Thread(target=loop, name="metrics-textfile", daemon=True).start()
+
+def start_http_server(port, host="127.0.0.1", registry=REGISTRY):
+    """Serves GET /metrics on a daemon thread and returns the server."""
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = registry.render().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, name="metrics", daemon=True).start()
+    print(f"Metrics available at http://{host}:{port}/metrics")
+    return server
@@ -0,0 +1,371 @@
+"""
+Versioned model artifacts, an active (optionally pinned) version, and shadow scoring.
+
+Each trained set of models is snapshotted into models/registry/<version>/
+together with metadata.json: dataset hash, parameters, evaluation metrics,
+training time and a content hash of the files. Identical snapshots are not
+registered twice. models/registry/registry.json records which version is
+active, whether it is pinned, and which one is shadowing it.
+
+The live files in models/ remain what the scanner, the scoring service and
+incremental updates read. Activating a version copies its files there and
+writes models/VERSION.json, which ThreatScanner.from_model_dir uses to tag
+verdicts with the version id. When the active version is pinned, a newly
+trained version is still registered, but the live files are put back to
+the pinned version.
+
+ShadowScorer runs a second version on the same scaled batches on a
+background thread and keeps agreement and latency statistics against the
+primary, so a candidate can be compared on real traffic before it is
+promoted. If the shadow falls behind, batches are skipped rather than
+queued, so the primary scan path never waits on it.
+
+    python src/model_registry.py list
+    python src/model_registry.py register --note "retrained on March dumps"
+    python src/model_registry.py activate 20250301-101500-3fa2 --pin
+    python src/model_registry.py shadow 20250301-101500-3fa2
+    python src/model_registry.py promote
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+
+SCAN_FILES = ('ensemble.pkl', 'anomaly_detector.pkl', 'mlp_multiclass.pkl')
+ARTIFACT_FILES = SCAN_FILES + ('mlp_optimized.pkl', 'RandomForest.pkl', 'LogisticRegression.pkl', 'DecisionTree.pkl',
+                               'preprocessor.pkl', 'selected_features.json')
+LIVE_VERSION_FILE = 'VERSION.json'
+
+def _replace(path, write):
+    """Calls write(tmp) on a unique temp file beside `path`, then renames it over `path`."""
+    # The registry lock only covers this process; the trainer and the app can write one file at once
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path) or '.', prefix=os.path.basename(path) + '.', suffix='.tmp')
+    os.close(fd)
+    try:
+        write(tmp)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+def _write_json(path, data):
+    def write(tmp):
+        with open(tmp, 'w') as f:
+            json.dump(data, f, indent=2)
+    _replace(path, write)
+
+def _read_json(path, default=None):
+    if not os.path.exists(path):
+        return default
+    with open(path) as f:
+        return json.load(f)
+
+def content_hash(paths):
+    h = hashlib.blake2b(digest_size=16)
+    for p in paths:
+        h.update(os.path.basename(p).encode())
+        with open(p, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+    return h.hexdigest()
+
+def live_version(model_dir, fingerprint):
+    """Registry version id of the live models, if VERSION.json still matches their fingerprint."""
+    info = _read_json(os.path.join(model_dir, LIVE_VERSION_FILE))
+    if info and info.get('fingerprint') == fingerprint:
+        return info['version']
+    return None
+
+class ModelRegistry:
+    """Model versions on disk, with the active / pinned / shadow pointers in registry.json."""
+
+    def __init__(self, root='models/registry', live_dir='models'):
+        self.root = root
+        self.live_dir = live_dir
+        self.state_path = os.path.join(root, 'registry.json')
+        self._lock = threading.Lock()
+
+    def state(self):
+        return _read_json(self.state_path, {'active': None, 'pinned': False, 'shadow': None})
+
+    def _save_state(self, state):
+        os.makedirs(self.root, exist_ok=True)
+        _write_json(self.state_path, state)
+
+    def path(self, version):
+        return os.path.join(self.root, version)
+
+    def metadata(self, version):
+        return _read_json(os.path.join(self.path(version), 'metadata.json'))
+
+    def versions(self):
+        """Metadata of every version, newest first, with active/shadow flags."""
+        if not os.path.isdir(self.root):
+            return []
+        state = self.state()
+        out = []
+        for name in os.listdir(self.root):
+            meta = self.metadata(name) if os.path.isdir(self.path(name)) and not name.endswith('.tmp') else None
+            if meta:
+                out.append(dict(meta, active=name == state['active'], shadow=name == state['shadow']))
+        return sorted(out, key=lambda m: m['created'], reverse=True)
+
+    def register(self, dataset_hash=None, params=None, metrics=None, training_seconds=None, note="", activate=True):
+        """Snapshots the live model files as a new version (or returns the existing one with the same content).
+
+        With `activate`, the new version becomes active unless another
+        version is pinned, in which case the live files are restored to it.
+        """
+        files = [f for f in ARTIFACT_FILES if os.path.exists(os.path.join(self.live_dir, f))]
+        missing = [f for f in SCAN_FILES if f not in files]
+        if missing:
+            raise FileNotFoundError(f"cannot register a version without {missing}")
+        with self._lock:
+            digest = content_hash([os.path.join(self.live_dir, f) for f in files])
+            existing = next((m['version'] for m in self.versions() if m.get('content_hash') == digest), None)
+            version = existing or f"{time.strftime('%Y%m%d-%H%M%S')}-{digest[:4]}"
+            if existing is None:
+                # Unique staging directory; versions() skips it by its .tmp suffix
+                os.makedirs(self.root, exist_ok=True)
+                tmp = tempfile.mkdtemp(dir=self.root, prefix=version + '.', suffix='.tmp')
+                try:
+                    for f in files:
+                        shutil.copy2(os.path.join(self.live_dir, f), os.path.join(tmp, f))
+                    fingerprint = self._fingerprint(tmp)
+                    # Lets from_model_dir tag verdicts with the version id when scanning from this directory
+                    _write_json(os.path.join(tmp, LIVE_VERSION_FILE), {'version': version, 'fingerprint': fingerprint})
+                    _write_json(os.path.join(tmp, 'metadata.json'), {
+                        'version': version,
+                        'created': time.strftime('%Y-%m-%d %H:%M:%S'),
+                        'dataset_hash': dataset_hash,
+                        'params': params or {},
+                        'metrics': metrics or {},
+                        'training_seconds': training_seconds,
+                        'note': note,
+                        'files': files,
+                        'content_hash': digest,
+                        'fingerprint': fingerprint,
+                    })
+                    os.replace(tmp, self.path(version))
+                except BaseException:
+                    shutil.rmtree(tmp, ignore_errors=True)
+                    raise
+                print(f"Registered model version {version}")
+        if activate:
+            state = self.state()
+            if state['pinned'] and state['active'] and state['active'] != version:
+                print(f"Version {state['active']} is pinned; live models restored to it")
+                self.activate(state['active'], pin=True)
+            else:
+                self.activate(version, pin=state['pinned'])
+        return version
+
+    def _fingerprint(self, directory):
+        from verdict_cache import model_fingerprint
+        return model_fingerprint([os.path.join(directory, f) for f in SCAN_FILES])
+
+    def activate(self, version, pin=None):
+        """Makes `version` the live models; pin=True keeps it live across retraining."""
+        meta = self.metadata(version)
+        if meta is None:
+            raise KeyError(f"unknown model version {version}")
+        with self._lock:
+            os.makedirs(self.live_dir, exist_ok=True)
+            for f in meta['files']:
+                src = os.path.join(self.path(version), f)
+                dst = os.path.join(self.live_dir, f)
+                # copy2 keeps mtime, so the live fingerprint equals the version's
+                _replace(dst, lambda tmp: shutil.copy2(src, tmp))
+            _write_json(os.path.join(self.live_dir, LIVE_VERSION_FILE),
+                        {'version': version, 'fingerprint': meta['fingerprint']})
+            state = self.state()
+            state['active'] = version
+            if pin is not None:
+                state['pinned'] = bool(pin)
+            if state['shadow'] == version:
+                state['shadow'] = None
+            self._save_state(state)
+        return version
+
+    def set_pinned(self, pinned):
+        state = self.state()
+        state['pinned'] = bool(pinned)
+        self._save_state(state)
+
+    def set_shadow(self, version):
+        if version is not None and self.metadata(version) is None:
+            raise KeyError(f"unknown model version {version}")
+        state = self.state()
+        state['shadow'] = version
+        self._save_state(state)
+
+    def promote_shadow(self):
+        """Activates the shadow version (keeping the pin setting) and clears the shadow."""
+        state = self.state()
+        if not state['shadow']:
+            raise ValueError("no shadow version to promote")
+        return self.activate(state['shadow'], pin=state['pinned'])
+
+    def prune(self, keep=10):
+        """Deletes the oldest versions beyond `keep`, never the active or shadow one."""
+        state = self.state()
+        removable = [m['version'] for m in self.versions() if m['version'] not in (state['active'], state['shadow'])]
+        removed = removable[keep:]
+        for version in removed:
+            shutil.rmtree(self.path(version), ignore_errors=True)
+        return removed
+
+    def shadow_stats_path(self, primary, shadow):
+        return os.path.join(self.root, f"shadow_{primary}_vs_{shadow}.json")
+
+    def shadow_reports(self):
+        """Summaries of every saved primary-vs-shadow comparison, most recently updated first."""
+        if not os.path.isdir(self.root):
+            return []
+        paths = [os.path.join(self.root, f) for f in os.listdir(self.root)
+                 if f.startswith('shadow_') and f.endswith('.json')]
+        return [summarize_shadow(_read_json(p)) for p in sorted(paths, key=os.path.getmtime, reverse=True)]
+
+    def scanner(self, version, **kwargs):
+        """ThreatScanner for a registered version, using that version's saved preprocessing artifacts."""
+        from data_preprocessing import DataPreprocessor
+        from scan_pipeline import ThreatScanner
+        art = DataPreprocessor.load_artifacts(os.path.join(self.path(version), 'preprocessor.pkl'))
+        return ThreatScanner.from_model_dir(art['scaler'], art['feature_names'], art['malware_classes'],
+                                            model_dir=self.path(version), dtype=art['dtype'], **kwargs)
+
+class ShadowScorer:
+    """Scores the primary scanner's batches with a shadow scanner off the hot path and tracks agreement."""
+
+    def __init__(self, primary_preprocessor, shadow_scanner, max_pending=2, stats_path=None, primary_version=None):
+        if list(primary_preprocessor.feature_names) != list(shadow_scanner.preprocessor.feature_names):
+            raise ValueError("shadow version was trained on different features")
+        self.shadow = shadow_scanner
+        self.version = shadow_scanner.model_version
+        self.max_pending = max_pending
+        self.stats_path = stats_path
+        p, s = primary_preprocessor, shadow_scanner.preprocessor
+        same = all(a is None and b is None or a is not None and b is not None and np.allclose(a, b)
+                   for a, b in ((p.mean, s.mean), (p.scale, s.scale)))
+        # Undo the primary scaling and apply the shadow's when the two versions were fitted differently
+        self._rescale = None if same else (p, s)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="shadow")
+        self._lock = threading.Lock()
+        self._pending = 0
+        self.stats = _read_json(stats_path, None) if stats_path else None
+        if not self.stats or self.stats.get('shadow') != self.version:
+            self.stats = {'primary': primary_version, 'shadow': self.version, 'batches': 0, 'rows': 0, 'skipped_batches': 0,
+                          'status_agree': 0, 'type_agree': 0, 'both_malware': 0, 'anomaly_agree': 0,
+                          'primary_seconds': 0.0, 'primary_rows': 0, 'shadow_seconds': 0.0}
+
+    def submit(self, scaled, primary_verdicts, primary_seconds=0.0, primary_rows=0):
+        """Queues a batch for shadow scoring; skipped if the shadow is still busy with earlier ones."""
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self.stats['skipped_batches'] += 1
+                return False
+            self._pending += 1
+        self._executor.submit(self._score, scaled, primary_verdicts, primary_seconds, primary_rows)
+        return True
+
+    def _score(self, scaled, primary, primary_seconds, primary_rows):
+        try:
+            X = scaled
+            if self._rescale is not None:
+                p, s = self._rescale
+                X = np.array(scaled, dtype=s.dtype)
+                if p.scale is not None:
+                    X *= p.scale
+                if p.mean is not None:
+                    X += p.mean
+                s.scale_inplace(X)
+            t0 = time.perf_counter()
+            shadow = self.shadow.predict_verdicts(X)
+            elapsed = time.perf_counter() - t0
+            status = sum(a['status'] == b['status'] for a, b in zip(primary, shadow))
+            both = [(a, b) for a, b in zip(primary, shadow) if a['status'] == b['status'] == 'Malware']
+            with self._lock:
+                st = self.stats
+                st['batches'] += 1
+                st['rows'] += len(shadow)
+                st['status_agree'] += status
+                st['both_malware'] += len(both)
+                st['type_agree'] += sum(a['type'] == b['type'] for a, b in both)
+                st['anomaly_agree'] += sum(a['is_anomaly'] == b['is_anomaly'] for a, b in zip(primary, shadow))
+                st['primary_seconds'] += primary_seconds
+                st['primary_rows'] += primary_rows
+                st['shadow_seconds'] += elapsed
+        except Exception as e:
+            print(f"Shadow scoring failed: {e}")
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def summary(self):
+        with self._lock:
+            return summarize_shadow(self.stats)
+
+    def save(self):
+        if self.stats_path:
+            with self._lock:
+                _write_json(self.stats_path, self.stats)
+
+def summarize_shadow(st):
+    """Agreement rates and per-1k-row latencies from a ShadowScorer's raw counters."""
+    rows = st['rows'] or 1
+    return {
+        'primary': st.get('primary'), 'shadow': st['shadow'], 'rows': st['rows'], 'batches': st['batches'],
+        'skipped_batches': st['skipped_batches'],
+        'status_agreement': st['status_agree'] / rows,
+        'type_agreement': st['type_agree'] / st['both_malware'] if st['both_malware'] else None,
+        'anomaly_agreement': st['anomaly_agree'] / rows,
+        'primary_ms_per_1k': st['primary_seconds'] * 1e6 / st['primary_rows'] if st['primary_rows'] else None,
+        'shadow_ms_per_1k': st['shadow_seconds'] * 1e6 / st['rows'] if st['rows'] else None,
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Manage model versions")
+    parser.add_argument("--models", default="models")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("list")
+    reg = sub.add_parser("register", help="snapshot the live models as a version")
+    reg.add_argument("--data", help="dataset file to record the hash of")
+    reg.add_argument("--note", default="")
+    act = sub.add_parser("activate")
+    act.add_argument("version")
+    act.add_argument("--pin", action="store_true", help="keep this version live across retraining")
+    sub.add_parser("unpin")
+    sh = sub.add_parser("shadow")
+    sh.add_argument("version", nargs="?", help="omit to clear the shadow")
+    sub.add_parser("promote")
+    pr = sub.add_parser("prune")
+    pr.add_argument("--keep", type=int, default=10)
+    args = parser.parse_args()
+
+    registry = ModelRegistry(os.path.join(args.models, 'registry'), args.models)
+    if args.cmd == "list":
+        for m in registry.versions():
+            flags = " ".join(f for f, on in (("ACTIVE", m['active']), ("SHADOW", m['shadow'])) if on)
+            print(f"{m['version']:<24} {m['created']}  {flags:<13} {json.dumps(m['metrics'])}  {m['note']}")
+        print(f"State: {registry.state()}")
+    elif args.cmd == "register":
+        from pipeline import hash_file
+        registry.register(dataset_hash=hash_file(args.data) if args.data else None, note=args.note)
+    elif args.cmd == "activate":
+        registry.activate(args.version, pin=args.pin)
+    elif args.cmd == "unpin":
+        registry.set_pinned(False)
+    elif args.cmd == "shadow":
+        registry.set_shadow(args.version)
+    elif args.cmd == "promote":
+        print(f"Promoted {registry.promote_shadow()}")
+    elif args.cmd == "prune":
+        print(f"Removed {registry.prune(args.keep)}")
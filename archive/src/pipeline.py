@@ -0,0 +1,358 @@
+"""
+Training pipeline as a DAG of cached, resumable stages.
+
+run_pipeline.bat used to start data_preprocessing.py, search_algo.py,
+base_models.py and advanced_models.py as separate processes, each
+reloading and re-splitting malmem.csv. Here they are stages of one DAG.
+
+- Every stage's output is stored under a content-addressed key: a hash of
+  the stage's source, its parameters and the keys of its inputs. The root
+  key includes a hash of the dataset file.
+- A stage whose key is already in the store is not rerun. If nothing
+  upstream changed, the next run resumes after the last stage that
+  completed.
+- Stages whose inputs are ready run in parallel on a thread pool.
+
+    python src/pipeline.py --data malmem.csv
+    python src/pipeline.py --data malmem.csv --no-search --workers 4
+    python src/pipeline.py --data malmem.csv --force split     # rerun split and everything downstream
+"""
+
+import argparse
+import hashlib
+import inspect
+import json
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import nullcontext
+import joblib
+import tracing
+
+class PipelineError(RuntimeError):
+    pass
+
+class Stage:
+    def __init__(self, name, fn, deps=(), params=None, cache=True, version=1):
+        self.name = name
+        self.fn = fn
+        self.deps = tuple(deps)
+        self.params = params or {}
+        self.cache = cache
+        self.version = version
+
+    def source(self):
+        try:
+            return inspect.getsource(self.fn)
+        except (OSError, TypeError):
+            return self.fn.__qualname__
+
+class ArtifactStore:
+    """Stage outputs on disk, one joblib file per content key."""
+
+    def __init__(self, root):
+        self.root = root
+        self.dir = os.path.join(root, 'artifacts')
+        os.makedirs(self.dir, exist_ok=True)
+
+    def path(self, key):
+        return os.path.join(self.dir, f"{key}.pkl")
+
+    def has(self, key):
+        return os.path.exists(self.path(key))
+
+    def load(self, key):
+        return joblib.load(self.path(key))
+
+    def save(self, key, value):
+        tmp = self.path(key) + ".tmp"
+        joblib.dump(value, tmp)
+        os.replace(tmp, self.path(key))
+
+    def prune(self, keep):
+        """Deletes artifacts whose key is not in `keep`; returns how many were removed."""
+        removed = 0
+        for name in os.listdir(self.dir):
+            if name.endswith(".pkl") and name[:-4] not in keep:
+                os.remove(os.path.join(self.dir, name))
+                removed += 1
+        return removed
+
+class Pipeline:
+    """A DAG of stages. Each stage function receives its dependencies' outputs as positional arguments."""
+
+    def __init__(self, store_dir='.pipeline', max_workers=4):
+        self.stages = {}
+        self.store = ArtifactStore(store_dir)
+        self.state_path = os.path.join(store_dir, 'state.json')
+        self.max_workers = max_workers
+        self.state = {}
+
+    def add(self, name, fn, deps=(), params=None, cache=True, version=1):
+        if name in self.stages:
+            raise ValueError(f"duplicate stage: {name}")
+        unknown = [d for d in deps if d not in self.stages]
+        if unknown:
+            raise ValueError(f"stage {name} depends on unknown stages {unknown} (add dependencies first)")
+        self.stages[name] = Stage(name, fn, deps, params, cache, version)
+        return fn
+
+    def stage(self, name, deps=(), params=None, cache=True, version=1):
+        """Decorator form of add()."""
+        return lambda fn: self.add(name, fn, deps, params, cache, version)
+
+    def keys(self):
+        """Content key per stage (stages are stored in topological order because deps must exist on add)."""
+        keys = {}
+        for name, s in self.stages.items():
+            h = hashlib.blake2b(digest_size=16)
+            h.update(f"{name}|{s.version}|".encode())
+            h.update(json.dumps(s.params, sort_keys=True, default=repr).encode())
+            h.update(s.source().encode())
+            for d in s.deps:
+                h.update(keys[d].encode())
+            keys[name] = f"{name}-{h.hexdigest()}"
+        return keys
+
+    def descendants(self, names):
+        out = set(names)
+        for name, s in self.stages.items():
+            if any(d in out for d in s.deps):
+                out.add(name)
+        return out
+
+    def plan(self, targets=None, force=()):
+        """Stages that must execute to produce `targets`; cached stages stop the walk upstream."""
+        keys = self.keys()
+        forced = self.descendants(force)
+        required = set(targets or self.stages)
+        to_run = []
+        for name in reversed(list(self.stages)):
+            if name not in required:
+                continue
+            s = self.stages[name]
+            if s.cache and name not in forced and self.store.has(keys[name]):
+                continue
+            to_run.append(name)
+            required.update(s.deps)
+        return keys, list(reversed(to_run)), required
+
+    def run(self, targets=None, force=()):
+        """Executes the plan; returns {target: output}. Completed stages stay cached if a later one fails."""
+        targets = list(targets or self.stages)
+        keys, to_run, required = self.plan(targets, force)
+        tracer = tracing.current()
+        values, lock = {}, threading.Lock()
+
+        def value(name):
+            with lock:
+                if name not in values:
+                    values[name] = self.store.load(keys[name])
+                return values[name]
+
+        def execute(name):
+            s = self.stages[name]
+            with tracing.activate(tracer) if tracer is not None else nullcontext():
+                args = [value(d) for d in s.deps]
+                t0 = time.perf_counter()
+                with tracing.stage(f'pipeline.{name}'):
+                    out = s.fn(*args)
+                seconds = time.perf_counter() - t0
+            if s.cache:
+                self.store.save(keys[name], out)
+            with lock:
+                values[name] = out
+            return seconds
+
+        for name in required:
+            if name not in to_run:
+                self._record(name, keys[name], 'cached')
+        print(f"Pipeline: {len(to_run)} stage(s) to run, {len(required) - len(to_run)} cached")
+
+        done, failed, running = set(), {}, {}
+        pending = list(to_run)
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="pipeline") as pool:
+            while pending or running:
+                if not failed:
+                    for name in [n for n in pending if all(d in done or d not in to_run for d in self.stages[n].deps)]:
+                        pending.remove(name)
+                        print(f"[{name}] running")
+                        running[pool.submit(execute, name)] = name
+                if not running:
+                    break
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for fut in finished:
+                    name = running.pop(fut)
+                    try:
+                        seconds = fut.result()
+                    except Exception as e:
+                        failed[name] = e
+                        self._record(name, keys[name], 'failed', error=repr(e))
+                        print(f"[{name}] FAILED: {e}")
+                    else:
+                        done.add(name)
+                        self._record(name, keys[name], 'done', seconds=seconds)
+                        print(f"[{name}] done in {seconds:.1f}s")
+        for name in pending:
+            self._record(name, keys[name], 'skipped')
+        self._save_state()
+        if failed:
+            names = ", ".join(failed)
+            raise PipelineError(f"stage(s) {names} failed; rerun to resume from the cached stages") from next(iter(failed.values()))
+        return {name: value(name) for name in targets}
+
+    def _record(self, name, key, status, seconds=None, error=None):
+        self.state[name] = {'key': key, 'status': status, 'seconds': seconds, 'error': error,
+                            'at': time.strftime("%Y-%m-%d %H:%M:%S")}
+
+    def _save_state(self):
+        tmp = self.state_path + ".tmp"
+        with open(tmp, 'w') as f:
+            json.dump(self.state, f, indent=2)
+        os.replace(tmp, self.state_path)
+
+def hash_file(path, chunk_size=1 << 20):
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+def build_training_pipeline(data_path, store_dir='.pipeline', models_dir='models', search_mlp=True,
+                            n_select=10, dtype='float64', test_size=0.2, random_state=42, stratify=None,
+                            max_workers=4):
+    """The CyberSentinel training DAG: clean -> split/scaler -> datasets -> models -> publish."""
+    import numpy as np
+    import pandas as pd
+    from sklearn.base import clone
+    from sklearn.preprocessing import StandardScaler
+    from data_preprocessing import DataPreprocessor, split_indices
+    from training_orchestrator import (ANOMALY, DEFAULT_MLP, ENSEMBLE_MEMBERS, MEMBERS, MODEL_FILES,
+                                       MULTICLASS_MLP, mlp_search, prefit_voting)
+
+    pipe = Pipeline(store_dir, max_workers)
+
+    @pipe.stage('clean', params={'data': hash_file(data_path)})
+    def clean():
+        dp = DataPreprocessor(data_path)
+        df = dp.clean_and_encode()
+        return {'df': df, 'malware_classes': list(dp.get_malware_classes()),
+                'target': dp.target, 'malware_type_col': dp.malware_type_col}
+
+    @pipe.stage('split', deps=('clean',), params={'test_size': test_size, 'random_state': random_state,
+                                                  'stratify': stratify})
+    def split(data):
+        # Same indices as DataPreprocessor.split_data, kept as compact int32 arrays
+        return dict(zip(('train', 'test'), split_indices(data['df'][stratify or data['target']].to_numpy(),
+                                                         test_size, random_state)))
+
+    def rows(data, idx):
+        df = data['df']
+        cols = [i for i, c in enumerate(df.columns) if c not in (data['target'], data['malware_type_col'])]
+        return pd.DataFrame(df.iloc[idx, cols].to_numpy(dtype=dtype), columns=df.columns[cols], index=df.index[idx])
+
+    @pipe.stage('scaler', deps=('clean', 'split'), params={'dtype': dtype})
+    def scaler(data, idx):
+        # Fitted on the training rows only
+        return StandardScaler().fit(rows(data, idx['train']).to_numpy())
+
+    @pipe.stage('datasets', deps=('clean', 'split', 'scaler'), params={'dtype': dtype}, cache=False)
+    def datasets(data, idx, fitted_scaler):
+        # Rebuilt from the cached pieces on every run, never stored; each split is scaled in place
+        df = data['df']
+        out = {}
+        for part in ('train', 'test'):
+            X = rows(data, idx[part])
+            out[f'X_{part}'] = pd.DataFrame(fitted_scaler.transform(X.to_numpy(), copy=False),
+                                            columns=X.columns, index=X.index, copy=False)
+            out[f'y_{part}'] = df[data['target']].iloc[idx[part]]
+            out[f'y_mal_{part}'] = df[data['malware_type_col']].iloc[idx[part]]
+        return out
+
+    if n_select:
+        @pipe.stage('features', deps=('datasets',), params={'n_select': n_select})
+        def features(d):
+            from search_algo import FeatureSelector
+            return list(FeatureSelector(d['X_train'], d['y_train']).select_features_rfe(n_features_to_select=n_select))
+
+    def fitter(estimator, target='y_train'):
+        def fit(d):
+            model = clone(estimator)
+            return model.fit(d['X_train']) if target is None else model.fit(d['X_train'], d[target])
+        return fit
+
+    for name, estimator in MEMBERS.items():
+        pipe.add(name, fitter(estimator), deps=('datasets',), params={'estimator': estimator.get_params()})
+    if search_mlp:
+        pipe.add('MLP', lambda d: mlp_search().fit(d['X_train'], d['y_train']).best_estimator_, deps=('datasets',),
+                 params={'search': mlp_search().get_params()})
+    else:
+        pipe.add('MLP', fitter(DEFAULT_MLP), deps=('datasets',), params={'estimator': DEFAULT_MLP.get_params()})
+    pipe.add('Multiclass', fitter(MULTICLASS_MLP, 'y_mal_train'), deps=('datasets',),
+             params={'estimator': MULTICLASS_MLP.get_params()})
+    pipe.add('Anomaly', fitter(ANOMALY), deps=('datasets',), params={'estimator': ANOMALY.get_params()})
+
+    @pipe.stage('Ensemble', deps=('datasets',) + tuple(name for _, name in ENSEMBLE_MEMBERS), cache=False)
+    def ensemble(d, *members):
+        return prefit_voting(list(zip((short for short, _ in ENSEMBLE_MEMBERS), members)), d['y_train'])
+
+    model_stages = tuple(MODEL_FILES)
+    publish_deps = ('clean', 'scaler', 'datasets') + model_stages + (('features',) if n_select else ())
+
+    @pipe.stage('publish', deps=publish_deps, params={'models_dir': models_dir}, cache=False)
+    def publish(data, fitted_scaler, d, *outputs):
+        os.makedirs(models_dir, exist_ok=True)
+        for name, model in zip(model_stages, outputs):
+            joblib.dump(model, os.path.join(models_dir, MODEL_FILES[name]))
+        # Same schema as DataPreprocessor.save_artifacts, for the scan path
+        joblib.dump({'scaler': fitted_scaler, 'feature_names': list(d['X_train'].columns),
+                     'malware_classes': data['malware_classes'], 'dtype': np.dtype(dtype).name},
+                    os.path.join(models_dir, 'preprocessor.pkl'))
+        if n_select:
+            with open(os.path.join(models_dir, 'selected_features.json'), 'w') as f:
+                json.dump(outputs[-1], f, indent=2)
+        print(f"Published {len(model_stages)} models to {models_dir}")
+        return models_dir
+
+    return pipe
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the training pipeline as a cached, resumable DAG")
+    parser.add_argument("--data", default="malmem.csv")
+    parser.add_argument("--store", default=".pipeline", help="artifact store and run state directory")
+    parser.add_argument("--models", default="models")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--no-search", action="store_true", help="skip the MLP hyperparameter search")
+    parser.add_argument("--select", type=int, default=10, help="RFE features to select (0 to skip)")
+    parser.add_argument("--float32", action="store_true")
+    parser.add_argument("--stratify-family", action="store_true", help="stratify the split on MalwareType")
+    parser.add_argument("--force", nargs="*", default=[], help="rerun these stages and everything downstream")
+    parser.add_argument("--prune", action="store_true", help="delete artifacts not used by this pipeline")
+    parser.add_argument("--no-register", action="store_true", help="do not snapshot the published models in the registry")
+    args = parser.parse_args()
+
+    pipe = build_training_pipeline(args.data, args.store, args.models, search_mlp=not args.no_search,
+                                   n_select=args.select, dtype='float32' if args.float32 else 'float64',
+                                   stratify='MalwareType' if args.stratify_family else None, max_workers=args.workers)
+    unknown = [s for s in args.force if s not in pipe.stages]
+    if unknown:
+        parser.error(f"unknown stages: {unknown}; available: {list(pipe.stages)}")
+    t0 = time.perf_counter()
+    try:
+        pipe.run(['publish'], force=args.force)
+    finally:
+        print(f"\n{'stage':<20} {'status':<8} {'seconds':>8}")
+        for name, rec in pipe.state.items():
+            print(f"{name:<20} {rec['status']:<8} {rec['seconds'] or 0:>8.1f}")
+        print(f"Total {time.perf_counter() - t0:.1f}s; state in {pipe.state_path}")
+    if args.prune:
+        print(f"Pruned {pipe.store.prune(set(pipe.keys().values()))} stale artifacts")
+    if not args.no_register:
+        from model_registry import ModelRegistry
+        # An unchanged publish has the same content hash and maps to the existing version
+        ModelRegistry(os.path.join(args.models, 'registry'), args.models).register(
+            dataset_hash=hash_file(args.data), note="pipeline",
+            params={'search_mlp': not args.no_search, 'select': args.select, 'float32': args.float32,
+                    'stratify_family': args.stratify_family},
+            training_seconds=sum(rec['seconds'] or 0 for rec in pipe.state.values()))
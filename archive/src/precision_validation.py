@@ -0,0 +1,90 @@
+import numpy as np
+import pandas as pd
+import joblib
+import json
+import os
+
+class PrecisionDriftValidator:
+    """Quantifies prediction drift of float32 inference against float64 on the held-out split."""
+
+    def __init__(self, X_test, y_test=None, y_mal_test=None):
+        self.X64 = np.asarray(X_test, dtype=np.float64)
+        self.X32 = self.X64.astype(np.float32)
+        self.y_test = None if y_test is None else np.asarray(y_test)
+        self.y_mal_test = None if y_mal_test is None else np.asarray(y_mal_test)
+        self.report = {}
+
+    def compare_model(self, name, model, y_true=None):
+        """Scores one model in both precisions and records agreement and probability drift."""
+        pred64 = model.predict(self.X64)
+        pred32 = model.predict(self.X32)
+        mismatches = int(np.sum(pred64 != pred32))
+        result = {
+            'rows': int(len(pred64)),
+            'mismatches': mismatches,
+            'agreement': float(1.0 - mismatches / max(len(pred64), 1)),
+        }
+
+        if hasattr(model, 'predict_proba'):
+            diff = np.abs(model.predict_proba(self.X64) - model.predict_proba(self.X32))
+            result['max_proba_drift'] = float(diff.max())
+            result['mean_proba_drift'] = float(diff.mean())
+        elif hasattr(model, 'decision_function'):
+            s64 = model.decision_function(self.X64)
+            s32 = model.decision_function(self.X32)
+            result['max_score_drift'] = float(np.abs(s64 - s32).max())
+            result['flag_flips'] = int(np.sum((s64 < 0) != (s32 < 0)))
+
+        if y_true is not None:
+            result['accuracy_float64'] = float(np.mean(pred64 == y_true))
+            result['accuracy_float32'] = float(np.mean(pred32 == y_true))
+
+        self.report[name] = result
+        print(f"{name}: agreement {result['agreement']:.6f} ({mismatches} mismatches)")
+        return result
+
+    def validate(self, models):
+        """models: {'name': (estimator, 'binary' | 'multiclass' | None)}"""
+        targets = {'binary': self.y_test, 'multiclass': self.y_mal_test}
+        for name, (model, task) in models.items():
+            if model is None:
+                continue
+            self.compare_model(name, model, targets.get(task))
+        return self.report
+
+    def to_frame(self):
+        return pd.DataFrame(self.report).T
+
+    def save_report(self, path='models/float32_drift_report.json'):
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        with open(path, 'w') as f:
+            json.dump(self.report, f, indent=2)
+        print(f"Drift report saved to {path}")
+        return path
+
+def load_scan_models(model_dir='models'):
+    """Loads the models used by the scan path, skipping any that are not trained yet."""
+    names = {
+        'ensemble': ('ensemble.pkl', 'binary'),
+        'mlp_optimized': ('mlp_optimized.pkl', 'binary'),
+        'mlp_multiclass': ('mlp_multiclass.pkl', 'multiclass'),
+        'anomaly_detector': ('anomaly_detector.pkl', None),
+    }
+    models = {}
+    for name, (fname, task) in names.items():
+        path = os.path.join(model_dir, fname)
+        if os.path.exists(path):
+            models[name] = (joblib.load(path), task)
+    return models
+
+if __name__ == "__main__":
+    from data_preprocessing import DataPreprocessor
+    dp = DataPreprocessor('malmem.csv')
+    _, X_test, _, y_test, _, y_mal_test = dp.split_data()
+
+    validator = PrecisionDriftValidator(X_test, y_test, y_mal_test)
+    validator.validate(load_scan_models())
+    print(validator.to_frame())
+    validator.save_report()
@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+
+SORT_COLUMNS = ['sample_id', 'confidence', 'anomaly_score', 'status', 'type']
+
+class ResultsView:
+    """Server-side filtering, sorting and paging over scan results, so only one page is ever rendered."""
+
+    def __init__(self, results):
+        self.frame = pd.DataFrame.from_records(results)
+        self._order_cache = {}
+
+    def __len__(self):
+        return len(self.frame)
+
+    def summary(self):
+        if self.frame.empty:
+            return {'scanned': 0, 'malware': 0, 'benign': 0, 'anomalies': 0}
+        malware = int((self.frame['status'] == 'Malware').sum())
+        return {
+            'scanned': len(self.frame),
+            'malware': malware,
+            'benign': len(self.frame) - malware,
+            'anomalies': int(self.frame['is_anomaly'].sum())
+        }
+
+    def families(self):
+        if self.frame.empty:
+            return []
+        return sorted(self.frame.loc[self.frame['status'] == 'Malware', 'type'].unique().tolist())
+
+    def query(self, status='All', family='All', anomalies_only=False, sort_by='sample_id', ascending=True):
+        """Row positions matching the filters in sort order (cached per filter/sort combination)."""
+        key = (status, family, anomalies_only, sort_by, ascending)
+        positions = self._order_cache.get(key)
+        if positions is not None:
+            return positions
+
+        if self.frame.empty:
+            positions = np.empty(0, dtype=np.intp)
+        else:
+            mask = np.ones(len(self.frame), dtype=bool)
+            if status != 'All':
+                mask &= (self.frame['status'] == status).to_numpy()
+            if family != 'All':
+                mask &= (self.frame['type'] == family).to_numpy()
+            if anomalies_only:
+                mask &= self.frame['is_anomaly'].to_numpy()
+            positions = np.flatnonzero(mask)
+            values = self.frame[sort_by].to_numpy()[positions]
+            order = np.argsort(values, kind='stable')
+            positions = positions[order if ascending else order[::-1]]
+
+        self._order_cache[key] = positions
+        return positions
+
+    def page(self, positions, page, page_size):
+        """The rows of one page, in the order given by `positions`."""
+        start = page * page_size
+        return self.frame.iloc[positions[start:start + page_size]]
+
+    @staticmethod
+    def page_count(positions, page_size):
+        return max(1, -(-len(positions) // page_size))
+
+    def row(self, position):
+        return self.frame.iloc[position].to_dict()
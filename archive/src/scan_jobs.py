@@ -0,0 +1,108 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import metrics
+import tracing
+
+class ScanJob:
+    """State of one background scan: status, row-level progress, results or error."""
+
+    def __init__(self, job_id, total_rows, label=""):
+        self.job_id = job_id
+        self.label = label
+        self.status = "queued"
+        self.total_rows = total_rows
+        self.rows_done = 0
+        self.results = None
+        self.stats = {}
+        self.trace = None
+        self.error = None
+        self.submitted_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+
+    @property
+    def fraction(self):
+        return self.rows_done / self.total_rows if self.total_rows else 1.0
+
+    @property
+    def is_active(self):
+        return self.status in ("queued", "running")
+
+    def elapsed(self):
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.time()) - self.started_at
+
+class ScanJobManager:
+    """Runs scans on a background thread pool so the Streamlit script thread never blocks.
+
+    One manager is shared by every session (see app.get_job_manager), so
+    several analysts can queue scans at once and a page can reattach to a
+    running or finished job by its ID after a rerun or browser refresh.
+    """
+
+    def __init__(self, max_workers=2, max_finished=50):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="scan")
+        self.max_finished = max_finished
+        self.jobs = OrderedDict()
+        self.lock = threading.Lock()
+
+    def submit(self, scanner, input_df, on_batch=None, label="", tracer=None):
+        """Queues `scanner.scan(input_df)` and returns the new job ID immediately.
+
+        If a tracing.Tracer is given, the scan's stages (and an optional
+        profile) are recorded into it and kept on the job.
+        """
+        job = ScanJob(uuid.uuid4().hex[:12], len(input_df), label)
+        job.trace = tracer
+        with self.lock:
+            self.jobs[job.job_id] = job
+            self._evict_finished()
+        self.executor.submit(self._run, job, scanner, input_df, on_batch)
+        return job.job_id
+
+    def _run(self, job, scanner, input_df, on_batch):
+        job.status = "running"
+        job.started_at = time.time()
+
+        def progress(rows_done, total):
+            job.rows_done = rows_done
+
+        try:
+            if job.trace is not None:
+                with tracing.activate(job.trace), job.trace.profiled():
+                    job.results = scanner.scan(input_df, progress=progress, on_batch=on_batch)
+            else:
+                job.results = scanner.scan(input_df, progress=progress, on_batch=on_batch)
+            job.stats = dict(getattr(scanner, 'last_stats', {}))
+            job.status = "done"
+            elapsed = time.time() - job.started_at
+            metrics.SCAN_SECONDS.observe(elapsed)
+            metrics.SCAN_THROUGHPUT.set(job.total_rows / elapsed if elapsed > 0 else 0.0)
+        except Exception as e:
+            job.error = str(e)
+            job.status = "failed"
+        finally:
+            job.finished_at = time.time()
+
+    def _evict_finished(self):
+        finished = [jid for jid, j in self.jobs.items() if not j.is_active]
+        for jid in finished[:max(0, len(finished) - self.max_finished)]:
+            del self.jobs[jid]
+
+    def get(self, job_id):
+        with self.lock:
+            return self.jobs.get(job_id)
+
+    def queue_position(self, job_id):
+        """1-based position among queued jobs, or 0 if the job is not waiting."""
+        with self.lock:
+            queued = [jid for jid, j in self.jobs.items() if j.status == "queued"]
+        return queued.index(job_id) + 1 if job_id in queued else 0
+
+    def list_jobs(self):
+        with self.lock:
+            return list(reversed(self.jobs.values()))
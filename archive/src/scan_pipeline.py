@@ -0,0 +1,216 @@
+import numpy as np
+import joblib
+import os
+import time
+from datetime import datetime
+import metrics
+from anomaly import load_detector
+from fast_mlp import accelerate
+from model_registry import live_version
+from verdict_cache import model_fingerprint
+from tracing import stage
+
+class ScanPreprocessor:
+    """Maps uploaded columns to the trained feature order once and scales a single NumPy block in place."""
+
+    def __init__(self, scaler, feature_names, dtype=np.float64):
+        self.feature_names = list(feature_names)
+        self.dtype = np.dtype(dtype)
+        mean = getattr(scaler, 'mean_', None)
+        scale = getattr(scaler, 'scale_', None)
+        self.mean = None if mean is None else np.ascontiguousarray(mean, dtype=self.dtype)
+        self.scale = None if scale is None else np.ascontiguousarray(scale, dtype=self.dtype)
+        self._index_cache = {}
+
+    def column_indices(self, columns):
+        """Positions of the trained features inside `columns` (cached per header)."""
+        key = tuple(columns)
+        idx = self._index_cache.get(key)
+        if idx is None:
+            positions = {c: i for i, c in enumerate(key)}
+            missing = [f for f in self.feature_names if f not in positions]
+            if missing:
+                raise KeyError(f"Missing feature columns: {missing}")
+            idx = np.array([positions[f] for f in self.feature_names], dtype=np.intp)
+            self._index_cache[key] = idx
+        return idx
+
+    def extract(self, input_df, out=None):
+        """Copies the trained features of `input_df` into a single (n, k) block.
+
+        The block is column-major, so each feature is one contiguous copy
+        out of its pandas column; scaling and the models accept either order.
+        """
+        idx = self.column_indices(input_df.columns)
+        n = len(input_df)
+        if out is None:
+            out = np.empty((len(idx), n), dtype=self.dtype).T
+        for j, col in enumerate(idx):
+            out[:, j] = input_df.iloc[:, col].to_numpy()
+        return out
+
+    def scale_inplace(self, X):
+        """Applies (X - mean) / scale in place, exactly as StandardScaler.transform."""
+        if self.mean is not None:
+            X -= self.mean
+        if self.scale is not None:
+            X /= self.scale
+        return X
+
+    def transform(self, input_df, out=None):
+        return self.scale_inplace(self.extract(input_df, out=out))
+
+class ThreatScanner:
+    """Scores uploaded rows with the ensemble, anomaly and malware-type models in batches."""
+
+    def __init__(self, preprocessor, ensemble, anomaly, multiclass, malware_classes, batch_size=5000,
+                 cache=None, model_version="", drift=None):
+        self.preprocessor = preprocessor
+        self.ensemble = ensemble
+        self.anomaly = anomaly
+        self.multiclass = multiclass
+        self.malware_classes = np.asarray(malware_classes)
+        self.batch_size = batch_size
+        self.cache = cache
+        self.model_version = model_version
+        self.drift = drift
+        self.shadow = None
+        self.last_stats = {}
+
+    @classmethod
+    def from_model_dir(cls, scaler, feature_names, malware_classes, model_dir='models', dtype=np.float64, batch_size=5000,
+                       cache=None, fast_mlp=False, drift=None, preprocessor=None):
+        """Loads the scan models saved by AdvancedModelTrainer.save_models().
+
+        With fast_mlp the MLPs (the ensemble member and the malware-type
+        model) run through FastMLP's float32 forward pass. `drift` is an
+        optional DriftMonitor that every scaled batch is folded into. Pass a
+        long-lived `preprocessor` to keep its per-header column lookup
+        across scans.
+        """
+        paths = [os.path.join(model_dir, f) for f in ('ensemble.pkl', 'anomaly_detector.pkl', 'mlp_multiclass.pkl')]
+        t0 = time.perf_counter()
+        with stage('scan.load_models'):
+            ens, multi = joblib.load(paths[0]), joblib.load(paths[2])
+            # Memory-mapped and cached across scanners while the file is unchanged
+            anom = load_detector(paths[1])
+        metrics.MODEL_LOAD_SECONDS.observe(time.perf_counter() - t0)
+        for name, p in zip(('ensemble', 'anomaly', 'multiclass'), paths):
+            metrics.MODEL_MEMORY.set(os.path.getsize(p), model=name)
+        fingerprint = model_fingerprint(paths)
+        # Registry version id when the files are a registered version, else the file fingerprint
+        version = live_version(model_dir, fingerprint) or fingerprint
+        if fast_mlp:
+            ens, multi = accelerate(ens), accelerate(multi)
+            # Float32 probabilities can differ in the last digits, so keep their cached verdicts apart
+            version += "+fastmlp"
+        prep = preprocessor or ScanPreprocessor(scaler, feature_names, dtype)
+        return cls(prep, ens, anom, multi, malware_classes, batch_size=batch_size,
+                   cache=cache, model_version=version, drift=drift)
+
+    def predict_verdicts(self, scaled):
+        """Runs the three models on a scaled block and returns one verdict dict per row."""
+        n = len(scaled)
+        t0 = time.perf_counter()
+        with stage('scan.ensemble', rows=n):
+            preds = self.ensemble.predict(scaled)
+            probs = self.ensemble.predict_proba(scaled)
+        t1 = time.perf_counter()
+        with stage('scan.anomaly', rows=n):
+            scores = self.anomaly.decision_function(scaled)
+        t2 = time.perf_counter()
+        metrics.INFERENCE_SECONDS.observe(t1 - t0, model='ensemble')
+        metrics.INFERENCE_SECONDS.observe(t2 - t1, model='anomaly')
+
+        types = np.full(len(preds), "N/A", dtype=object)
+        mal_rows = np.flatnonzero(preds == 1)
+        if len(mal_rows):
+            with stage('scan.multiclass', rows=len(mal_rows)):
+                types[mal_rows] = self.malware_classes[self.multiclass.predict(scaled[mal_rows])]
+            metrics.INFERENCE_SECONDS.observe(time.perf_counter() - t2, model='multiclass')
+
+        confidence = probs.max(axis=1) * 100
+        return [{
+            "status": "Malware" if preds[i] == 1 else "Benign",
+            "type": str(types[i]),
+            "confidence": float(confidence[i]),
+            "anomaly_score": float(scores[i]),
+            "is_anomaly": bool(scores[i] < 0)
+        } for i in range(len(preds))]
+
+    def score_batch(self, scaled, offset=0):
+        """Returns one history-style record per row of an already scaled block."""
+        if self.drift is not None:
+            with stage('scan.drift', rows=len(scaled)):
+                self.drift.update(scaled)
+        t0 = time.perf_counter()
+        if self.cache is None:
+            verdicts = self.predict_verdicts(scaled)
+            scored = len(verdicts)
+        else:
+            with stage('scan.cache_lookup', rows=len(scaled)):
+                keys = self.cache.keys_for(scaled, self.model_version)
+                verdicts = self.cache.get_many(keys)
+            # Score each distinct missing vector once
+            first = {}
+            for i, v in enumerate(verdicts):
+                if v is None:
+                    first.setdefault(keys[i], i)
+            scored = len(first)
+            misses = sum(1 for v in verdicts if v is None)
+            self.last_stats['cache_hits'] = self.last_stats.get('cache_hits', 0) + len(verdicts) - misses
+            self.last_stats['cache_misses'] = self.last_stats.get('cache_misses', 0) + misses
+            if first:
+                fresh = dict(zip(first, self.predict_verdicts(scaled[list(first.values())])))
+                self.cache.put_many(fresh)
+                verdicts = [fresh[keys[i]] if v is None else v for i, v in enumerate(verdicts)]
+        if self.shadow is not None:
+            # Runs on the shadow's own thread; the batch is dropped there if it is falling behind
+            self.shadow.submit(scaled, verdicts, time.perf_counter() - t0, scored)
+
+        self.last_stats['rows_scored'] = self.last_stats.get('rows_scored', 0) + scored
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        records = [dict(timestamp=timestamp, sample_id=int(offset + i), model_version=self.model_version, **v)
+                   for i, v in enumerate(verdicts)]
+        metrics.record_verdicts(records)
+        return records
+
+    def scan(self, input_df, progress=None, on_batch=None):
+        """Scans `input_df` batch by batch.
+
+        progress(rows_done, total_rows) is called after each batch and
+        on_batch(records) receives the records of each finished batch.
+        Per-scan counters (rows scored by the models, cache hits/misses)
+        are left in `last_stats`.
+        """
+        total = len(input_df)
+        self.last_stats = {'rows': total, 'rows_scored': 0, 'model_version': self.model_version}
+        results = []
+        for start in range(0, total, self.batch_size):
+            batch = input_df.iloc[start:start + self.batch_size]
+            with stage('scan.preprocess', rows=len(batch)):
+                scaled = self.preprocessor.transform(batch)
+            records = self.score_batch(scaled, offset=start)
+            results.extend(records)
+            if on_batch is not None:
+                with stage('scan.history_write', rows=len(records)):
+                    on_batch(records)
+            if progress is not None:
+                progress(start + len(batch), total)
+
+        if self.cache is not None:
+            hits = self.last_stats.get('cache_hits', 0)
+            lookups = hits + self.last_stats.get('cache_misses', 0)
+            self.last_stats['cache_hit_rate'] = hits / lookups if lookups else 0.0
+            self.last_stats['cache_entries'] = len(self.cache.entries)
+            self.cache.save()
+        if self.drift is not None:
+            report = self.drift.check()
+            self.last_stats['drift_alert'] = report['alert']
+            self.last_stats['drifted_features'] = report['drifted']
+            if self.drift.path:
+                self.drift.save()
+        if self.shadow is not None:
+            self.last_stats['shadow'] = self.shadow.summary()
+            self.shadow.save()
+        return results
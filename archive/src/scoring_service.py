@@ -0,0 +1,310 @@
+"""
+Local scoring service for SOAR tooling.
+
+Serves the scan models over HTTP (TCP or a Unix socket). Concurrent
+single-row requests are coalesced into micro-batches by MicroBatcher, and
+verdicts are returned in the same schema as scan history records.
+
+    python src/scoring_service.py --port 8765
+    python src/scoring_service.py --port 8765 --fast-mlp       # MLPs on the fused float32 forward pass
+    python src/scoring_service.py --port 8765 --drift-state models/drift_state.npz
+    python src/scoring_service.py --port 8765 --shadow 20250301-101500-3fa2  # A/B a registered version
+    python src/scoring_service.py --unix-socket /tmp/cybersentinel.sock
+    python src/scoring_service.py --score test_sample.csv --url http://127.0.0.1:8765
+"""
+
+import argparse
+import json
+import os
+import queue
+import socketserver
+import threading
+import time
+import urllib.request
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pandas as pd
+import metrics
+from data_preprocessing import DataPreprocessor
+from scan_pipeline import ThreatScanner
+
+class MicroBatcher:
+    """Coalesces concurrent scoring requests into batches.
+
+    A batch is flushed when it reaches `max_batch` rows or `max_wait_ms`
+    after its first row arrived, whichever comes first.
+    """
+
+    def __init__(self, scanner, max_batch=256, max_wait_ms=5, on_batch=None):
+        self.scanner = scanner
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self.on_batch = on_batch
+        self.queue = queue.Queue()
+        self.batches = 0
+        self.rows = 0
+        self._stop = threading.Event()
+        self.worker = threading.Thread(target=self._loop, name="micro-batcher", daemon=True)
+        self.worker.start()
+
+    def submit(self, rows):
+        """Queues a list of feature dicts; the returned Future resolves to their verdicts."""
+        missing = [f for f in self.scanner.preprocessor.feature_names if any(f not in r for r in rows)]
+        if missing:
+            raise KeyError(f"Missing feature columns: {missing}")
+        fut = Future()
+        self.queue.put((rows, fut))
+        return fut
+
+    def score(self, rows, timeout=30):
+        return self.submit(rows).result(timeout=timeout)
+
+    def _collect(self):
+        try:
+            first = self.queue.get(timeout=0.1)
+        except queue.Empty:
+            return []
+        pending, n = [first], len(first[0])
+        deadline = time.monotonic() + self.max_wait
+        while n < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self.queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            pending.append(item)
+            n += len(item[0])
+        return pending
+
+    def _loop(self):
+        while not self._stop.is_set():
+            pending = self._collect()
+            if pending:
+                self._flush(pending)
+
+    def _score(self, rows):
+        return self.scanner.score_batch(self.scanner.preprocessor.transform(pd.DataFrame.from_records(rows)))
+
+    def _flush(self, pending):
+        rows = [r for req_rows, _ in pending for r in req_rows]
+        try:
+            records = self._score(rows)
+        except Exception as e:
+            if len(pending) == 1:
+                pending[0][1].set_exception(e)
+                return
+            # One malformed request must not fail the others: score them one by one, failing only the bad ones
+            scored = []
+            for req_rows, fut in pending:
+                try:
+                    scored.append((req_rows, fut, self._score(req_rows)))
+                except Exception as req_error:
+                    fut.set_exception(req_error)
+            if not scored:
+                return
+            pending = [(req_rows, fut) for req_rows, fut, _ in scored]
+            rows = [r for req_rows, _ in pending for r in req_rows]
+            records = [v for _, _, verdicts in scored for v in verdicts]
+        self.batches += 1
+        self.rows += len(rows)
+        # on_batch gets its own copies: the writer thread may still read them after the
+        # per-request sample_id renumbering below, and the callers get their verdicts first
+        history = [dict(r) for r in records] if self.on_batch is not None else None
+
+        start = 0
+        for req_rows, fut in pending:
+            verdicts = records[start:start + len(req_rows)]
+            for i, v in enumerate(verdicts):
+                v['sample_id'] = i
+            fut.set_result(verdicts)
+            start += len(req_rows)
+
+        if history is not None:
+            try:
+                self.on_batch(history)
+            except Exception as e:
+                # A failing history sink must not stop the batcher thread
+                print(f"on_batch failed for a batch of {len(history)} verdicts: {e!r}")
+
+    def stats(self):
+        return {
+            'batches': self.batches,
+            'rows': self.rows,
+            'avg_batch_size': self.rows / self.batches if self.batches else 0.0,
+            'queued': self.queue.qsize()
+        }
+
+    def close(self):
+        self._stop.set()
+        self.worker.join(timeout=1)
+
+class ScoringHandler(BaseHTTPRequestHandler):
+    """POST /score with one feature object or a list of them; GET /health for status, GET /metrics for Prometheus."""
+
+    batcher = None
+    model_version = ""
+
+    def address_string(self):
+        # Unix socket clients have no (host, port) address
+        return self.client_address[0] if isinstance(self.client_address, tuple) else "unix"
+
+    def _send(self, code, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send(200, {"status": "ok", "model_version": self.model_version, **self.batcher.stats()})
+        elif self.path == "/metrics":
+            body = metrics.REGISTRY.render().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        else:
+            self._send(404, {"error": "not found"})
+
+    def do_POST(self):
+        if self.path != "/score":
+            self._send(404, {"error": "not found"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            payload = json.loads(self.rfile.read(length) or b"null")
+            single = isinstance(payload, dict)
+            rows = [payload] if single else payload
+            if not isinstance(rows, list) or not rows or not all(isinstance(r, dict) for r in rows):
+                raise ValueError("expected a feature object or a non-empty list of feature objects")
+            verdicts = self.batcher.score(rows)
+        except (ValueError, KeyError) as e:
+            self._send(400, {"error": str(e)})
+            return
+        except Exception as e:
+            self._send(500, {"error": str(e)})
+            return
+        self._send(200, verdicts[0] if single else verdicts)
+
+    def log_message(self, format, *args):
+        pass
+
+if hasattr(socketserver, "ThreadingUnixStreamServer"):
+    class UnixScoringServer(socketserver.ThreadingUnixStreamServer):
+        daemon_threads = True
+
+def build_scanner(artifacts_path='models/preprocessor.pkl', model_dir='models', data_path=None, cache=None,
+                  fast_mlp=False):
+    """ThreatScanner from saved preprocessing artifacts, or by refitting the scaler from the dataset."""
+    if data_path is None or os.path.exists(artifacts_path):
+        art = DataPreprocessor.load_artifacts(artifacts_path)
+        scaler, features, classes, dtype = art['scaler'], art['feature_names'], art['malware_classes'], art['dtype']
+    else:
+        dp = DataPreprocessor(data_path)
+        dp.split_data()
+        scaler, features, classes, dtype = dp.scaler, dp.feature_names, dp.get_malware_classes(), dp.dtype
+    return ThreatScanner.from_model_dir(scaler, features, classes, model_dir=model_dir, dtype=dtype, cache=cache,
+                                        fast_mlp=fast_mlp)
+
+def make_server(scanner, host="127.0.0.1", port=8765, unix_socket=None, max_batch=256, max_wait_ms=5, on_batch=None):
+    """(server, batcher) bound but not yet serving; port 0 picks a free port (server.server_address)."""
+    batcher = MicroBatcher(scanner, max_batch=max_batch, max_wait_ms=max_wait_ms, on_batch=on_batch)
+    handler = type("Handler", (ScoringHandler,), {"batcher": batcher, "model_version": scanner.model_version})
+    if unix_socket:
+        if not hasattr(socketserver, "ThreadingUnixStreamServer"):
+            raise OSError("Unix sockets are not supported on this platform; use --port")
+        if os.path.exists(unix_socket):
+            os.remove(unix_socket)
+        server = UnixScoringServer(unix_socket, handler)
+        print(f"Scoring service listening on unix:{unix_socket}")
+    else:
+        server = ThreadingHTTPServer((host, port), handler)
+        print(f"Scoring service listening on http://{host}:{server.server_address[1]}")
+    return server, batcher
+
+def serve(scanner, host="127.0.0.1", port=8765, unix_socket=None, max_batch=256, max_wait_ms=5, on_batch=None):
+    server, batcher = make_server(scanner, host, port, unix_socket, max_batch, max_wait_ms, on_batch)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        batcher.close()
+
+def score_rows(url, rows, timeout=30):
+    """Minimal client: POSTs feature rows to a running service and returns the verdicts."""
+    req = urllib.request.Request(url.rstrip("/") + "/score", data=json.dumps(rows).encode(),
+                                 headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(req, timeout=timeout) as resp:
+        return json.loads(resp.read())
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="CyberSentinel local scoring service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix-socket")
+    parser.add_argument("--models", default="models")
+    parser.add_argument("--artifacts", default="models/preprocessor.pkl")
+    parser.add_argument("--data", help="dataset to refit the scaler from if no artifacts are saved")
+    parser.add_argument("--max-batch", type=int, default=256)
+    parser.add_argument("--max-wait-ms", type=float, default=5)
+    parser.add_argument("--fast-mlp", action="store_true", help="score the MLPs with the fused float32 forward pass")
+    parser.add_argument("--drift-state", help="saved DriftMonitor (.npz) to update with every scored batch")
+    parser.add_argument("--shadow", nargs="?", const="registry",
+                        help="shadow-score a registered model version (default: the registry's shadow)")
+    parser.add_argument("--record-history", help="append verdicts to this history database")
+    parser.add_argument("--score", help="client mode: CSV file to send to --url")
+    parser.add_argument("--url", default="http://127.0.0.1:8765")
+    args = parser.parse_args()
+
+    if args.score:
+        rows = pd.read_csv(args.score).to_dict(orient="records")
+        for v in score_rows(args.url, rows):
+            print(v)
+    else:
+        on_batch = None
+        if args.record_history:
+            from history_store import HistoryStore, HistoryWriter
+            # Queued, so requests are not held up by history commits
+            writer = HistoryWriter(HistoryStore(args.record_history))
+            on_batch = writer.submit
+        scanner = build_scanner(args.artifacts, args.models, args.data, fast_mlp=args.fast_mlp)
+        if args.drift_state:
+            from drift import DriftMonitor
+            scanner.drift = DriftMonitor.load(args.drift_state)
+            scanner.drift.path = args.drift_state
+
+            def persist_drift(monitor, interval=60.0):
+                # score_batch only updates the sketches; refresh the gauges and save them periodically
+                while True:
+                    time.sleep(interval)
+                    monitor.check()
+                    monitor.save()
+            threading.Thread(target=persist_drift, args=(scanner.drift,), name="drift-state", daemon=True).start()
+        if args.shadow:
+            from model_registry import ModelRegistry, ShadowScorer
+            registry = ModelRegistry(os.path.join(args.models, 'registry'), args.models)
+            shadow = registry.state()['shadow'] if args.shadow == "registry" else args.shadow
+            if shadow:
+                scanner.shadow = ShadowScorer(scanner.preprocessor, registry.scanner(shadow, fast_mlp=args.fast_mlp),
+                                              primary_version=scanner.model_version,
+                                              stats_path=registry.shadow_stats_path(scanner.model_version, shadow))
+
+                def persist_shadow(scorer, interval=60.0):
+                    while True:
+                        time.sleep(interval)
+                        scorer.save()
+                threading.Thread(target=persist_shadow, args=(scanner.shadow,), name="shadow-stats", daemon=True).start()
+            else:
+                print("No shadow version set in the registry")
+        try:
+            serve(scanner, args.host, args.port, args.unix_socket, args.max_batch, args.max_wait_ms, on_batch)
+        finally:
+            if args.record_history:
+                writer.flush(timeout=30)
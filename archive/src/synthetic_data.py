@@ -0,0 +1,235 @@
+"""
+Synthetic MalMem-shaped data for scale testing.
+
+MalMemSynthesizer learns, per malware type (Benign, Ransomware, Spyware,
+Trojan), the empirical quantiles of every feature and the rank
+correlations between features (a Gaussian copula), plus the class and
+family mix. It then streams arbitrarily many rows to CSV or Parquet in
+chunks of constant memory.
+
+    python src/synthetic_data.py --fit malmem.csv --save-profile models/synth_profile.pkl --rows 0
+    python src/synthetic_data.py --profile models/synth_profile.pkl --rows 1000000 --out malmem_1m.csv
+    python src/synthetic_data.py --rows 1000000 --out malmem_1m.parquet --format parquet
+
+Without a dataset or saved profile, the marginals come from the dataset
+summary in data_info.txt (shared by all classes, with malware rows
+shifted) and features are independent. That is enough for load testing
+but not for model-quality work.
+"""
+
+import argparse
+import os
+import joblib
+import numpy as np
+import pandas as pd
+from scipy.special import ndtr, ndtri
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FEATURE_GROUPS = ('pslist', 'dlllist', 'handles', 'ldrmodules', 'malfind', 'psxview', 'modules', 'svcscan', 'callbacks')
+DEFAULT_MIX = {'Benign': 0.5, 'Ransomware': 0.5 / 3, 'Spyware': 0.5 / 3, 'Trojan': 0.5 / 3}
+DEFAULT_FAMILIES = {
+    'Ransomware': ['Ransomware-Ako', 'Ransomware-Conti', 'Ransomware-Maze', 'Ransomware-Pysa', 'Ransomware-Shade'],
+    'Spyware': ['Spyware-180solutions', 'Spyware-CWS', 'Spyware-Gator', 'Spyware-TIBS', 'Spyware-Transponder'],
+    'Trojan': ['Trojan-Emotet', 'Trojan-Reconyc', 'Trojan-Refroso', 'Trojan-Scar', 'Trojan-Zeus'],
+}
+
+def _family(category):
+    """'Ransomware-Ako-<hash>' -> 'Ransomware-Ako'; 'Benign' -> 'Benign'."""
+    return '-'.join(str(category).split('-')[:2])
+
+def _nearest_correlation(corr):
+    """Clips negative eigenvalues so the matrix has a Cholesky factor."""
+    corr = np.nan_to_num(corr)
+    np.fill_diagonal(corr, 1.0)
+    vals, vecs = np.linalg.eigh(corr)
+    corr = (vecs * np.clip(vals, 1e-6, None)) @ vecs.T
+    d = np.sqrt(np.diag(corr))
+    return corr / np.outer(d, d)
+
+class MalMemSynthesizer:
+    def __init__(self, n_quantiles=257, max_fit_rows=50000):
+        self.n_quantiles = n_quantiles
+        self.max_fit_rows = max_fit_rows
+        self.features = None
+        self.integer_columns = None
+        self.groups = {}
+        self.mix = dict(DEFAULT_MIX)
+        self.families = {}
+
+    def fit(self, df, random_state=42):
+        """Learns per-type marginals, copula correlations and the class/family mix from a raw MalMem frame."""
+        rng = np.random.default_rng(random_state)
+        self.features = [c for c in df.columns if c not in ('Category', 'Class')]
+        values = df[self.features]
+        self.integer_columns = [c for c in self.features
+                                if np.all(np.mod(values[c].to_numpy(dtype=float), 1) == 0)]
+
+        malware_type = df['Category'].map(lambda x: str(x).split('-')[0])
+        levels = np.linspace(0.0, 1.0, self.n_quantiles)
+        self.groups = {}
+        for name, idx in malware_type.groupby(malware_type).groups.items():
+            X = values.loc[idx].to_numpy(dtype=float)
+            if len(X) > self.max_fit_rows:
+                X = X[rng.choice(len(X), self.max_fit_rows, replace=False)]
+            # Normal scores of the ranks give the copula correlation
+            ranks = np.argsort(np.argsort(X, axis=0), axis=0)
+            z = ndtri((ranks + 0.5) / len(X))
+            with np.errstate(invalid='ignore', divide='ignore'):
+                corr = np.corrcoef(z, rowvar=False) if len(X) > 1 else np.eye(len(self.features))
+            self.groups[name] = {
+                'levels': levels,
+                'quantiles': np.quantile(X, levels, axis=0),
+                'chol': np.linalg.cholesky(_nearest_correlation(corr)),
+            }
+
+        counts = malware_type.value_counts(normalize=True)
+        self.mix = {k: float(v) for k, v in counts.items()}
+        fam = df['Category'].map(_family)
+        self.families = {}
+        for name in self.groups:
+            fc = fam[malware_type == name].value_counts(normalize=True)
+            self.families[name] = {k: float(v) for k, v in fc.items()}
+        print(f"Synthesizer fitted on {len(df)} rows: mix {self.mix}")
+        return self
+
+    @classmethod
+    def from_description(cls, path=None, malware_shift=0.15):
+        """Schema-only prior from the df.describe() table in data_info.txt (no correlations)."""
+        path = path or os.path.join(BASE_DIR, 'data_info.txt')
+        stats = _parse_description(path)
+        synth = cls()
+        synth.features = list(stats.columns)
+        sample = os.path.join(BASE_DIR, 'test_sample.csv')
+        if os.path.exists(sample):
+            s = pd.read_csv(sample)
+            synth.integer_columns = [c for c in synth.features if c in s and np.all(np.mod(s[c], 1) == 0)]
+        else:
+            synth.integer_columns = []
+        levels = np.array([0.0, 0.25, 0.5, 0.75, 1.0])
+        q = stats.loc[['min', '25%', '50%', '75%', 'max']].to_numpy(dtype=float)
+        eye = np.eye(len(synth.features))
+        for i, name in enumerate(DEFAULT_MIX):
+            # Malware types are pushed progressively away from benign so classifiers have signal
+            factor = 1.0 if name == 'Benign' else 1.0 + malware_shift * i
+            synth.groups[name] = {'levels': levels, 'quantiles': q * factor, 'chol': eye}
+        synth.families = {'Benign': {'Benign': 1.0}}
+        for name, fams in DEFAULT_FAMILIES.items():
+            synth.families[name] = {f: 1.0 / len(fams) for f in fams}
+        return synth
+
+    def sample(self, n_rows, rng):
+        """One chunk of rows with Category, features and Class columns."""
+        names = list(self.groups)
+        p = np.array([self.mix.get(n, 0.0) for n in names])
+        group_idx = rng.choice(len(names), n_rows, p=p / p.sum())
+        X = np.empty((n_rows, len(self.features)))
+        category = np.empty(n_rows, dtype=object)
+        for g, name in enumerate(names):
+            rows = np.flatnonzero(group_idx == g)
+            if not len(rows):
+                continue
+            model = self.groups[name]
+            u = ndtr(rng.standard_normal((len(rows), len(self.features))) @ model['chol'].T)
+            for j in range(len(self.features)):
+                X[rows, j] = np.interp(u[:, j], model['levels'], model['quantiles'][:, j])
+            fams = self.families.get(name, {name: 1.0})
+            fp = np.array(list(fams.values()))
+            picked = np.array(list(fams.keys()), dtype=object)[rng.choice(len(fams), len(rows), p=fp / fp.sum())]
+            category[rows] = picked if name == 'Benign' else picked + '-synthetic'
+
+        df = pd.DataFrame(X, columns=self.features)
+        for c in self.integer_columns:
+            df[c] = np.rint(df[c]).astype(np.int64)
+        df.insert(0, 'Category', category)
+        df['Class'] = np.where(category == 'Benign', 'Benign', 'Malware')
+        return df
+
+    def generate(self, n_rows, chunk_size=100000, seed=42):
+        """Yields DataFrame chunks until n_rows rows have been produced."""
+        rng = np.random.default_rng(seed)
+        done = 0
+        while done < n_rows:
+            n = min(chunk_size, n_rows - done)
+            yield self.sample(n, rng)
+            done += n
+
+    def write_csv(self, path, n_rows, chunk_size=100000, seed=42):
+        for i, chunk in enumerate(self.generate(n_rows, chunk_size, seed)):
+            chunk.to_csv(path, mode='w' if i == 0 else 'a', header=(i == 0), index=False)
+        return path
+
+    def write_parquet(self, path, n_rows, chunk_size=100000, seed=42):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Parquet output needs pyarrow: pip install pyarrow")
+        writer = None
+        try:
+            for chunk in self.generate(n_rows, chunk_size, seed):
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(path, table.schema)
+                writer.write_table(table)
+        finally:
+            if writer is not None:
+                writer.close()
+        return path
+
+    def save(self, path):
+        joblib.dump(self.__dict__, path)
+        print(f"Synthesizer profile saved to {path}")
+
+    @classmethod
+    def load(cls, path):
+        synth = cls()
+        synth.__dict__.update(joblib.load(path))
+        return synth
+
+def _parse_description(path):
+    """Reads the wrapped df.describe() blocks written by inspect_data.py back into a frame."""
+    with open(path) as f:
+        text = f.read()
+    section = text.split('Description:', 1)[1].split('Columns:', 1)[0]
+    frames = []
+    for block in section.strip().split('\n\n'):
+        lines = [l for l in block.splitlines() if l.strip()]
+        if not lines:
+            continue
+        cols = lines[0].replace('\\', '').split()
+        rows = {}
+        for line in lines[1:]:
+            parts = line.replace('\\', '').split()
+            rows[parts[0]] = [float(v) for v in parts[1:]]
+        frames.append(pd.DataFrame(rows, index=cols).T)
+    stats = pd.concat(frames, axis=1)
+    return stats[[c for c in stats.columns if c.split('.')[0] in FEATURE_GROUPS]]
+
+def load_synthesizer(data_path=None, profile_path=None):
+    """Fitted profile if given, else fit on the dataset if it exists, else the schema-only prior."""
+    if profile_path and os.path.exists(profile_path):
+        return MalMemSynthesizer.load(profile_path)
+    if data_path and os.path.exists(data_path):
+        return MalMemSynthesizer().fit(pd.read_csv(data_path))
+    return MalMemSynthesizer.from_description()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate synthetic MalMem-shaped data")
+    parser.add_argument("--fit", help="real MalMem CSV to learn from")
+    parser.add_argument("--profile", help="load a saved synthesizer profile")
+    parser.add_argument("--save-profile", help="save the fitted profile here")
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--out", default="malmem_synthetic.csv")
+    parser.add_argument("--format", choices=["csv", "parquet"], default=None)
+    parser.add_argument("--chunk-size", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    synth = load_synthesizer(args.fit, args.profile)
+    if args.save_profile:
+        synth.save(args.save_profile)
+    if args.rows > 0:
+        fmt = args.format or ('parquet' if args.out.endswith('.parquet') else 'csv')
+        writer = synth.write_parquet if fmt == 'parquet' else synth.write_csv
+        writer(args.out, args.rows, args.chunk_size, args.seed)
+        print(f"Wrote {args.rows:,} rows to {args.out}")
@@ -0,0 +1,195 @@
+"""
+Lightweight stage tracing for the scan path, the trainers and the report generator.
+
+Code marks its stages with `tracing.stage(name, rows=...)`. The call is a
+no-op unless a Tracer has been activated on the current thread, so the
+instrumentation costs nothing outside traced runs. A Tracer aggregates
+per-stage durations, row counts and RSS deltas. It can also capture a
+cProfile or pyinstrument profile of the whole run, and the result
+exports as JSON.
+"""
+
+import cProfile
+import functools
+import io
+import json
+import os
+import pstats
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+try:
+    import psutil
+    _PROC = psutil.Process()
+    def rss_bytes():
+        return _PROC.memory_info().rss
+except ImportError:
+    def rss_bytes():
+        try:
+            with open('/proc/self/statm') as f:
+                return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+        except (OSError, ValueError, AttributeError):
+            import resource
+            return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+_local = threading.local()
+
+class Tracer:
+    """Collects stage timings for one scan or training run."""
+
+    def __init__(self, name="", profiler=None):
+        self.name = name
+        self.profiler = profiler  # None, 'cprofile' or 'pyinstrument'
+        self.stages = {}
+        self.order = []
+        self.profile_text = None
+        self.started_at = time.time()
+        self.spans = []  # (start, end) perf_counter times of top-level stages
+        self.lock = threading.Lock()
+        self._local = threading.local()
+
+    @contextmanager
+    def stage(self, name, rows=None):
+        """Times the enclosed block; set info['rows'] inside it when the row count is only known at the end."""
+        stack = self._local.__dict__.setdefault('stack', [])
+        parent = stack[-1] if stack else None
+        info = {'rows': rows}
+        stack.append(name)
+        rss0 = rss_bytes()
+        t0 = time.perf_counter()
+        try:
+            yield info
+        finally:
+            stack.pop()
+            t1 = time.perf_counter()
+            self.record(name, t1 - t0, info['rows'], rss_bytes() - rss0, parent=parent, end=t1)
+
+    def record(self, name, seconds, rows=None, mem_delta=0, parent=None, end=None):
+        """Adds one call of a stage; `parent` is the enclosing stage on the same thread (None at top level)."""
+        with self.lock:
+            s = self.stages.get(name)
+            if s is None:
+                s = self.stages[name] = {'calls': 0, 'seconds': 0.0, 'rows': 0, 'mem_delta_mb': 0.0, 'parent': parent}
+                self.order.append(name)
+            s['calls'] += 1
+            s['seconds'] += seconds
+            s['rows'] += rows or 0
+            s['mem_delta_mb'] += mem_delta / 2**20
+            if parent is None:
+                end = time.perf_counter() if end is None else end
+                self.spans.append((end - seconds, end))
+
+    def merge(self, other):
+        """Adds the stages of another tracer, e.g. an upload parsed before this scan's tracer existed."""
+        with other.lock:
+            stages = {name: dict(other.stages[name]) for name in other.order}
+            spans = list(other.spans)
+        with self.lock:
+            for name, o in stages.items():
+                s = self.stages.get(name)
+                if s is None:
+                    self.stages[name] = o
+                    self.order.append(name)
+                    continue
+                for k in ('calls', 'seconds', 'rows', 'mem_delta_mb'):
+                    s[k] += o[k]
+            self.spans.extend(spans)
+
+    @contextmanager
+    def profiled(self):
+        """Profiles the enclosed block on this thread with the configured profiler."""
+        if self.profiler == 'pyinstrument':
+            try:
+                from pyinstrument import Profiler
+            except ImportError:
+                self.profile_text = "pyinstrument is not installed; falling back to cProfile"
+                self.profiler = 'cprofile'
+            else:
+                prof = Profiler()
+                prof.start()
+                try:
+                    yield
+                finally:
+                    prof.stop()
+                    self.profile_text = prof.output_text(unicode=True, color=False)
+                return
+        if self.profiler == 'cprofile':
+            prof = cProfile.Profile()
+            prof.enable()
+            try:
+                yield
+            finally:
+                prof.disable()
+                out = io.StringIO()
+                pstats.Stats(prof, stream=out).sort_stats('cumulative').print_stats(40)
+                self.profile_text = (self.profile_text + "\n" if self.profile_text else "") + out.getvalue()
+            return
+        yield
+
+    def total_seconds(self):
+        """Seconds covered by top-level stages.
+
+        Nested stages are already inside their parent's time, and stages that
+        run at once on several threads (pipeline workers) are counted once.
+        """
+        with self.lock:
+            spans = sorted(self.spans)
+        total, covered_to = 0.0, float('-inf')
+        for start, end in spans:
+            if end > covered_to:
+                total += end - max(start, covered_to)
+                covered_to = end
+        return total
+
+    def to_dict(self):
+        stages = []
+        for name in self.order:
+            s = dict(self.stages[name], stage=name)
+            s['rows_per_s'] = s['rows'] / s['seconds'] if s['rows'] and s['seconds'] > 0 else None
+            stages.append(s)
+        return {
+            'name': self.name,
+            'started_at': time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(self.started_at)),
+            'total_seconds': self.total_seconds(),
+            'stages': stages,
+            'profiler': self.profiler,
+            'profile': self.profile_text,
+        }
+
+    def to_json(self, path=None):
+        text = json.dumps(self.to_dict(), indent=2)
+        if path:
+            with open(path, 'w') as f:
+                f.write(text)
+        return text
+
+def current():
+    return getattr(_local, 'tracer', None)
+
+@contextmanager
+def activate(tracer):
+    """Makes `tracer` receive the stages recorded on this thread."""
+    prev = current()
+    _local.tracer = tracer
+    try:
+        yield tracer
+    finally:
+        _local.tracer = prev
+
+def stage(name, rows=None):
+    tracer = current()
+    return tracer.stage(name, rows) if tracer is not None else nullcontext({'rows': rows})
+
+def traced(name, rows=None):
+    """Decorator form of stage(); `rows` is an optional callable taking the same arguments."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            tracer = current()
+            if tracer is None:
+                return fn(*args, **kwargs)
+            with tracer.stage(name, rows(*args, **kwargs) if rows else None):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,291 @@
+"""
+Training orchestrator: fits every distinct estimator once and reuses it.
+
+BaseModelTrainer and AdvancedModelTrainer each fit their own
+LogisticRegression and RandomForest, and the ensemble fits yet another
+MLP next to the optimized one. Here each member is fitted once, the soft
+voting ensemble is assembled from the prefit members, and every fit is
+cached on disk by (training data hash, estimator class, hyperparameters).
+Rerunning the pipeline on unchanged data loads the members instead of
+refitting them.
+
+    python src/training_orchestrator.py --data malmem.csv
+    python src/training_orchestrator.py --data malmem.csv --no-search --cache-dir models/.fit_cache
+"""
+
+import argparse
+import hashlib
+import os
+import tempfile
+import time
+import joblib
+import numpy as np
+from sklearn.base import clone
+from sklearn.ensemble import RandomForestClassifier, VotingClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import accuracy_score, classification_report, confusion_matrix
+from sklearn.model_selection import RandomizedSearchCV
+from sklearn.neural_network import MLPClassifier
+from sklearn.preprocessing import LabelEncoder
+from sklearn.tree import DecisionTreeClassifier
+from sklearn.utils import Bunch
+from anomaly import AnomalyDetector
+from tracing import stage
+
+# One definition per distinct estimator (the union of the base and advanced trainers)
+MEMBERS = {
+    'LogisticRegression': LogisticRegression(max_iter=1000, random_state=42),
+    'DecisionTree': DecisionTreeClassifier(random_state=42),
+    'RandomForest': RandomForestClassifier(n_estimators=100, random_state=42),
+}
+DEFAULT_MLP = MLPClassifier(hidden_layer_sizes=(50, 50), max_iter=500, random_state=1)
+MULTICLASS_MLP = MLPClassifier(hidden_layer_sizes=(100, 50), max_iter=500, random_state=42)
+ANOMALY = AnomalyDetector(baseline='benign', target_fpr=0.01, random_state=42)
+MLP_SEARCH_SPACE = {
+    'hidden_layer_sizes': [(50,), (100,), (50, 50), (100, 50)],
+    'activation': ['tanh', 'relu'],
+    'solver': ['adam'],
+    'alpha': [0.0001, 0.001, 0.01],
+    'learning_rate': ['constant', 'adaptive']
+}
+ENSEMBLE_MEMBERS = (('lr', 'LogisticRegression'), ('rf', 'RandomForest'), ('mlp', 'MLP'))
+MODEL_FILES = {
+    'LogisticRegression': 'LogisticRegression.pkl',
+    'DecisionTree': 'DecisionTree.pkl',
+    'RandomForest': 'RandomForest.pkl',
+    'MLP': 'mlp_optimized.pkl',
+    'Ensemble': 'ensemble.pkl',
+    'Multiclass': 'mlp_multiclass.pkl',
+    'Anomaly': 'anomaly_detector.pkl',
+}
+
+def mlp_search():
+    return RandomizedSearchCV(MLPClassifier(random_state=42, max_iter=500), param_distributions=MLP_SEARCH_SPACE,
+                              n_iter=5, cv=3, random_state=42, n_jobs=-1, verbose=1)
+
+def data_hash(X, y=None):
+    """Content hash of a feature frame/array (values, dtype, column names) and its labels."""
+    h = hashlib.blake2b(digest_size=16)
+    values = np.ascontiguousarray(X.to_numpy() if hasattr(X, 'to_numpy') else X)
+    h.update(f"{values.shape}{values.dtype}".encode())
+    if hasattr(X, 'columns'):
+        h.update("\x00".join(map(str, X.columns)).encode())
+    h.update(values.tobytes())
+    if y is not None:
+        h.update(np.ascontiguousarray(np.asarray(y)).tobytes())
+    return h.hexdigest()
+
+def prefit_voting(named_estimators, y, voting='soft'):
+    """VotingClassifier around already fitted members, without refitting them."""
+    ensemble = VotingClassifier(estimators=list(named_estimators), voting=voting)
+    ensemble.le_ = LabelEncoder().fit(y)
+    ensemble.classes_ = ensemble.le_.classes_
+    ensemble.estimators_ = [est for _, est in named_estimators]
+    ensemble.named_estimators_ = Bunch(**dict(named_estimators))
+    # n_features_in_ is a read-only property reading estimators_[0]; feature_names_in_ is copied as fit() does
+    first = ensemble.estimators_[0]
+    if hasattr(first, 'feature_names_in_'):
+        ensemble.feature_names_in_ = first.feature_names_in_
+    return ensemble
+
+class FitCache:
+    """Fitted estimators on disk, keyed by data hash, estimator class and hyperparameters.
+
+    Entries unused for `max_age_days` are evicted, then the least recently
+    used ones until the cache fits in `max_bytes`.
+    """
+
+    def __init__(self, cache_dir='models/.fit_cache', max_bytes=1 << 30, max_age_days=30):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.max_age_days = max_age_days
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, estimator, data_key, extra=""):
+        params = sorted((k, repr(v)) for k, v in estimator.get_params().items())
+        raw = f"{type(estimator).__module__}.{type(estimator).__name__}|{params}|{data_key}|{extra}"
+        return hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
+
+    def get_or_fit(self, name, estimator, X, y=None, data_key=None, extra=""):
+        """Returns a fitted clone of `estimator`, from the cache when the same fit was done before."""
+        data_key = data_key or data_hash(X, y)
+        path = os.path.join(self.cache_dir, f"{name}-{self.key(estimator, data_key, extra)}.pkl")
+        try:
+            model = joblib.load(path)
+            os.utime(path)  # mtime doubles as last use for eviction
+        except FileNotFoundError:
+            pass  # not cached, or evicted by another process just now
+        else:
+            self.hits += 1
+            print(f"{name}: loaded from fit cache")
+            return model
+        self.misses += 1
+        model = clone(estimator)
+        t0 = time.perf_counter()
+        with stage(f'train.fit.{name}', rows=len(X)):
+            model.fit(X) if y is None else model.fit(X, y)
+        print(f"{name}: fitted in {time.perf_counter() - t0:.1f}s")
+        os.makedirs(self.cache_dir, exist_ok=True)
+        # Unique temp file, so another process fitting the same key cannot publish a torn pickle
+        fd, tmp = tempfile.mkstemp(dir=self.cache_dir, prefix=os.path.basename(path) + '.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                joblib.dump(model, f)
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        self.prune(keep=path)
+        return model
+
+    def prune(self, keep=None):
+        """Evicts expired entries, then the least recently used until under max_bytes; returns the number removed."""
+        if not os.path.isdir(self.cache_dir):
+            return 0
+        entries = []
+        for f in os.listdir(self.cache_dir):
+            if f.endswith('.pkl'):
+                path = os.path.join(self.cache_dir, f)
+                try:
+                    st = os.stat(path)
+                except FileNotFoundError:
+                    continue  # removed by another process's prune
+                entries.append((st.st_mtime, st.st_size, path))
+        entries.sort()
+        cutoff = time.time() - self.max_age_days * 86400
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for mtime, size, path in entries:
+            if path == keep or (mtime >= cutoff and total <= self.max_bytes):
+                continue
+            try:
+                os.remove(path)
+                removed += 1
+            except FileNotFoundError:
+                pass
+            total -= size
+        return removed
+
+class TrainingOrchestrator:
+    """Fits the base models, the MLPs, the ensemble and the anomaly detector with no duplicate fits."""
+
+    def __init__(self, X_train, y_train, X_test, y_test, y_mal_train=None, y_mal_test=None,
+                 cache_dir='models/.fit_cache', search_mlp=True, cache_max_bytes=1 << 30):
+        self.X_train = X_train
+        self.y_train = y_train
+        self.X_test = X_test
+        self.y_test = y_test
+        self.y_mal_train = y_mal_train
+        self.y_mal_test = y_mal_test
+        self.search_mlp = search_mlp
+        self.cache = FitCache(cache_dir, max_bytes=cache_max_bytes)
+        self.models = {}
+        self.results = {}
+        self.best_params = None
+        self._data_key = data_hash(X_train, y_train)
+
+    def fit_members(self):
+        for name, estimator in MEMBERS.items():
+            self.models[name] = self.cache.get_or_fit(name, estimator, self.X_train, self.y_train,
+                                                      data_key=self._data_key)
+        self.models['MLP'] = self._fit_mlp()
+        return self.models
+
+    def _fit_mlp(self):
+        """The optimized MLP (or the default one without search); it doubles as the ensemble's MLP member."""
+        if not self.search_mlp:
+            return self.cache.get_or_fit('MLP', DEFAULT_MLP, self.X_train, self.y_train, data_key=self._data_key)
+        fitted = self.cache.get_or_fit('MLPSearch', mlp_search(), self.X_train, self.y_train, data_key=self._data_key)
+        self.best_params = fitted.best_params_
+        print(f"Best Parameters (Binary): {self.best_params}")
+        return fitted.best_estimator_
+
+    def build_ensemble(self):
+        """Soft voting over the prefit LogisticRegression, RandomForest and MLP; nothing is refitted."""
+        if 'MLP' not in self.models:
+            self.fit_members()
+        self.models['Ensemble'] = prefit_voting([(short, self.models[name]) for short, name in ENSEMBLE_MEMBERS],
+                                                self.y_train)
+        return self.models['Ensemble']
+
+    def fit_malware_type_model(self):
+        if self.y_mal_train is None:
+            print("No malware type labels provided.")
+            return None
+        self.models['Multiclass'] = self.cache.get_or_fit('Multiclass', MULTICLASS_MLP, self.X_train, self.y_mal_train)
+        return self.models['Multiclass']
+
+    def fit_anomaly_detector(self):
+        # Fitted on the benign rows; the labels also give the calibration split its malware rows
+        self.models['Anomaly'] = self.cache.get_or_fit('Anomaly', ANOMALY, self.X_train, self.y_train,
+                                                       data_key=self._data_key)
+        print(f"Anomaly threshold calibration: {self.models['Anomaly'].calibration_}")
+        return self.models['Anomaly']
+
+    def run(self):
+        """Fits everything the scan path and the dashboard need; returns the evaluation results."""
+        self.fit_members()
+        self.build_ensemble()
+        self.fit_malware_type_model()
+        self.fit_anomaly_detector()
+        print(f"Fit cache: {self.cache.hits} hits, {self.cache.misses} fits")
+        return self.evaluate()
+
+    def evaluate(self):
+        if self.X_test is None or self.y_test is None:
+            return self.results
+        for name, model in self.models.items():
+            if name == 'Anomaly':
+                continue
+            y_true = self.y_mal_test if name == 'Multiclass' else self.y_test
+            y_pred = model.predict(self.X_test)
+            self.results[name] = {
+                'accuracy': accuracy_score(y_true, y_pred),
+                'report': classification_report(y_true, y_pred, output_dict=True, zero_division=0),
+                'confusion_matrix': confusion_matrix(y_true, y_pred).tolist()
+            }
+            print(f"{name} Accuracy: {self.results[name]['accuracy']:.4f}")
+        return self.results
+
+    def save_models(self, save_dir='models', names=None):
+        """Writes the same files as BaseModelTrainer and AdvancedModelTrainer, so the app and scanner load them unchanged.
+
+        `names` limits which models are written (e.g. to keep a searched
+        mlp_optimized.pkl when the ensemble was rebuilt without search).
+        """
+        os.makedirs(save_dir, exist_ok=True)
+        with stage('train.save_models'):
+            for name, filename in MODEL_FILES.items():
+                if name in self.models and (names is None or name in names):
+                    joblib.dump(self.models[name], os.path.join(save_dir, filename))
+        print(f"Models saved to {save_dir}")
+
+if __name__ == "__main__":
+    from data_preprocessing import DataPreprocessor
+
+    parser = argparse.ArgumentParser(description="Train every model once, with a persistent fit cache")
+    parser.add_argument("--data", default="malmem.csv")
+    parser.add_argument("--models", default="models")
+    parser.add_argument("--cache-dir", default="models/.fit_cache")
+    parser.add_argument("--cache-max-mb", type=int, default=1024, help="evict least recently used fits beyond this")
+    parser.add_argument("--no-search", action="store_true", help="skip the MLP hyperparameter search")
+    parser.add_argument("--no-register", action="store_true", help="do not snapshot the saved models in the registry")
+    args = parser.parse_args()
+
+    dp = DataPreprocessor(args.data)
+    X_train, X_test, y_train, y_test, y_mal_train, y_mal_test = dp.split_data()
+    orchestrator = TrainingOrchestrator(X_train, y_train, X_test, y_test, y_mal_train, y_mal_test,
+                                        cache_dir=args.cache_dir, search_mlp=not args.no_search,
+                                        cache_max_bytes=args.cache_max_mb << 20)
+    t0 = time.perf_counter()
+    results = orchestrator.run()
+    orchestrator.save_models(args.models)
+    dp.save_artifacts(os.path.join(args.models, 'preprocessor.pkl'))
+    if not args.no_register:
+        from model_registry import ModelRegistry
+        ModelRegistry(os.path.join(args.models, 'registry'), args.models).register(
+            dataset_hash=data_hash(X_train, y_train), params={'search_mlp': not args.no_search},
+            metrics={name: r['accuracy'] for name, r in results.items()},
+            training_seconds=time.perf_counter() - t0, note="training_orchestrator")
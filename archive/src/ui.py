@@ -0,0 +1,230 @@
+"""
+Shared Streamlit helpers for app.py and the page modules in views/.
+
+Everything expensive is cached here. Resources are keyed on explicit
+invalidation tokens (file mtime and size) so a retrained model or a
+replaced dataset is picked up without clearing the whole cache.
+"""
+
+import os
+import streamlit as st
+import metrics
+from scan_jobs import ScanJobManager
+from verdict_cache import VerdictCache
+from results_view import ResultsView
+from history_store import HistoryStore, HistoryWriter
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+BASE_DIR = os.path.dirname(SCRIPT_DIR)
+SCAN_MODELS = ('ensemble.pkl', 'anomaly_detector.pkl', 'mlp_multiclass.pkl')
+
+def get_path(relative_path):
+    full_path = os.path.join(BASE_DIR, relative_path)
+    return full_path if os.path.exists(full_path) else relative_path
+
+def file_token(path):
+    """(mtime, size) of a file, or None; used as a cache invalidation key."""
+    try:
+        st_ = os.stat(path)
+    except OSError:
+        return None
+    return (st_.st_mtime_ns, st_.st_size)
+
+# --- Theme ---
+@st.cache_resource
+def load_theme():
+    with open(os.path.join(SCRIPT_DIR, 'theme.css'), encoding='utf-8') as f:
+        return f"<style>\n{f.read()}</style>"
+
+def apply_theme():
+    # The stylesheet is read once per process; every rerun only re-sends the cached string
+    st.markdown(load_theme(), unsafe_allow_html=True)
+
+# --- Data ---
+@st.cache_resource(max_entries=2)
+def _load_dataset(path, dtype, token):
+    from data_preprocessing import DataPreprocessor
+    dp = DataPreprocessor(path, dtype=dtype)
+    dp.load_data()
+    df = dp.clean_and_encode()
+    # Reuses the split indices saved next to the models while the labels are unchanged
+    train_X, test_X, train_y, test_y, train_mal_y, test_mal_y = dp.split_data(split_path=get_path('models/split_indices.npz'))
+    return dp, df, train_X, test_X, train_y, test_y, train_mal_y, test_mal_y
+
+def load_dataset(path, dtype='float64'):
+    """Preprocessed dataset and splits, shared read-only across sessions; None if the file is missing.
+
+    Held with cache_resource rather than cache_data so reruns return the
+    same objects instead of unpickling copies of the whole dataset. The
+    file's mtime and size are part of the key, so replacing the CSV
+    reloads it.
+    """
+    token = file_token(path)
+    if token is None:
+        return None
+    return _load_dataset(path, dtype, token)
+
+def require_dataset(settings):
+    """Dataset for pages that need it; renders the error card and stops the run if it is missing."""
+    data = load_dataset(settings['data_path'], settings['dtype'])
+    if data is None:
+        st.markdown("""
+        <div class="glass-card" style="text-align: center; max-width: 500px; margin: 100px auto;">
+            <div style="font-size: 3rem; margin-bottom: 16px;">⚠️</div>
+            <div style="font-family: 'Orbitron'; font-size: 1.2rem; color: #FF007F; margin-bottom: 8px; text-shadow: 0 0 10px #FF007F;">CRITICAL ERROR</div>
+            <div style="font-family: 'Fira Code'; color: #888; font-size: 0.85rem;">> dataset_not_found</div>
+        </div>
+        """, unsafe_allow_html=True)
+        st.stop()
+    return data
+
+# --- Shared resources ---
+@st.cache_resource
+def get_job_manager():
+    # Shared by all sessions so scans keep running across reruns and refreshes
+    return ScanJobManager(max_workers=2)
+
+@st.cache_resource
+def get_verdict_cache():
+    # Shared across sessions and persisted next to the models
+    return VerdictCache(max_entries=200000, path=get_path('models/verdict_cache.pkl'))
+
+def _finished_results(job_id):
+    # None once the job manager has evicted the job (or it has no results yet)
+    job = get_job_manager().get(job_id)
+    return job.results if job is not None else None
+
+@st.cache_resource(max_entries=8)
+def _results_view(job_id, _results):
+    # Built once per finished job; filter/sort orders are cached inside the view
+    return ResultsView(_results)
+
+def get_results_view(job_id):
+    """ResultsView of a finished job, or None if the job is gone."""
+    results = _finished_results(job_id)
+    return _results_view(job_id, results) if results is not None else None
+
+@st.cache_resource(max_entries=8)
+def _report_link(job_id, _results):
+    from report_generator import ForensicsReportGenerator
+    gen = ForensicsReportGenerator()
+    html, rid = gen.generate_report(_results)
+    return gen.get_download_link(html, f"report_{rid}.html")
+
+def get_report_link(job_id):
+    """Download link for a finished job's forensic report, or None if the job is gone."""
+    results = _finished_results(job_id)
+    return _report_link(job_id, results) if results is not None else None
+
+@st.cache_resource
+def get_history_store():
+    # Integrity-checked and the legacy scan_history.json imported once per process.
+    # Counts and the malware type list are shared by all sessions for a few seconds, and the total is
+    # a running counter, rather than recomputed on every rerun (including the scan page's polling reruns).
+    return HistoryStore(get_path('scan_history.db'), legacy_json=get_path('scan_history.json'), verify=True,
+                        cache_ttl=5)
+
+@st.cache_resource
+def get_history_writer():
+    # One writer thread per process: every session's scan batches are committed through it
+    return HistoryWriter(get_history_store())
+
+@st.cache_resource
+def get_history_archive():
+    # Daily Parquet partitions of verdicts rolled out of the history database (needs pyarrow)
+    from history_archive import HistoryArchive
+    return HistoryArchive(get_path('history_archive'))
+
+@st.cache_resource
+def get_replay_buffer(n_features):
+    # Analyst-confirmed rows for incremental updates, kept in the history database
+    from incremental import ReplayBuffer
+    return ReplayBuffer(get_path('scan_history.db'), n_features)
+
+@st.cache_resource(max_entries=2)
+def _scan_preprocessor(path, dtype, token):
+    from scan_pipeline import ScanPreprocessor
+    dp, _, X_train = _load_dataset(path, dtype, token)[:3]
+    return ScanPreprocessor(dp.scaler, X_train.columns, dp.dtype)
+
+def get_scan_preprocessor(settings):
+    """ScanPreprocessor shared by every scan of the current dataset, so column lookups per CSV header are reused."""
+    return _scan_preprocessor(settings['data_path'], settings['dtype'], file_token(settings['data_path']))
+
+@st.cache_resource(max_entries=2)
+def _drift_monitor(path, dtype, token):
+    from drift import load_or_create
+    # The dataset is only loaded and split when there is no saved state for this exact file and dtype
+    key = f"{os.path.abspath(path)}|{token[0]}|{token[1]}|{dtype}"
+    return load_or_create(get_path('models/drift_state.npz'), lambda: _load_dataset(path, dtype, token)[2],
+                          reference_key=key)
+
+def get_drift_monitor(settings):
+    """Drift monitor shared by all sessions, with its reference built from the dataset's training split."""
+    token = file_token(settings['data_path'])
+    if token is None:
+        return None
+    return _drift_monitor(settings['data_path'], settings['dtype'], token)
+
+@st.cache_resource
+def get_model_registry():
+    from model_registry import ModelRegistry
+    return ModelRegistry(get_path('models/registry'), live_dir=get_path('models'))
+
+@st.cache_resource(max_entries=2)
+def _shadow_scorer(primary_version, shadow_version, _preprocessor):
+    from model_registry import ShadowScorer
+    registry = get_model_registry()
+    # Statistics are kept per primary/shadow pair and survive restarts
+    return ShadowScorer(_preprocessor, registry.scanner(shadow_version), primary_version=primary_version,
+                        stats_path=registry.shadow_stats_path(primary_version, shadow_version))
+
+def get_shadow_scorer(scanner):
+    """Shadow scorer for the registry's shadow version against `scanner`, or None when no shadow is set."""
+    shadow = get_model_registry().state()['shadow']
+    if not shadow or shadow == scanner.model_version:
+        return None
+    return _shadow_scorer(scanner.model_version, shadow, scanner.preprocessor)
+
+@st.cache_resource
+def get_metrics():
+    # Registered once per process; CYBERSENTINEL_METRICS_PORT / _FILE expose it to Prometheus
+    store = get_history_store()
+    writer = get_history_writer()
+    def collect():
+        metrics.HISTORY_ROWS.set(store.total())
+        metrics.HISTORY_PENDING.set(writer.pending())
+        metrics.HISTORY_BYTES.set(sum(os.path.getsize(p) for p in (store.db_path, store.db_path + '-wal')
+                                      if os.path.exists(p)))
+    metrics.REGISTRY.add_collector(collect)
+    port = os.environ.get('CYBERSENTINEL_METRICS_PORT')
+    if port:
+        try:
+            metrics.start_http_server(int(port))
+        except OSError as e:
+            print(f"Metrics endpoint not started: {e}")
+    if os.environ.get('CYBERSENTINEL_METRICS_FILE'):
+        metrics.start_textfile_writer(os.environ['CYBERSENTINEL_METRICS_FILE'])
+    return metrics.REGISTRY
+
+def save_history(record):
+    save_history_many([record])
+
+def save_history_many(records):
+    # Called from scan worker threads; queued, so scans never wait on the database lock
+    get_history_writer().submit(records)
+
+# --- Rendering helpers ---
+def format_bytes(n):
+    for unit in ("B", "KB", "MB", "GB"):
+        if n < 1024 or unit == "GB":
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+
+def cyber_metric(value, label, color="#00F0FF"):
+    return f'''
+    <div class="metric-cyber">
+        <div class="metric-value" style="color: {color};">{value}</div>
+        <div class="metric-label">{label}</div>
+    </div>
+    '''
@@ -0,0 +1,115 @@
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+import joblib
+import numpy as np
+
+def model_fingerprint(paths):
+    """Short version string for a set of model files (name, size and mtime)."""
+    h = hashlib.sha1()
+    for p in paths:
+        st = os.stat(p)
+        h.update(f"{os.path.basename(p)}:{st.st_size}:{st.st_mtime_ns};".encode())
+    return h.hexdigest()[:16]
+
+class VerdictCache:
+    """LRU cache of scan verdicts keyed by a hash of the rounded scaled feature vector and model version.
+
+    Repeated rows (golden images, periodic snapshots) are answered from the
+    cache instead of going through the ensemble, anomaly and multiclass
+    models again. Optionally persisted to disk with joblib.
+    """
+
+    def __init__(self, max_entries=100000, decimals=6, path=None):
+        self.max_entries = max_entries
+        self.decimals = decimals
+        self.path = path
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        # Held across snapshot, dump and replace, so concurrent saves cannot interleave
+        self._save_lock = threading.Lock()
+        self._dirty = False
+        if path and os.path.exists(path):
+            self.load()
+
+    def keys_for(self, scaled, model_version):
+        """One key per row; rounding makes near-identical rows share a key."""
+        # + 0.0 folds -0.0 into 0.0 so both hash the same
+        rounded = np.ascontiguousarray(np.round(np.asarray(scaled, dtype=np.float64), self.decimals) + 0.0)
+        salt = model_version.encode()
+        return [hashlib.blake2b(row.tobytes() + salt, digest_size=16).digest() for row in rounded]
+
+    def get_many(self, keys):
+        """Cached verdict per key, or None on a miss."""
+        out = []
+        with self.lock:
+            for k in keys:
+                v = self.entries.get(k)
+                if v is None:
+                    self.misses += 1
+                else:
+                    self.entries.move_to_end(k)
+                    self.hits += 1
+                out.append(v)
+        return out
+
+    def put_many(self, items):
+        """items: {key: verdict}. Evicts least recently used entries beyond max_entries."""
+        with self.lock:
+            for k, v in items.items():
+                self.entries[k] = v
+                self.entries.move_to_end(k)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+            self._dirty = True
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self.entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self._dirty = True
+
+    def save(self):
+        if not self.path or not self._dirty:
+            return
+        with self._save_lock:
+            with self.lock:
+                items = list(self.entries.items())
+                self._dirty = False
+            directory = os.path.dirname(self.path)
+            if directory and not os.path.exists(directory):
+                os.makedirs(directory, exist_ok=True)
+            # Unique temp file in the same directory, so other processes saving the same cache do not collide
+            fd, tmp = tempfile.mkstemp(dir=directory or '.', prefix=os.path.basename(self.path) + '.', suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    joblib.dump({'decimals': self.decimals, 'items': items}, f)
+                os.replace(tmp, self.path)
+            except BaseException:
+                self._dirty = True
+                if os.path.exists(tmp):
+                    os.remove(tmp)
+                raise
+
+    def load(self):
+        try:
+            data = joblib.load(self.path)
+        except Exception as e:
+            print(f"Verdict cache not loaded ({e}); starting empty.")
+            return
+        if data.get('decimals') != self.decimals:
+            return
+        with self.lock:
+            self.entries = OrderedDict(data['items'][-self.max_entries:])
@@ -0,0 +1 @@
+"""Page modules for app.py; each exposes render(settings) and imports only what its page needs."""
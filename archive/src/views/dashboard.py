@@ -0,0 +1,130 @@
+"""DASHBOARD page: dataset overview, 3D PCA clustering, class balance and top features."""
+
+import joblib
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+import streamlit as st
+from ui import cyber_metric, file_token, get_history_store, get_path, load_dataset, require_dataset
+
+@st.cache_data(max_entries=4)
+def pca_projection(data_path, dtype, token, n_rows=2000):
+    # Keyed on the dataset file token, so the projection is fitted once per dataset rather than per rerun
+    from sklearn.decomposition import PCA
+    _, _, X_train, _, y_train, _, _, _ = load_dataset(data_path, dtype)
+    n = min(n_rows, len(X_train))
+    viz = pd.DataFrame(PCA(n_components=3).fit_transform(X_train.iloc[:n]), columns=['PC1', 'PC2', 'PC3'])
+    viz['Class'] = y_train.iloc[:n].map({0: 'Benign', 1: 'Malware'}).values
+    return viz
+
+@st.cache_data(max_entries=4)
+def top_features(model_path, token, columns, k=6):
+    # token changes when the model is retrained
+    rf = joblib.load(model_path)
+    return pd.DataFrame({'f': list(columns), 'i': rf.feature_importances_}).nlargest(k, 'i')
+
+def render(settings):
+    dp, df, X_train, X_test, y_train, y_test, y_mal_train, y_mal_test = require_dataset(settings)
+    
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        st.markdown("# THREAT INTELLIGENCE")
+        st.markdown("<p style='font-family: Fira Code; color: #999; font-size: 0.8rem; letter-spacing: 2px;'>> real-time memory forensics analysis</p>", unsafe_allow_html=True)
+    with col2:
+        mal_ratio = df['Class'].mean() * 100
+        if mal_ratio < 50:
+            st.markdown('<div style="text-align: right; padding-top: 16px;"><span class="badge-secure">[✓] SECURE</span></div>', unsafe_allow_html=True)
+        else:
+            st.markdown('<div style="text-align: right; padding-top: 16px;"><span class="badge-alert">[!] ALERT</span></div>', unsafe_allow_html=True)
+    
+    st.markdown("<div style='height: 24px'></div>", unsafe_allow_html=True)
+    
+    # Metrics
+    c1, c2, c3, c4 = st.columns(4)
+    with c1:
+        st.markdown(cyber_metric(f"{df.shape[0]:,}", "TOTAL_SAMPLES", "#00F0FF"), unsafe_allow_html=True)
+    with c2:
+        color = "#FF007F" if mal_ratio > 30 else "#00FF9F"
+        st.markdown(cyber_metric(f"{mal_ratio:.1f}%", "MALWARE_RATE", color), unsafe_allow_html=True)
+    with c3:
+        st.markdown(cyber_metric(f"{df.shape[1]-2}", "FEATURES", "#FF007F"), unsafe_allow_html=True)
+    with c4:
+        st.markdown(cyber_metric(f"{get_history_store().total():,}", "TOTAL_SCANS", "#00FF9F"), unsafe_allow_html=True)
+    
+    st.markdown("<div style='height: 28px'></div>", unsafe_allow_html=True)
+    
+    # Charts
+    c1, c2 = st.columns([2, 1])
+    
+    with c1:
+        st.markdown("## 3D_MEMORY_CLUSTERING")
+        
+        viz = pca_projection(settings['data_path'], settings['dtype'], file_token(settings['data_path']))
+        
+        # Neon glowing scatter plot
+        fig = px.scatter_3d(viz, x='PC1', y='PC2', z='PC3', color='Class',
+            color_discrete_map={'Benign': '#00F0FF', 'Malware': '#FF007F'}, opacity=0.85)
+        
+        fig.update_traces(marker=dict(size=4, line=dict(width=0)))
+        fig.update_layout(
+            paper_bgcolor='rgba(0,0,0,0)', 
+            plot_bgcolor='rgba(0,0,0,0)',
+            font=dict(color='#555', family='Fira Code'),
+            legend=dict(
+                bgcolor='rgba(5,5,5,0.9)', 
+                bordercolor='rgba(0,240,255,0.3)', 
+                borderwidth=1,
+                font=dict(color='#eee', family='Fira Code')
+            ),
+            scene=dict(
+                xaxis=dict(backgroundcolor='rgba(0,0,0,0)', gridcolor='rgba(0,240,255,0.1)', zerolinecolor='rgba(0,240,255,0.2)', title_font=dict(color='#00F0FF')),
+                yaxis=dict(backgroundcolor='rgba(0,0,0,0)', gridcolor='rgba(0,240,255,0.1)', zerolinecolor='rgba(0,240,255,0.2)', title_font=dict(color='#00F0FF')),
+                zaxis=dict(backgroundcolor='rgba(0,0,0,0)', gridcolor='rgba(0,240,255,0.1)', zerolinecolor='rgba(0,240,255,0.2)', title_font=dict(color='#00F0FF'))
+            ),
+            margin=dict(l=0, r=0, t=10, b=0), 
+            height=480
+        )
+        st.plotly_chart(fig, use_container_width=True)
+    
+    with c2:
+        st.markdown("## CLASS_DISTRIBUTION")
+        
+        counts = df['Class'].value_counts()
+        fig = go.Figure(data=[go.Pie(
+            labels=['Benign', 'Malware'], 
+            values=[counts.get(0,0), counts.get(1,0)],
+            hole=0.7, 
+            marker=dict(colors=['#00F0FF', '#FF007F'], line=dict(color='#050505', width=2)),
+            textinfo='percent', 
+            textfont=dict(color='#eee', size=14, family='Fira Code')
+        )])
+        fig.update_layout(
+            paper_bgcolor='rgba(0,0,0,0)', 
+            showlegend=False,
+            margin=dict(l=10, r=10, t=10, b=10), 
+            height=220,
+            annotations=[dict(text='CLASSES', x=0.5, y=0.5, font=dict(size=11, color='#555', family='Orbitron'), showarrow=False)]
+        )
+        st.plotly_chart(fig, use_container_width=True)
+        
+        st.markdown("## TOP_FEATURES")
+        try:
+            rf_path = get_path('models/RandomForest.pkl')
+            fi = top_features(rf_path, file_token(rf_path), tuple(X_train.columns))
+            
+            fig = go.Figure(go.Bar(
+                x=fi['i'], y=fi['f'], orientation='h',
+                marker=dict(color=fi['i'], colorscale=[[0, '#FF007F'], [0.5, '#00F0FF'], [1, '#00FF9F']])
+            ))
+            fig.update_layout(
+                paper_bgcolor='rgba(0,0,0,0)', 
+                plot_bgcolor='rgba(0,0,0,0)',
+                font=dict(color='#888', size=9, family='Fira Code'),
+                xaxis=dict(gridcolor='rgba(0,240,255,0.1)', zeroline=False),
+                yaxis=dict(gridcolor='rgba(0,240,255,0.1)'),
+                margin=dict(l=0, r=0, t=0, b=0), 
+                height=220
+            )
+            st.plotly_chart(fig, use_container_width=True)
+        except Exception:
+            st.markdown("<div class='glass-card'><span style='color: #999;'>> train models to view</span></div>", unsafe_allow_html=True)
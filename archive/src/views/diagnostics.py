@@ -0,0 +1,55 @@
+"""DIAGNOSTICS page: per-stage timings and profiles of scans and training runs, and feature drift. Needs no dataset."""
+
+import json
+import pandas as pd
+import streamlit as st
+from ui import cyber_metric, get_drift_monitor, get_job_manager
+
+def render(settings):
+    st.markdown("# DIAGNOSTICS")
+    st.markdown("<p style='font-family: Fira Code; color: #999; font-size: 0.8rem;'>> per-stage timings for scans and training runs</p>", unsafe_allow_html=True)
+    
+    st.markdown("<div style='height: 20px'></div>", unsafe_allow_html=True)
+    
+    traces = {f"SCAN {j.job_id} :: {j.label} :: {j.status}": j.trace for j in get_job_manager().list_jobs() if j.trace is not None}
+    if st.session_state.get('train_trace') is not None:
+        traces[f"TRAIN :: {st.session_state.train_trace.name}"] = st.session_state.train_trace
+    
+    if traces:
+        choice = st.selectbox("> RUN", list(traces))
+        trace = traces[choice].to_dict()
+        
+        c1, c2 = st.columns(2)
+        with c1: st.markdown(cyber_metric(f"{trace['total_seconds']:.2f}s", "STAGE_TIME", "#00F0FF"), unsafe_allow_html=True)
+        with c2: st.markdown(cyber_metric(len(trace['stages']), "STAGES", "#FF007F"), unsafe_allow_html=True)
+        
+        st.markdown("<div style='height: 20px'></div>", unsafe_allow_html=True)
+        st.dataframe(pd.DataFrame(trace['stages'], columns=['stage', 'parent', 'calls', 'seconds', 'rows', 'rows_per_s', 'mem_delta_mb']),
+                     use_container_width=True, hide_index=True)
+        
+        if trace['profile']:
+            with st.expander(f"> PROFILE ({trace['profiler']})"):
+                st.code(trace['profile'])
+        
+        st.download_button("📥 EXPORT_JSON", json.dumps(trace, indent=2), "trace.json", "application/json")
+    else:
+        st.markdown("<div class='glass-card' style='text-align: center;'><span style='color: #999;'>> run a scan or train a model to collect timings</span></div>", unsafe_allow_html=True)
+    
+    st.markdown("---")
+    st.markdown("<div style='font-family: Orbitron; color: #FF007F; font-size: 0.9rem; letter-spacing: 2px;'>> FEATURE_DRIFT</div>", unsafe_allow_html=True)
+    st.markdown("<div style='height: 12px'></div>", unsafe_allow_html=True)
+    monitor = get_drift_monitor(settings)
+    report = monitor.check() if monitor is not None else None
+    if not report or not report['rows']:
+        st.markdown("<div class='glass-card' style='text-align: center;'><span style='color: #999;'>> scan some dumps to compare them with the training data</span></div>", unsafe_allow_html=True)
+    else:
+        c1, c2, c3 = st.columns(3)
+        with c1: st.markdown(cyber_metric(f"{report['rows']:,}", "ROWS_IN_WINDOW", "#00F0FF"), unsafe_allow_html=True)
+        with c2: st.markdown(cyber_metric(f"{report['features'][0]['psi']:.3f}", "MAX_PSI", "#FFFF00"), unsafe_allow_html=True)
+        with c3: st.markdown(cyber_metric(len(report['drifted']), "DRIFTED_FEATURES", "#FF007F" if report['alert'] else "#00FF9F"), unsafe_allow_html=True)
+        st.markdown(f"<div style='font-family: Fira Code; color: #999; font-size: 0.7rem;'>> thresholds :: PSI > {report['psi_threshold']} or KS > {report['ks_threshold']}</div>", unsafe_allow_html=True)
+        st.dataframe(pd.DataFrame(report['features']), use_container_width=True, hide_index=True)
+        if st.button("RESET_DRIFT_WINDOW", key="drift_reset"):
+            monitor.reset()
+            monitor.save()
+            st.rerun()
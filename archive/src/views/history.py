@@ -0,0 +1,167 @@
+"""HISTORY page: filtered, keyset-paged view of the scan history store. Needs no dataset."""
+
+import glob
+import os
+import tempfile
+import time
+import pandas as pd
+import streamlit as st
+from history_store import HistoryFilter, COLUMNS as HISTORY_COLUMNS
+from ui import cyber_metric, format_bytes, get_history_archive, get_history_store, get_history_writer
+
+EXPORT_MAX_AGE = 24 * 3600
+
+def _discard_export():
+    """Removes this session's prepared export, plus exports left behind by sessions that ended a day ago."""
+    path = st.session_state.pop('hist_export', None)
+    if path and os.path.exists(path):
+        os.remove(path)
+    for stale in glob.glob(os.path.join(tempfile.gettempdir(), 'history_export_*.csv')):
+        try:
+            if time.time() - os.path.getmtime(stale) > EXPORT_MAX_AGE:
+                os.remove(stale)
+        except OSError:
+            pass
+
+@st.cache_data(max_entries=16)
+def detection_rates(_store, _archive, start_date, end_date, freq, revision, archive_stats):
+    # Keyed on the filters plus the store revision and archive stats, so reruns reuse the
+    # aggregate until verdicts are added, archived or compacted
+    from history_archive import detection_rate
+    return detection_rate(_store, _archive, start_date, end_date, freq)
+
+def render(settings):
+    st.markdown("# SCAN_HISTORY")
+    st.markdown("<p style='font-family: Fira Code; color: #999; font-size: 0.8rem;'>> previous analysis records</p>", unsafe_allow_html=True)
+    
+    st.markdown("<div style='height: 20px'></div>", unsafe_allow_html=True)
+    
+    store = get_history_store()
+    # Show this process's queued verdicts too (bounded, so a long write never hangs the page)
+    get_history_writer().flush(timeout=2)
+    
+    # Filters are pushed down to the history store; only one page is fetched per rerun
+    c1, c2, c3, c4 = st.columns(4)
+    with c1:
+        st.markdown("<span style='font-family: Fira Code; color: #999; font-size: 0.75rem;'>> STATUS</span>", unsafe_allow_html=True)
+        status_f = st.selectbox("status", ["All", "Malware", "Benign"], label_visibility="collapsed", key="hist_status")
+    with c2:
+        st.markdown("<span style='font-family: Fira Code; color: #999; font-size: 0.75rem;'>> MALWARE_TYPE</span>", unsafe_allow_html=True)
+        type_f = st.selectbox("type", ["All"] + store.malware_types(), label_visibility="collapsed", key="hist_type")
+    with c3:
+        st.markdown("<span style='font-family: Fira Code; color: #999; font-size: 0.75rem;'>> DATE_RANGE</span>", unsafe_allow_html=True)
+        dates = st.date_input("dates", value=(), label_visibility="collapsed", key="hist_dates")
+    with c4:
+        st.markdown("<span style='font-family: Fira Code; color: #999; font-size: 0.75rem;'>> ANOMALY</span>", unsafe_allow_html=True)
+        anom_f = st.selectbox("anomaly", ["All", "Anomalous", "Normal"], label_visibility="collapsed", key="hist_anom")
+    
+    start_date = dates[0] if len(dates) > 0 else None
+    end_date = dates[1] if len(dates) > 1 else start_date
+    flt = HistoryFilter(status_f, type_f, start_date, end_date, {"All": None, "Anomalous": True, "Normal": False}[anom_f])
+    
+    summary = store.summary(flt)
+    
+    if summary['total']:
+        rate = summary['malware'] / summary['total'] * 100
+        
+        st.markdown("<div style='height: 20px'></div>", unsafe_allow_html=True)
+        
+        c1, c2, c3 = st.columns(3)
+        with c1: st.markdown(cyber_metric(f"{summary['total']:,}", "TOTAL_SCANS", "#00F0FF"), unsafe_allow_html=True)
+        with c2: st.markdown(cyber_metric(f"{summary['malware']:,}", "MALWARE_FOUND", "#FF007F"), unsafe_allow_html=True)
+        with c3: st.markdown(cyber_metric(f"{rate:.1f}%", "DETECTION_RATE", "#00FF9F"), unsafe_allow_html=True)
+        
+        st.markdown("<div style='height: 20px'></div>", unsafe_allow_html=True)
+        
+        # Keyset paging: a stack of cursors, reset whenever the filter changes
+        flt_key = (status_f, type_f, start_date, end_date, anom_f)
+        if st.session_state.get('hist_key') != flt_key:
+            st.session_state.hist_key = flt_key
+            st.session_state.hist_cursors = [None]
+            _discard_export()
+        cursors = st.session_state.hist_cursors
+        
+        page_size = 100
+        records, ids = store.page(flt, limit=page_size, before_id=cursors[-1])
+        st.dataframe(pd.DataFrame(records, columns=HISTORY_COLUMNS), use_container_width=True, hide_index=True)
+        
+        c1, c2, c3 = st.columns([1, 1, 2])
+        with c1:
+            if st.button("◀ NEWER", disabled=len(cursors) == 1):
+                cursors.pop()
+                st.rerun()
+        with c2:
+            if st.button("OLDER ▶", disabled=len(ids) < page_size):
+                cursors.append(ids[-1])
+                st.rerun()
+        with c3:
+            st.markdown(f"<div style='font-family: Fira Code; color: #999; font-size: 0.7rem; padding-top: 10px;'>> page {len(cursors)} of {-(-summary['total'] // page_size):,}</div>", unsafe_allow_html=True)
+        
+        st.markdown("---")
+        c1, c2 = st.columns([3, 1])
+        with c1:
+            # Export is streamed in chunks to a temp file of this session, only when requested
+            if st.button("📦 PREPARE_EXPORT"):
+                _discard_export()
+                with st.spinner("> exporting..."):
+                    f = tempfile.NamedTemporaryFile(prefix='history_export_', suffix='.csv', delete=False)
+                    f.close()
+                    st.session_state.hist_export = store.export_csv(f.name, flt)
+            export = st.session_state.get('hist_export')
+            if export and os.path.exists(export):
+                with open(export, 'rb') as f:
+                    st.download_button("📥 EXPORT_CSV", f, "history.csv", "text/csv")
+        with c2:
+            if st.button("🗑️ CLEAR_ALL"):
+                # Queued records are committed first, so they are cleared too rather than reappearing
+                flushed = get_history_writer().flush(timeout=10)
+                store.clear()
+                _discard_export()
+                if flushed:
+                    st.rerun()
+                st.warning("> history writes still pending :: records from running scans may reappear")
+    else:
+        st.markdown("<div class='glass-card' style='text-align: center;'><span style='color: #999;'>> no scan history found</span></div>", unsafe_allow_html=True)
+    
+    render_analytics(store, start_date, end_date)
+
+def render_analytics(store, start_date, end_date):
+    """Detection rate by family over the live store and the Parquet archive, plus archive maintenance."""
+    st.markdown("---")
+    st.markdown("<div style='font-family: Orbitron; color: #00F0FF; font-size: 1rem; letter-spacing: 2px; margin-bottom: 16px;'>> DETECTION_TRENDS</div>", unsafe_allow_html=True)
+    try:
+        archive = get_history_archive()
+        archive_stats = archive.stats()
+    except ImportError:
+        archive, archive_stats = None, None
+    
+    freq = st.selectbox("> PERIOD", ["D", "W", "M"], format_func={"D": "day", "W": "week", "M": "month"}.get, key="hist_freq")
+    rates = detection_rates(store, archive, start_date, end_date, freq, store.revision(),
+                            tuple(sorted(archive_stats.items())) if archive_stats else None)
+    if len(rates):
+        import plotly.express as px
+        fig = px.line(rates, x='period', y='rate', color='family', markers=True)
+        fig.update_layout(paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
+                          font=dict(color='#888', size=9, family='Fira Code'),
+                          xaxis=dict(gridcolor='rgba(0,240,255,0.1)'),
+                          yaxis=dict(gridcolor='rgba(0,240,255,0.1)', tickformat='.1%'),
+                          margin=dict(l=0, r=0, t=0, b=0), height=260)
+        st.plotly_chart(fig, use_container_width=True)
+    else:
+        st.markdown("<div style='font-family: Fira Code; color: #999; font-size: 0.7rem;'>> no malware detections in range</div>", unsafe_allow_html=True)
+    
+    if archive is None:
+        st.markdown("<div style='font-family: Fira Code; color: #999; font-size: 0.7rem;'>> long-term archive disabled :: pip install pyarrow</div>", unsafe_allow_html=True)
+        return
+    st.markdown(f"<div style='font-family: Fira Code; color: #999; font-size: 0.7rem;'>> archive :: {archive_stats['rows']:,} verdicts in {archive_stats['files']} files over {archive_stats['days']} days ({format_bytes(archive_stats['bytes'])})</div>", unsafe_allow_html=True)
+    c1, c2, c3 = st.columns([1, 1, 1])
+    with c1: days = st.number_input("> ARCHIVE_OLDER_THAN (days)", min_value=0, value=7, key="hist_archive_days")
+    with c2:
+        if st.button("🗄 ARCHIVE", use_container_width=True):
+            with st.spinner("> rolling history into parquet..."):
+                moved = archive.roll(store, days)
+            st.success(f"> {moved:,} verdicts archived")
+    with c3:
+        if st.button("🧱 COMPACT", use_container_width=True):
+            with st.spinner("> compacting partitions..."):
+                st.success(f"> {archive.compact()} days compacted")
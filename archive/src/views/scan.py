@@ -0,0 +1,197 @@
+"""SCAN page: upload a feature CSV, run it as a background job and page through the verdicts."""
+
+import time
+import pandas as pd
+import streamlit as st
+import tracing
+from tracing import Tracer
+from scan_pipeline import ThreatScanner
+from results_view import SORT_COLUMNS
+from ui import (cyber_metric, get_drift_monitor, get_job_manager, get_path, get_report_link, get_results_view,
+                get_replay_buffer, get_scan_preprocessor, get_shadow_scorer, get_verdict_cache, require_dataset,
+                save_history_many)
+
+JOB_NOT_FOUND = "> job not found (finished jobs are kept for a limited time)"
+
+# Most rows one click may confirm as predicted
+MAX_BULK_CONFIRM = 100
+
+def render(settings):
+    dp, df, X_train, X_test, y_train, y_test, y_mal_train, y_mal_test = require_dataset(settings)
+    
+    st.markdown("# THREAT_SCANNER")
+    st.markdown("<p style='font-family: Fira Code; color: #999; font-size: 0.8rem;'>> upload memory dump for ai-powered analysis</p>", unsafe_allow_html=True)
+    
+    st.markdown("<div style='height: 20px'></div>", unsafe_allow_html=True)
+    
+    jobs = get_job_manager()
+    
+    file = st.file_uploader("Upload CSV", type=["csv"])
+    if not file:
+        st.session_state.pop('scan_upload', None)
+    
+    if file:
+        # Parsed once per upload; reruns (including the polling loop while a job runs) reuse the frame
+        parsed = st.session_state.get('scan_upload')
+        if parsed is None or parsed[0] != file.file_id:
+            # Traced on its own; every scan of this upload merges the parse stage into its tracer
+            parse_trace = Tracer(file.name)
+            with parse_trace.stage('scan.parse_csv') as info:
+                upload_df = pd.read_csv(file)
+                info['rows'] = len(upload_df)
+            parsed = (file.file_id, upload_df, parse_trace)
+            st.session_state.scan_upload = parsed
+        _, input_df, parse_trace = parsed
+        
+        st.markdown("<div style='font-family: Fira Code; color: #FF007F; font-size: 0.8rem; margin: 16px 0 8px 0;'>> PREVIEW</div>", unsafe_allow_html=True)
+        st.dataframe(input_df.head(), use_container_width=True)
+        
+        c1, c2, c3 = st.columns([1, 1, 1])
+        with c2:
+            scan = st.button("⚡ EXECUTE_SCAN", use_container_width=True)
+        with c3:
+            profiler = st.selectbox("> PROFILE", ["off", "cprofile", "pyinstrument"], key="scan_profiler", label_visibility="collapsed")
+        
+        if scan:
+            try:
+                tracer = Tracer(file.name, profiler=None if profiler == "off" else profiler)
+                tracer.merge(parse_trace)
+                with tracing.activate(tracer):
+                    scanner = ThreatScanner.from_model_dir(dp.scaler, X_train.columns, dp.get_malware_classes(),
+                                                           model_dir=get_path('models'), dtype=dp.dtype,
+                                                           cache=get_verdict_cache(), fast_mlp=settings['fast_mlp'],
+                                                           drift=get_drift_monitor(settings),
+                                                           preprocessor=get_scan_preprocessor(settings))
+                    scanner.shadow = get_shadow_scorer(scanner)
+                job_id = jobs.submit(scanner, input_df, on_batch=save_history_many, label=file.name, tracer=tracer)
+                st.session_state.scan_job = job_id
+                # Raw rows of the latest scan, so verdicts can be confirmed into the replay buffer
+                st.session_state.scan_inputs = {job_id: input_df}
+                st.query_params["job"] = job_id
+            except Exception as e:
+                st.error(f"> ERROR: {e}")
+                st.info("> run TRAIN_MODELS first")
+    
+    # Reattach to a queued, running or finished job (survives reruns and browser refresh)
+    st.markdown("<div style='font-family: Fira Code; color: #999; font-size: 0.7rem; margin: 16px 0 4px 0;'>> JOB_ID</div>", unsafe_allow_html=True)
+    job_id = st.text_input("job", st.session_state.get('scan_job') or st.query_params.get("job", ""), label_visibility="collapsed")
+    job = jobs.get(job_id.strip()) if job_id else None
+    
+    if job_id and job is None:
+        st.info(JOB_NOT_FOUND)
+    
+    if job is not None:
+        st.session_state.scan_job = job.job_id
+        if job.status == "queued":
+            st.progress(0, f"> queued :: position {jobs.queue_position(job.job_id)}")
+        elif job.status == "running":
+            st.progress(job.fraction, f"> scanning {job.rows_done:,}/{job.total_rows:,} rows :: {job.elapsed():.1f}s")
+        
+        if job.is_active:
+            time.sleep(0.5)
+            st.rerun()
+        elif job.status == "failed":
+            st.error(f"> ERROR: {job.error}")
+            st.info("> run TRAIN_MODELS first")
+        else:
+            view = get_results_view(job.job_id)
+            if view is None:
+                # Evicted between the lookup above and now
+                st.info(JOB_NOT_FOUND)
+                return
+            summary = view.summary()
+            st.progress(1.0, f"> scan complete :: {job.total_rows:,} rows in {job.elapsed():.1f}s")
+            if 'cache_hits' in job.stats:
+                st.markdown(f"<div style='font-family: Fira Code; color: #999; font-size: 0.7rem;'>> verdict_cache :: {job.stats['cache_hits']:,} hits / {job.stats['cache_misses']:,} misses ({job.stats['cache_hit_rate']*100:.1f}%) :: {job.stats['rows_scored']:,} rows scored by models</div>", unsafe_allow_html=True)
+            
+            if job.stats.get('shadow'):
+                sh = job.stats['shadow']
+                st.markdown(f"<div style='font-family: Fira Code; color: #999; font-size: 0.7rem;'>> model {job.stats.get('model_version', '')} :: shadow {sh['shadow']} agrees on {sh['status_agreement']*100:.1f}% of {sh['rows']:,} rows ({sh['skipped_batches']} batches skipped)</div>", unsafe_allow_html=True)
+            
+            if job.stats.get('drift_alert'):
+                st.warning(f"> feature drift vs training data :: {', '.join(job.stats['drifted_features'][:5])} :: see DIAGNOSTICS")
+            
+            st.markdown("---")
+            st.markdown("<div style='font-family: Orbitron; color: #00F0FF; font-size: 1rem; letter-spacing: 2px; margin-bottom: 16px;'>> RESULTS</div>", unsafe_allow_html=True)
+            
+            c1, c2, c3, c4 = st.columns(4)
+            with c1: st.markdown(cyber_metric(summary['scanned'], "SCANNED", "#00F0FF"), unsafe_allow_html=True)
+            with c2: st.markdown(cyber_metric(summary['benign'], "BENIGN", "#00FF9F"), unsafe_allow_html=True)
+            with c3: st.markdown(cyber_metric(summary['malware'], "MALWARE", "#FF007F"), unsafe_allow_html=True)
+            with c4: st.markdown(cyber_metric(summary['anomalies'], "ANOMALIES", "#FFFF00"), unsafe_allow_html=True)
+            
+            st.markdown("<div style='height: 20px'></div>", unsafe_allow_html=True)
+            
+            # Filter, sort and page server-side; only the visible page is sent to the browser
+            f1, f2, f3, f4, f5 = st.columns([1, 1, 1, 1, 1])
+            with f1: status_f = st.selectbox("> STATUS", ["All", "Malware", "Benign"], key="res_status")
+            with f2: family_f = st.selectbox("> FAMILY", ["All"] + view.families(), key="res_family")
+            with f3: sort_by = st.selectbox("> SORT_BY", SORT_COLUMNS, key="res_sort")
+            with f4: descending = st.checkbox("DESCENDING", key="res_desc")
+            with f5: anomalies_only = st.checkbox("ANOMALIES_ONLY", key="res_anom")
+            
+            positions = view.query(status_f, family_f, anomalies_only, sort_by, not descending)
+            
+            p1, p2 = st.columns([1, 3])
+            with p1: page_size = st.selectbox("> ROWS_PER_PAGE", [25, 50, 100, 250], key="res_size")
+            n_pages = view.page_count(positions, page_size)
+            if st.session_state.get("res_page", 1) > n_pages:
+                st.session_state.res_page = 1
+            with p2: page_no = st.number_input(f"> PAGE (of {n_pages})", min_value=1, max_value=n_pages, value=1, key="res_page") - 1
+            
+            page_df = view.page(positions, page_no, page_size)
+            st.dataframe(page_df, use_container_width=True, hide_index=True)
+            st.markdown(f"<div style='font-family: Fira Code; color: #999; font-size: 0.7rem;'>> {len(positions):,} matching rows</div>", unsafe_allow_html=True)
+            
+            # Drill-down renders widgets for the selected row only
+            if len(page_df):
+                page_positions = positions[page_no * page_size:page_no * page_size + page_size]
+                sel = st.selectbox("> INSPECT_SAMPLE", page_positions,
+                                   format_func=lambda p: f"SAMPLE_{int(view.frame['sample_id'].iat[p])}", key="res_inspect")
+                r = view.row(sel)
+                icon = "🔴" if r['status'] == 'Malware' else "🟢"
+                st.markdown(f"<div style='font-family: Fira Code; color: #eee; margin: 8px 0;'>{icon} SAMPLE_{r['sample_id']} :: {r['status'].upper()} :: {r['confidence']:.0f}%</div>", unsafe_allow_html=True)
+                c1, c2, c3 = st.columns(3)
+                c1.metric("> STATUS", r['status'])
+                c2.metric("> CONFIDENCE", f"{r['confidence']:.1f}%")
+                c3.metric("> ANOMALY_SCORE", f"{r['anomaly_score']:.3f}")
+                if r['status'] == 'Malware':
+                    st.info(f"🦠 FAMILY: **{r['type']}**")
+                
+                # Confirmed labels feed incremental model updates (TRAIN_MODELS > FEEDBACK)
+                inputs = st.session_state.get('scan_inputs', {}).get(job.job_id)
+                if inputs is not None:
+                    classes = list(dp.get_malware_classes())
+                    predicted = r['type'] if r['status'] == 'Malware' and r['type'] in classes else 'Benign'
+                    prep = get_scan_preprocessor(settings)
+                    buffer = get_replay_buffer(X_train.shape[1])
+                    k1, k2, k3 = st.columns([1, 1, 1])
+                    with k1: confirmed = st.selectbox("> CONFIRM_AS", classes, index=classes.index(predicted) if predicted in classes else 0, key="res_confirm")
+                    with k2:
+                        if st.button("✔ CONFIRM_LABEL", use_container_width=True):
+                            buffer.add(prep.extract(inputs.iloc[[r['sample_id']]]), [int(confirmed != 'Benign')], [confirmed])
+                            st.success(f"> SAMPLE_{r['sample_id']} confirmed as {confirmed}")
+                    with k3:
+                        # Bulk confirmation feeds the models their own verdicts (self-training), so it is limited
+                        # to the rows on screen, which the analyst has reviewed, and capped
+                        shown = page_positions[:MAX_BULK_CONFIRM]
+                        if st.button(f"✔ CONFIRM_{len(shown)}_SHOWN_AS_PREDICTED", use_container_width=True,
+                                     help="Self-training: stores the models' own verdicts for these rows as confirmed labels. Review them first."):
+                            matched = view.frame.iloc[shown]
+                            labels = (matched['status'] == 'Malware').astype(int).tolist()
+                            types = ['Benign' if s == 'Benign' else (t if t in classes and t != 'Benign' else None)
+                                     for s, t in zip(matched['status'], matched['type'])]
+                            buffer.add(prep.extract(inputs.iloc[matched['sample_id'].to_numpy()]), labels, types)
+                            st.success(f"> {len(matched):,} reviewed verdicts confirmed as predicted")
+            
+            st.markdown("---")
+            link = get_report_link(job.job_id) or JOB_NOT_FOUND
+            
+            st.markdown(f"""
+            <div class="glass-card" style="text-align: center;">
+                <div style="font-size: 2rem; margin-bottom: 8px;">📄</div>
+                <div style="font-family: 'Orbitron'; color: #00F0FF; text-shadow: 0 0 10px #00F0FF;">> REPORT_GENERATED</div>
+                <div style="font-family: 'Fira Code'; color: #999; font-size: 0.8rem; margin: 8px 0;">forensic analysis complete</div>
+                {link}
+            </div>
+            """, unsafe_allow_html=True)
@@ -0,0 +1,212 @@
+"""TRAIN page: fit the ensemble, the optimized MLP and the anomaly detector, and compare models by CV."""
+
+import os
+import time
+import pandas as pd
+import streamlit as st
+import tracing
+from tracing import Tracer
+from advanced_models import AdvancedModelTrainer
+from training_orchestrator import TrainingOrchestrator, data_hash
+from ui import cyber_metric, file_token, get_model_registry, get_path, get_replay_buffer, require_dataset
+
+@st.cache_data(max_entries=2)
+def cv_table(report_path, token):
+    # token changes when a new CV report is written
+    from evaluation import comparison_table, load_report
+    report = load_report(report_path)
+    return report, comparison_table(report)
+
+def register_version(X_train, y_train, note, params, metrics, started):
+    """Snapshots the freshly saved models in the registry; reports when a pinned version stays live."""
+    registry = get_model_registry()
+    try:
+        version = registry.register(dataset_hash=data_hash(X_train, y_train), params=params, metrics=metrics,
+                                    training_seconds=time.perf_counter() - started, note=note)
+    except FileNotFoundError as e:
+        st.info(f"> not registered :: {e}")
+        return
+    state = registry.state()
+    if state['active'] != version:
+        st.warning(f"> registered {version} :: pinned version {state['active']} stays live")
+    else:
+        st.markdown(f"<div style='font-family: Fira Code; color: #999; font-size: 0.7rem;'>> model version {version}</div>", unsafe_allow_html=True)
+
+def render(settings):
+    dp, df, X_train, X_test, y_train, y_test, y_mal_train, y_mal_test = require_dataset(settings)
+    
+    st.markdown("# MODEL_TRAINING")
+    st.markdown("<p style='font-family: Fira Code; color: #999; font-size: 0.8rem;'>> initialize and optimize ai detection models</p>", unsafe_allow_html=True)
+    
+    st.markdown("<div style='height: 20px'></div>", unsafe_allow_html=True)
+    
+    t1, t2, t3, t4, t5, t6 = st.tabs(["⚡ ENSEMBLE", "🧠 NEURAL_NET", "🔍 ANOMALY", "🔁 FEEDBACK", "📊 BENCHMARK", "🗂 REGISTRY"])
+    
+    with t1:
+        st.markdown("""<div class="glass-card"><div style="font-family: 'Orbitron'; color: #00F0FF; text-shadow: 0 0 5px #00F0FF;">> SUPER_LEARNER_ENSEMBLE</div><div style="font-family: 'Fira Code'; color: #999; font-size: 0.8rem; margin-top: 4px;">RF + LogReg + MLP combined classifier</div></div>""", unsafe_allow_html=True)
+        st.markdown("<div style='height: 12px'></div>", unsafe_allow_html=True)
+        if st.button("TRAIN_ENSEMBLE", key="ens"):
+            p = st.progress(0, "> initializing...")
+            started = time.perf_counter()
+            st.session_state.train_trace = Tracer("train_ensemble")
+            with tracing.activate(st.session_state.train_trace):
+                # Members already fitted on this split are reused from the fit cache
+                orch = TrainingOrchestrator(X_train, y_train, X_test, y_test, y_mal_train, y_mal_test, search_mlp=False)
+                p.progress(30, "> training ensemble..."); orch.fit_members(); orch.build_ensemble()
+                p.progress(60, "> training multiclass..."); orch.fit_malware_type_model()
+                p.progress(90, "> saving models..."); orch.save_models(names=('Ensemble', 'Multiclass', 'RandomForest')); dp.save_artifacts()
+            p.progress(100, "> complete")
+            st.success("> ensemble trained successfully")
+            results = orch.evaluate()
+            register_version(X_train, y_train, "TRAIN_ENSEMBLE", {'search_mlp': False},
+                             {name: r['accuracy'] for name, r in results.items()}, started)
+    
+    with t2:
+        st.markdown("""<div class="glass-card"><div style="font-family: 'Orbitron'; color: #FF007F; text-shadow: 0 0 5px #FF007F;">> OPTIMIZED_MLP</div><div style="font-family: 'Fira Code'; color: #999; font-size: 0.8rem; margin-top: 4px;">neural network with hyperparameter tuning</div></div>""", unsafe_allow_html=True)
+        st.markdown("<div style='height: 12px'></div>", unsafe_allow_html=True)
+        if st.button("TRAIN_MLP", key="mlp"):
+            with st.spinner("> optimizing neural network..."):
+                started = time.perf_counter()
+                st.session_state.train_trace = Tracer("train_mlp")
+                with tracing.activate(st.session_state.train_trace):
+                    adv = AdvancedModelTrainer(X_train, y_train, X_test, y_test, y_mal_train, y_mal_test)
+                    adv.build_and_optimize_mlp()
+                    adv.save_models()
+                    dp.save_artifacts()
+                st.success("> mlp trained successfully")
+            register_version(X_train, y_train, "TRAIN_MLP", adv.best_model.get_params(),
+                             {'MLP': float((adv.best_model.predict(X_test) == y_test).mean())}, started)
+    
+    with t3:
+        st.markdown("""<div class="glass-card"><div style="font-family: 'Orbitron'; color: #00FF9F; text-shadow: 0 0 5px #00FF9F;">> ISOLATION_FOREST</div><div style="font-family: 'Fira Code'; color: #999; font-size: 0.8rem; margin-top: 4px;">detect novel threats & zero-day attacks :: benign baseline, calibrated threshold</div></div>""", unsafe_allow_html=True)
+        st.markdown("<div style='height: 12px'></div>", unsafe_allow_html=True)
+        c1, c2 = st.columns(2)
+        with c1: baseline = st.selectbox("BASELINE", ["benign", "all"], key="anom_baseline")
+        with c2: target_fpr = st.select_slider("BENIGN_FLAG_RATE", options=[0.001, 0.005, 0.01, 0.02, 0.05], value=0.01, key="anom_fpr")
+        if st.button("TRAIN_DETECTOR", key="anom"):
+            with st.spinner("> training anomaly detector..."):
+                started = time.perf_counter()
+                st.session_state.train_trace = Tracer("train_detector")
+                with tracing.activate(st.session_state.train_trace):
+                    adv = AdvancedModelTrainer(X_train, y_train, X_test, y_test, y_mal_train, y_mal_test)
+                    adv.train_anomaly_detector(baseline=baseline, target_fpr=target_fpr)
+                    adv.save_models()
+                    dp.save_artifacts()
+                st.session_state.anom_calibration = adv.anomaly_model.calibration_
+                st.success("> detector trained successfully")
+            register_version(X_train, y_train, "TRAIN_DETECTOR", {'baseline': baseline, 'target_fpr': target_fpr},
+                             {'anomaly': adv.anomaly_model.calibration_}, started)
+        cal = st.session_state.get('anom_calibration')
+        if cal:
+            c1, c2, c3 = st.columns(3)
+            with c1: st.markdown(cyber_metric(f"{cal['benign_flag_rate']:.2%}", "BENIGN_FLAGGED", "#00FF9F"), unsafe_allow_html=True)
+            with c2: st.markdown(cyber_metric(f"{cal.get('malware_flag_rate', 0):.2%}", "MALWARE_FLAGGED", "#FF007F"), unsafe_allow_html=True)
+            with c3: st.markdown(cyber_metric(f"{cal['threshold']:.4f}", "THRESHOLD", "#00F0FF"), unsafe_allow_html=True)
+    
+    with t4:
+        st.markdown("""<div class="glass-card"><div style="font-family: 'Orbitron'; color: #FFFF00; text-shadow: 0 0 5px #FFFF00;">> INCREMENTAL_UPDATE</div><div style="font-family: 'Fira Code'; color: #999; font-size: 0.8rem; margin-top: 4px;">fold analyst-confirmed verdicts into the saved models, gated on validation accuracy</div></div>""", unsafe_allow_html=True)
+        st.markdown("<div style='height: 12px'></div>", unsafe_allow_html=True)
+        buffer = get_replay_buffer(X_train.shape[1])
+        counts = buffer.counts()
+        c1, c2 = st.columns(2)
+        with c1: st.markdown(cyber_metric(f"{counts['pending']:,}", "PENDING_CONFIRMED", "#FFFF00"), unsafe_allow_html=True)
+        with c2: st.markdown(cyber_metric(f"{counts['used']:,}", "REPLAY_POOL", "#00F0FF"), unsafe_allow_html=True)
+        st.markdown("<div style='height: 12px'></div>", unsafe_allow_html=True)
+        if st.button("UPDATE_FROM_FEEDBACK", key="incr", disabled=counts['pending'] == 0):
+            from incremental import IncrementalUpdater
+            with st.spinner("> updating models..."):
+                st.session_state.train_trace = Tracer("incremental_update")
+                try:
+                    with tracing.activate(st.session_state.train_trace), tracing.stage('train.incremental', rows=counts['pending']):
+                        updater = IncrementalUpdater(dp.scaler, X_train.columns, dp.get_malware_classes(),
+                                                     model_dir=get_path('models'), dtype=dp.dtype)
+                        st.session_state.incr_report = updater.update(buffer, X_test, y_test, y_mal_test)
+                except FileNotFoundError:
+                    st.info("> run TRAIN_ENSEMBLE first")
+        report = st.session_state.get('incr_report')
+        if report and report['models']:
+            st.markdown(f"<div style='font-family: Fira Code; color: #999; font-size: 0.7rem;'>> last update :: {report['rows']:,} confirmed rows + {report['replayed']:,} replayed</div>", unsafe_allow_html=True)
+            st.dataframe(pd.DataFrame([{**m, 'changes': ", ".join(f"{k}: {v}" for k, v in m['changes'].items()) or "none"}
+                                       for m in report['models']]), use_container_width=True, hide_index=True)
+    
+    with t5:
+        st.markdown("""<div class="glass-card"><div style="font-family: 'Orbitron'; color: #00F0FF; text-shadow: 0 0 5px #00F0FF;">> CROSS_VALIDATED_BENCHMARK</div><div style="font-family: 'Fira Code'; color: #999; font-size: 0.8rem; margin-top: 4px;">stratified k-fold accuracy, per-family F1, ROC-AUC, latency and size for every model</div></div>""", unsafe_allow_html=True)
+        st.markdown("<div style='height: 12px'></div>", unsafe_allow_html=True)
+        report_path = get_path('models/cv_report.json')
+        folds = st.select_slider("FOLDS", options=[3, 5, 10], value=5, key="cv_folds")
+        if st.button("RUN_CV", key="cv"):
+            from evaluation import cross_validate
+            with st.spinner(f"> running {folds}-fold cross-validation..."):
+                st.session_state.train_trace = Tracer("cross_validate")
+                with tracing.activate(st.session_state.train_trace):
+                    # Returns the saved report without refitting when data, folds and models are unchanged
+                    cross_validate(X_train, y_train, y_mal_train, dp.get_malware_classes(), n_splits=folds,
+                                   path=report_path)
+        token = file_token(report_path)
+        if token is None:
+            st.info("> no benchmark yet :: run RUN_CV")
+        else:
+            report, table = cv_table(report_path, token)
+            st.markdown(f"<div style='font-family: Fira Code; color: #999; font-size: 0.7rem;'>> {report['n_splits']}-fold CV on {report['rows']:,} rows :: {report['created']}</div>", unsafe_allow_html=True)
+            st.dataframe(table, use_container_width=True, hide_index=True,
+                         column_config={'ms_per_1k': st.column_config.NumberColumn("ms / 1k rows", format="%.1f"),
+                                        'size_kb': st.column_config.NumberColumn("size (KB)", format="%.0f")})
+    
+    with t6:
+        st.markdown("""<div class="glass-card"><div style="font-family: 'Orbitron'; color: #FF007F; text-shadow: 0 0 5px #FF007F;">> MODEL_REGISTRY</div><div style="font-family: 'Fira Code'; color: #999; font-size: 0.8rem; margin-top: 4px;">versioned models :: activate, pin, shadow-score and promote</div></div>""", unsafe_allow_html=True)
+        st.markdown("<div style='height: 12px'></div>", unsafe_allow_html=True)
+        registry = get_model_registry()
+        versions = registry.versions()
+        state = registry.state()
+        if not versions:
+            st.info("> no versions yet :: train a model to register one")
+        else:
+            c1, c2, c3 = st.columns(3)
+            with c1: st.markdown(cyber_metric(state['active'] or "-", "ACTIVE" + (" (PINNED)" if state['pinned'] else ""), "#00FF9F"), unsafe_allow_html=True)
+            with c2: st.markdown(cyber_metric(state['shadow'] or "-", "SHADOW", "#FFFF00"), unsafe_allow_html=True)
+            with c3: st.markdown(cyber_metric(len(versions), "VERSIONS", "#00F0FF"), unsafe_allow_html=True)
+            st.markdown("<div style='height: 12px'></div>", unsafe_allow_html=True)
+            st.dataframe(pd.DataFrame([{'version': m['version'], 'created': m['created'], 'note': m.get('note', ''),
+                                        'active': m['active'], 'shadow': m['shadow'],
+                                        'train_s': m.get('training_seconds'),
+                                        'metrics': ", ".join(f"{k}: {v:.4f}" for k, v in m.get('metrics', {}).items()
+                                                             if isinstance(v, float))}
+                                       for m in versions]), use_container_width=True, hide_index=True)
+            selected = st.selectbox("> VERSION", [m['version'] for m in versions], key="reg_version")
+            b1, b2, b3, b4 = st.columns(4)
+            with b1:
+                if st.button("ACTIVATE", key="reg_activate", use_container_width=True):
+                    registry.activate(selected)
+                    st.rerun()
+            with b2:
+                if st.button("UNPIN" if state['pinned'] else "PIN_ACTIVE", key="reg_pin", use_container_width=True):
+                    registry.set_pinned(not state['pinned'])
+                    st.rerun()
+            with b3:
+                if st.button("SET_SHADOW", key="reg_shadow", use_container_width=True, disabled=selected == state['active']):
+                    registry.set_shadow(selected)
+                    st.rerun()
+            with b4:
+                if st.button("PROMOTE_SHADOW", key="reg_promote", use_container_width=True, disabled=not state['shadow']):
+                    registry.promote_shadow()
+                    st.rerun()
+            reports = registry.shadow_reports()
+            if reports:
+                st.markdown("<div style='font-family: Fira Code; color: #999; font-size: 0.7rem; margin-top: 12px;'>> SHADOW_COMPARISONS</div>", unsafe_allow_html=True)
+                st.dataframe(pd.DataFrame(reports), use_container_width=True, hide_index=True)
+    
+    st.markdown("---")
+    st.markdown("<div style='font-family: Orbitron; color: #FF007F; font-size: 0.9rem; letter-spacing: 2px;'>> MODEL_STATUS</div>", unsafe_allow_html=True)
+    st.markdown("<div style='height: 12px'></div>", unsafe_allow_html=True)
+    
+    models = {"ENSEMBLE": "models/ensemble.pkl", "MULTICLASS": "models/mlp_multiclass.pkl", "MLP": "models/mlp_optimized.pkl", "ANOMALY": "models/anomaly_detector.pkl", "RF": "models/RandomForest.pkl"}
+    
+    cols = st.columns(len(models))
+    for i, (n, p) in enumerate(models.items()):
+        with cols[i]:
+            ok = os.path.exists(get_path(p))
+            color = "#00FF9F" if ok else "#FF007F"
+            st.markdown(f"""<div style="text-align: center; padding: 14px; background: rgba(5,5,5,0.8); border-radius: 6px; border: 1px solid {color}; border-left: 3px solid {color};">
+                <div style="font-size: 1.2rem; color: {color}; text-shadow: 0 0 10px {color};">{'✓' if ok else '✗'}</div>
+                <div style="font-family: 'Fira Code'; font-size: 0.6rem; color: #999; margin-top: 4px;">{n}</div>
+            </div>""", unsafe_allow_html=True)
@@ -0,0 +1,210 @@
+"""
+Watch mode: scores Volatility feature CSVs dropped into a directory.
+
+New files and rows appended to existing files are scored incrementally
+with already-loaded models and appended to the history store. A
+checkpoint of byte offsets per file means restarts do not rescan, and only
+complete lines are consumed, so files still being written are tailed
+safely.
+
+The checkpoint advances after every batch handed to the history store, so
+a failure part way through a chunk never re-emits the batches before it.
+Rows that do not parse to numeric features are appended to
+<drop-dir>/rejected/<file> instead of being retried, and a file whose
+header lacks feature columns is skipped until it is replaced.
+
+    python src/watcher.py --drop-dir drop/ --history scan_history.db
+"""
+
+import argparse
+import glob
+import io
+import json
+import os
+import time
+import pandas as pd
+
+class DirectoryWatcher:
+    """Polls `drop_dir` for *.csv feature exports and scores new complete rows."""
+
+    def __init__(self, drop_dir, scanner, on_batch=None, checkpoint_path=None, pattern="*.csv",
+                 settle_seconds=5.0, max_chunk_bytes=64 * 1024 * 1024, rejected_dir=None):
+        self.drop_dir = drop_dir
+        self.scanner = scanner
+        self.on_batch = on_batch
+        self.checkpoint_path = checkpoint_path or os.path.join(drop_dir, ".watch_checkpoint.json")
+        self.pattern = pattern
+        self.settle_seconds = settle_seconds
+        self.max_chunk_bytes = max_chunk_bytes
+        self.rejected_dir = rejected_dir or os.path.join(drop_dir, "rejected")
+        self.checkpoint = self._load_checkpoint()
+
+    def _load_checkpoint(self):
+        if os.path.exists(self.checkpoint_path):
+            with open(self.checkpoint_path, 'r') as f:
+                try: return json.load(f)
+                except ValueError: print("Checkpoint unreadable; starting from scratch.")
+        return {}
+
+    def _save_checkpoint(self):
+        tmp = self.checkpoint_path + ".tmp"
+        with open(tmp, 'w') as f:
+            json.dump(self.checkpoint, f, indent=2)
+        os.replace(tmp, self.checkpoint_path)
+
+    def _read_complete(self, path, offset, size, settled):
+        """Bytes from `offset` up to the last newline (or EOF once the file has settled)."""
+        with open(path, 'rb') as f:
+            f.seek(offset)
+            data = f.read(min(size - offset, self.max_chunk_bytes))
+        if settled and offset + len(data) == size:
+            # The file stopped growing, so a final line without a newline is complete
+            return data
+        return data[:data.rfind(b"\n") + 1]
+
+    def process_file(self, path):
+        """Scores whatever is new in one file; returns the number of rows scored."""
+        st = os.stat(path)
+        key = os.path.abspath(path)
+        state = self.checkpoint.get(key)
+        if state is None or st.st_size < state['offset'] or state.get('inode') != st.st_ino:
+            # New file, or truncated/replaced: start over
+            state = {'offset': 0, 'rows': 0, 'header': None, 'inode': st.st_ino}
+        if st.st_size == state['offset'] or state.get('rejected'):
+            return 0
+
+        settled = time.time() - st.st_mtime >= self.settle_seconds
+        scored = rejected = 0
+        while state['offset'] < st.st_size:
+            data = self._read_complete(path, state['offset'], st.st_size, settled)
+            if not data:
+                break
+            if state['header'] is None:
+                header, sep, data = data.partition(b"\n")
+                state['header'] = header.decode(errors='replace').rstrip("\r")
+                state['offset'] += len(header) + len(sep)
+                missing = self._missing_columns(state['header'])
+                if missing:
+                    state['rejected'] = f"missing feature columns: {missing[:5]}"
+                    self._commit(key, state)
+                    print(f"Rejected {path}: {state['rejected']}")
+                    return 0
+                self._commit(key, state)
+            lines = data.splitlines(keepends=True)
+            for start in range(0, len(lines), self.scanner.batch_size):
+                chunk = lines[start:start + self.scanner.batch_size]
+                rows = [line for line in chunk if line.strip()]
+                if rows:
+                    n_scored = self._score(path, state['header'], rows, state['rows'])
+                    scored += n_scored
+                    rejected += len(rows) - n_scored
+                    state['rows'] += len(rows)
+                # Emitted batches are never re-read, even if a later batch fails
+                state['offset'] += sum(len(line) for line in chunk)
+                self._commit(key, state)
+        if scored or rejected:
+            note = f", {rejected} rejected rows in {self.rejected_dir}" if rejected else ""
+            print(f"{os.path.basename(path)}: scored {scored} new rows ({state['rows']} total{note})")
+        return scored
+
+    def _commit(self, key, state):
+        self.checkpoint[key] = state
+        self._save_checkpoint()
+
+    def _missing_columns(self, header):
+        columns = set(pd.read_csv(io.StringIO(header + "\n")).columns)
+        return [f for f in self.scanner.preprocessor.feature_names if f not in columns]
+
+    def _parse(self, header, rows):
+        """Numeric feature frame of the rows that parse, and the raw lines of those that do not."""
+        names = self.scanner.preprocessor.feature_names
+        head = header.encode() + b"\n"
+        try:
+            frame = pd.read_csv(io.BytesIO(head + b"".join(rows)))
+            if len(frame) != len(rows):
+                raise ValueError("row count mismatch")
+        except ValueError:
+            # A malformed line breaks the whole block; find it line by line
+            frames, bad = [], []
+            for i, line in enumerate(rows):
+                try:
+                    one = pd.read_csv(io.BytesIO(head + line))
+                except ValueError:
+                    one = None
+                if one is None or len(one) != 1:
+                    bad.append(i)
+                else:
+                    frames.append(one[names].set_axis([i]))
+            frame = pd.concat(frames) if frames else pd.DataFrame(columns=names)
+        else:
+            bad = []
+            frame = frame[names]
+        features = frame.apply(pd.to_numeric, errors='coerce')
+        invalid = features.isna().any(axis=1)
+        bad = sorted(bad + list(features.index[invalid]))
+        return features[~invalid], [rows[i] for i in bad]
+
+    def _score(self, path, header, rows, first_sample_id):
+        """Scores one batch of raw lines; returns how many were scored (the rest are quarantined)."""
+        features, bad = self._parse(header, rows)
+        if bad:
+            self._quarantine(path, header, bad)
+        if not len(features):
+            return 0
+        records = self.scanner.score_batch(self.scanner.preprocessor.transform(features))
+        # Sample ids stay the row numbers within the file, skipping rejected rows
+        for record, i in zip(records, features.index):
+            record['sample_id'] = first_sample_id + int(i)
+        if self.on_batch is not None:
+            self.on_batch(records)
+        return len(records)
+
+    def _quarantine(self, path, header, lines):
+        os.makedirs(self.rejected_dir, exist_ok=True)
+        target = os.path.join(self.rejected_dir, os.path.basename(path))
+        new = not os.path.exists(target)
+        with open(target, 'ab') as f:
+            if new:
+                f.write(header.encode() + b"\n")
+            f.writelines(line if line.endswith(b"\n") else line + b"\n" for line in lines)
+
+    def poll_once(self):
+        total = 0
+        for path in sorted(glob.glob(os.path.join(self.drop_dir, self.pattern))):
+            try:
+                total += self.process_file(path)
+            except Exception as e:
+                print(f"Skipping {path}: {e}")
+        return total
+
+    def run(self, interval=2.0):
+        print(f"Watching {self.drop_dir} for {self.pattern} (checkpoint: {self.checkpoint_path})")
+        try:
+            while True:
+                self.poll_once()
+                time.sleep(interval)
+        except KeyboardInterrupt:
+            print("Watcher stopped.")
+
+if __name__ == "__main__":
+    from history_store import HistoryStore
+    from scoring_service import build_scanner
+
+    parser = argparse.ArgumentParser(description="Score feature CSVs dropped into a directory")
+    parser.add_argument("--drop-dir", required=True)
+    parser.add_argument("--history", default="scan_history.db")
+    parser.add_argument("--checkpoint")
+    parser.add_argument("--models", default="models")
+    parser.add_argument("--artifacts", default="models/preprocessor.pkl")
+    parser.add_argument("--interval", type=float, default=2.0)
+    parser.add_argument("--settle-seconds", type=float, default=5.0)
+    parser.add_argument("--once", action="store_true", help="process what is there now and exit")
+    args = parser.parse_args()
+
+    scanner = build_scanner(args.artifacts, args.models)
+    watcher = DirectoryWatcher(args.drop_dir, scanner, on_batch=HistoryStore(args.history).append_many,
+                               checkpoint_path=args.checkpoint, settle_seconds=args.settle_seconds)
+    if args.once:
+        watcher.poll_once()
+    else:
+        watcher.run(args.interval)
@@ -0,0 +1,28 @@
+import os
+import sys
+import numpy as np
+import pytest
+
+SRC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+sys.path.insert(0, SRC)
+
+@pytest.fixture(scope="session")
+def synthetic_frame():
+    """A small MalMem-shaped frame (Category, Class and the feature columns) from data_info.txt."""
+    from synthetic_data import MalMemSynthesizer
+    return MalMemSynthesizer.from_description().sample(400, np.random.default_rng(0))
+
+@pytest.fixture
+def synthetic_csv(synthetic_frame, tmp_path):
+    path = tmp_path / "malmem_small.csv"
+    synthetic_frame.to_csv(path, index=False)
+    return str(path)
+
+@pytest.fixture
+def split(synthetic_csv, tmp_path):
+    """DataPreprocessor split of the synthetic CSV, with its split indices kept in tmp_path."""
+    from data_preprocessing import DataPreprocessor
+    dp = DataPreprocessor(synthetic_csv)
+    X_train, X_test, y_train, y_test, y_mal_train, y_mal_test = dp.split_data(
+        split_path=str(tmp_path / "split_indices.npz"))
+    return dp, X_train, X_test, y_train, y_test, y_mal_train, y_mal_test
@@ -0,0 +1,48 @@
+import os
+import threading
+import numpy as np
+import pandas as pd
+from drift import DriftMonitor, load_or_create
+
+def _train(seed=0):
+    return pd.DataFrame(np.random.default_rng(seed).normal(size=(2000, 4)), columns=list("abcd"))
+
+def test_load_or_create_skips_training_rows_when_reference_matches(tmp_path):
+    path = str(tmp_path / "drift_state.npz")
+    monitor = load_or_create(path, _train, reference_key="data.csv|1|float64")
+    monitor.update(np.random.default_rng(1).normal(size=(600, 4)))
+    monitor.save()
+
+    def fail():
+        raise AssertionError("training rows should not be loaded")
+    saved = load_or_create(path, fail, reference_key="data.csv|1|float64")
+    assert saved.rows_seen == 600 and saved.path == path
+
+    # A different key rebuilds from the training rows; same profile keeps the scanned counts
+    calls = []
+    rebuilt = load_or_create(path, lambda: calls.append(1) or _train(), reference_key="data.csv|2|float64")
+    assert calls and rebuilt.rows_seen == 600 and rebuilt.reference_key == "data.csv|2|float64"
+    fresh = load_or_create(path, lambda: _train(seed=5), reference_key="other.csv|1|float64")
+    assert fresh.rows_seen == 0
+
+def test_concurrent_saves(tmp_path):
+    monitor = DriftMonitor.from_training(_train())
+    monitor.path = str(tmp_path / "drift_state.npz")
+    errors = []
+
+    def worker(seed):
+        try:
+            for _ in range(10):
+                monitor.update(np.random.default_rng(seed).normal(size=(100, 4)))
+                monitor.save()
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert not errors
+    assert os.listdir(tmp_path) == ["drift_state.npz"]
+    assert DriftMonitor.load(monitor.path).rows_seen == 6000
@@ -0,0 +1,23 @@
+import json
+from evaluation import comparison_table, cross_validate
+
+def test_cross_validate_report(split, tmp_path):
+    dp, X_train, _, y_train, _, y_mal_train, _ = split
+    path = str(tmp_path / "cv_report.json")
+    report = cross_validate(X_train, y_train, y_mal_train, dp.get_malware_classes(), n_splits=2, n_jobs=1, path=path)
+
+    assert set(report) == {'key', 'created', 'n_splits', 'rows', 'families', 'models'}
+    assert set(report['models']) == {'LogisticRegression', 'DecisionTree', 'RandomForest', 'MLP', 'Ensemble',
+                                     'Multiclass'}
+    for name, r in report['models'].items():
+        assert set(r) == {'task', 'accuracy', 'roc_auc', 'family_f1', 'latency_ms_per_1k', 'size_bytes'}
+        assert 0.0 <= r['accuracy']['mean'] <= 1.0
+        assert set(r['family_f1']) == (set(report['families']) if name == 'Multiclass'
+                                       else set(report['families']) - {'Benign'})
+    with open(path) as f:
+        assert json.load(f)['key'] == report['key']
+    assert not list(tmp_path.glob("*.tmp"))
+    # Unchanged data and folds return the saved report
+    assert cross_validate(X_train, y_train, y_mal_train, dp.get_malware_classes(), n_splits=2, n_jobs=1,
+                          path=path)['created'] == report['created']
+    assert len(comparison_table(report)) == len(report['models'])
@@ -0,0 +1,105 @@
+import json
+import os
+import sqlite3
+import threading
+from types import SimpleNamespace
+from history_store import HistoryFilter, HistoryStore, HistoryWriter
+
+def _records(n, day="2024-01-02", offset=0):
+    return [dict(timestamp=f"{day} 10:00:00", sample_id=offset + i, status="Malware" if i % 2 else "Benign",
+                 type="Trojan" if i % 2 else "N/A", model_version="v1") for i in range(n)]
+
+def test_writer_commits_concurrent_submits(tmp_path):
+    store = HistoryStore(str(tmp_path / "h.db"))
+    writer = HistoryWriter(store)
+
+    def job(k):
+        for b in range(50):
+            writer.submit(_records(10, offset=k * 1000 + b * 10))
+    threads = [threading.Thread(target=job, args=(k,)) for k in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert writer.flush(timeout=10)
+    assert store.count() == 4000 and writer.written == 4000 and writer.dropped == 0
+
+def test_verify_moves_corrupt_database_aside(tmp_path):
+    path = tmp_path / "h.db"
+    path.write_bytes(b"not a database" * 100)
+    store = HistoryStore(str(path), verify=True)
+    assert store.count() == 0
+    assert any(f.startswith("h.db.corrupt-") for f in os.listdir(tmp_path))
+
+def test_verify_leaves_locked_database_alone(tmp_path, monkeypatch, capsys):
+    path = str(tmp_path / "h.db")
+    HistoryStore(path).append_many(_records(5))
+    con = sqlite3.connect(path)
+    con.execute("PRAGMA journal_mode=DELETE")
+    con.execute("BEGIN EXCLUSIVE")
+    connect = sqlite3.connect
+    monkeypatch.setattr(sqlite3, "connect", lambda p, timeout=5.0: connect(p, timeout=0.1))
+    try:
+        assert HistoryStore.verify(SimpleNamespace(db_path=path))
+    finally:
+        monkeypatch.undo()
+        con.rollback()
+        con.close()
+    assert "check skipped" in capsys.readouterr().out
+    assert not any(".corrupt-" in f for f in os.listdir(tmp_path))
+    assert HistoryStore(path).count() == 5
+
+def test_truncated_legacy_json_is_salvaged(tmp_path):
+    text = json.dumps(_records(5, day="2024-01-01"), indent=2)
+    legacy = tmp_path / "scan_history.json"
+    legacy.write_text(text[:len(text) * 2 // 3])
+    store = HistoryStore(str(tmp_path / "h.db"), legacy_json=str(legacy))
+    assert 0 < store.count() < 5
+    n = store.count()
+    assert HistoryStore(str(tmp_path / "h.db"), legacy_json=str(legacy)).count() == n
+
+def test_revision_changes_when_rows_are_added_or_cleared(tmp_path):
+    store = HistoryStore(str(tmp_path / "h.db"))
+    empty = store.revision()
+    store.append_many(_records(3))
+    filled = store.revision()
+    assert filled != empty and filled[0] == 3
+    assert store.revision() == filled
+    store.clear()
+    assert store.revision()[0] == 0
+
+def test_filtered_pages_and_type_list_need_no_sort(tmp_path):
+    store = HistoryStore(str(tmp_path / "h.db"))
+    store.append_many(_records(20))
+    con = sqlite3.connect(store.db_path)
+    for column in ("status", "type", "is_anomaly"):
+        plan = con.execute(f"EXPLAIN QUERY PLAN SELECT * FROM verdicts WHERE {column} = ? ORDER BY id DESC LIMIT 100",
+                           ("x",)).fetchall()
+        assert not any("TEMP B-TREE" in row[-1] for row in plan), plan
+    con.close()
+    assert store.malware_types() == ["Trojan"]
+
+def test_cached_counts_expire_and_clear_drops_them(tmp_path):
+    store = HistoryStore(str(tmp_path / "h.db"), cache_ttl=60)
+    malware = HistoryFilter("Malware")
+    store.append_many(_records(4))
+    assert store.count(malware) == 2
+    store.append_many(_records(4, offset=4))
+    assert store.count(malware) == 2
+    store._cache = {k: (t - 61, v) for k, (t, v) in store._cache.items()}
+    assert store.summary(malware) == {'total': 4, 'malware': 4}
+    store.clear()
+    assert store.count(malware) == 0 and store.malware_types() == []
+
+def test_total_is_a_running_counter(tmp_path):
+    path = str(tmp_path / "h.db")
+    store = HistoryStore(path, cache_ttl=5, recount_seconds=60)
+    store.append_many(_records(3))
+    assert store.total() == 3
+    store.append_many(_records(2, offset=3))
+    HistoryStore(path).append_many(_records(4, offset=5))  # another process
+    assert store.count() == 5
+    store._total = (store._total[0] - 61, store._total[1])
+    assert store.count() == 9
+    store.clear()
+    assert store.total() == 0
@@ -0,0 +1,21 @@
+import numpy as np
+from incremental import ReplayBuffer
+
+def _add(buffer, n, start):
+    X = np.arange(start, start + n, dtype=np.float64).reshape(n, 1).repeat(3, axis=1)
+    buffer.add(X, [1] * n, ["Trojan"] * n)
+
+def test_capacity_drops_used_rows_first(tmp_path):
+    buffer = ReplayBuffer(str(tmp_path / "h.db"), 3, capacity=10)
+    _add(buffer, 6, 0)
+    buffer.mark_used(buffer.pending()[0])
+    _add(buffer, 6, 6)
+    assert buffer.counts() == {'pending': 6, 'used': 4}
+
+def test_capacity_bounds_pending_rows(tmp_path):
+    buffer = ReplayBuffer(str(tmp_path / "h.db"), 3, capacity=10)
+    _add(buffer, 8, 0)
+    _add(buffer, 8, 8)
+    assert buffer.counts() == {'pending': 10, 'used': 0}
+    _, X, _, _ = buffer.pending()
+    assert X[0, 0] == 6 and X[-1, 0] == 15
@@ -0,0 +1,34 @@
+import os
+import joblib
+import numpy as np
+import pandas as pd
+from pipeline import build_training_pipeline
+from training_orchestrator import MODEL_FILES
+
+def test_pipeline_publishes_loadable_models(synthetic_csv, tmp_path):
+    models_dir = tmp_path / "models"
+    pipe = build_training_pipeline(synthetic_csv, str(tmp_path / ".pipeline"), str(models_dir), search_mlp=False,
+                                   n_select=0, max_workers=2)
+    pipe.run(['publish'])
+
+    assert all(rec['status'] == 'done' for rec in pipe.state.values())
+    for filename in MODEL_FILES.values():
+        assert (models_dir / filename).exists(), filename
+    art = joblib.load(models_dir / "preprocessor.pkl")
+    assert set(art) == {'scaler', 'feature_names', 'malware_classes', 'dtype'}
+    assert art['malware_classes'] == ['Benign', 'Ransomware', 'Spyware', 'Trojan']
+
+    # The published ensemble scores rows scaled with the published scaler
+    df = pd.read_csv(synthetic_csv)
+    X = pd.DataFrame(art['scaler'].transform(df[art['feature_names']].to_numpy()), columns=art['feature_names'])
+    proba = joblib.load(models_dir / "ensemble.pkl").predict_proba(X)
+    assert proba.shape == (len(df), 2)
+    np.testing.assert_allclose(proba.sum(axis=1), 1.0)
+
+def test_pipeline_rerun_is_cached(synthetic_csv, tmp_path):
+    args = (synthetic_csv, str(tmp_path / ".pipeline"), str(tmp_path / "models"))
+    build_training_pipeline(*args, search_mlp=False, n_select=0).run(['publish'])
+    pipe = build_training_pipeline(*args, search_mlp=False, n_select=0)
+    pipe.run(['publish'])
+    assert pipe.state['RandomForest']['status'] == 'cached'
+    assert os.path.exists(tmp_path / "models" / "ensemble.pkl")
@@ -0,0 +1,18 @@
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import StandardScaler
+from scan_pipeline import ScanPreprocessor
+
+def test_transform_matches_scaler_on_shuffled_mixed_columns():
+    rng = np.random.default_rng(0)
+    features = [f"f{i}" for i in range(6)]
+    frame = pd.DataFrame({f: (rng.gamma(2.0, 50.0, 500).astype(np.int64) if i % 2 else rng.normal(size=500))
+                          for i, f in enumerate(features)})
+    frame['Class'] = 'Benign'
+    upload = frame[['Class'] + features[::-1]]
+    scaler = StandardScaler().fit(frame[features])
+    prep = ScanPreprocessor(scaler, features)
+    X = prep.transform(upload)
+    assert X.shape == (500, 6)
+    np.testing.assert_allclose(X, scaler.transform(frame[features]))
+    np.testing.assert_array_equal(prep.extract(upload.iloc[10:20]), frame[features].to_numpy(np.float64)[10:20])
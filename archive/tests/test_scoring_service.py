@@ -0,0 +1,73 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+from types import SimpleNamespace
+import numpy as np
+import pytest
+from scoring_service import MicroBatcher, make_server, score_rows
+
+class FakeScanner:
+    model_version = "test"
+    preprocessor = SimpleNamespace(feature_names=['x'], transform=lambda frame: frame[['x']].to_numpy(np.float64))
+
+    def score_batch(self, scaled):
+        return [{'sample_id': 100 + i, 'status': 'Malware' if x else 'Benign'} for i, x in enumerate(scaled[:, 0])]
+
+def test_failing_on_batch_does_not_block_callers():
+    calls = []
+
+    def on_batch(records):
+        calls.append(records)
+        raise RuntimeError("history sink down")
+
+    batcher = MicroBatcher(FakeScanner(), max_wait_ms=1, on_batch=on_batch)
+    try:
+        first = batcher.score([{'x': 1}, {'x': 0}], timeout=5)
+        second = batcher.score([{'x': 0}], timeout=5)
+    finally:
+        batcher.close()
+    assert [v['sample_id'] for v in first] == [0, 1]
+    assert [v['status'] for v in second] == ['Benign']
+    assert len(calls) == 2
+
+def test_on_batch_gets_copies_of_the_verdicts():
+    seen = []
+    batcher = MicroBatcher(FakeScanner(), max_wait_ms=1, on_batch=seen.extend)
+    try:
+        verdicts = batcher.score([{'x': 1}, {'x': 1}], timeout=5)
+    finally:
+        batcher.close()
+    assert [r['sample_id'] for r in seen] == [100, 101]
+    assert not any(r is v for r in seen for v in verdicts)
+
+def test_malformed_request_fails_alone():
+    batcher = MicroBatcher(FakeScanner(), max_wait_ms=200)
+    try:
+        good = batcher.submit([{'x': 1}, {'x': 0}])
+        bad = batcher.submit([{'x': 'abc'}])
+        other = batcher.submit([{'x': 0}])
+        assert [v['status'] for v in good.result(timeout=5)] == ['Malware', 'Benign']
+        assert [v['status'] for v in other.result(timeout=5)] == ['Benign']
+        with pytest.raises(ValueError):
+            bad.result(timeout=5)
+    finally:
+        batcher.close()
+
+def test_http_endpoint_scores_and_rejects():
+    server, batcher = make_server(FakeScanner(), port=0, max_wait_ms=1)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        assert [v['status'] for v in score_rows(url, [{'x': 1}, {'x': 0}])] == ['Malware', 'Benign']
+        with urllib.request.urlopen(url + "/health", timeout=5) as resp:
+            health = json.loads(resp.read())
+        assert health['status'] == 'ok' and health['model_version'] == 'test' and health['rows'] == 2
+        with pytest.raises(urllib.error.HTTPError) as err:
+            score_rows(url, [{'y': 1}])
+        assert err.value.code == 400
+    finally:
+        server.shutdown()
+        server.server_close()
+        batcher.close()
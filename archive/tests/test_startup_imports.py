@@ -0,0 +1,18 @@
+import os
+import sys
+import pytest
+
+pytest.importorskip("streamlit")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks'))
+import startup_budget
+
+def test_app_startup_is_within_budget():
+    best, loaded = startup_budget.measure()
+    assert loaded == []
+    assert best < startup_budget.BUDGET_SECONDS, f"app.py imports took {best:.3f}s"
+
+@pytest.mark.parametrize("page", startup_budget.PAGES)
+def test_page_imports_only_its_own_deferred_modules(page):
+    if page == "dashboard":
+        pytest.importorskip("plotly")
+    assert startup_budget.page_violations(page) == []
@@ -0,0 +1,44 @@
+import threading
+import time
+import tracing
+from tracing import Tracer
+
+def test_nested_stages_are_not_double_counted():
+    tracer = Tracer("run")
+    with tracing.activate(tracer):
+        with tracing.stage('pipeline.fit'):
+            with tracing.stage('train.fit'):
+                with tracing.stage('train.fit.rf') as info:
+                    time.sleep(0.05)
+                    info['rows'] = 10
+    stages = tracer.to_dict()['stages']
+    assert [(s['stage'], s['parent']) for s in stages] == [
+        ('train.fit.rf', 'train.fit'), ('train.fit', 'pipeline.fit'), ('pipeline.fit', None)]
+    assert stages[0]['rows'] == 10
+    assert abs(tracer.total_seconds() - tracer.stages['pipeline.fit']['seconds']) < 1e-9
+
+def test_parallel_top_level_stages_count_once():
+    tracer = Tracer("run")
+
+    def work(name):
+        with tracing.activate(tracer), tracing.stage(name):
+            time.sleep(0.2)
+
+    threads = [threading.Thread(target=work, args=(f"pipeline.s{i}",)) for i in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert sum(s['seconds'] for s in tracer.stages.values()) > 0.75
+    assert tracer.total_seconds() < 0.4
+
+def test_merge_adds_earlier_stages():
+    parse = Tracer("upload")
+    with parse.stage('scan.parse_csv', rows=5):
+        pass
+    scan = Tracer("upload")
+    with scan.stage('scan.ensemble', rows=5):
+        pass
+    scan.merge(parse)
+    assert scan.stages['scan.parse_csv']['rows'] == 5
+    assert len(scan.spans) == 2
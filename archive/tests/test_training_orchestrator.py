@@ -0,0 +1,65 @@
+import os
+import threading
+import time
+import numpy as np
+from sklearn.base import clone
+from sklearn.ensemble import VotingClassifier
+from training_orchestrator import DEFAULT_MLP, ENSEMBLE_MEMBERS, MEMBERS, FitCache, prefit_voting
+
+def test_prefit_voting_matches_fitted_voting_classifier(split):
+    dp, X_train, X_test, y_train, y_test, _, _ = split
+    estimators = dict(MEMBERS, MLP=DEFAULT_MLP)
+    named = [(short, clone(estimators[name])) for short, name in ENSEMBLE_MEMBERS]
+    reference = VotingClassifier(estimators=named, voting='soft').fit(X_train, y_train)
+
+    prefit = prefit_voting([(short, clone(estimators[name]).fit(X_train, y_train)) for short, name in ENSEMBLE_MEMBERS],
+                           y_train)
+    np.testing.assert_array_equal(prefit.predict(X_test), reference.predict(X_test))
+    np.testing.assert_allclose(prefit.predict_proba(X_test), reference.predict_proba(X_test))
+    assert prefit.n_features_in_ == X_train.shape[1]
+    assert list(prefit.feature_names_in_) == list(X_train.columns)
+
+def test_fit_cache_evicts_least_recently_used(tmp_path, split):
+    _, X_train, _, y_train, _, _, _ = split
+    cache = FitCache(str(tmp_path / "cache"), max_bytes=1 << 40)
+    cache.get_or_fit('LogisticRegression', MEMBERS['LogisticRegression'], X_train, y_train)
+    old = os.path.join(cache.cache_dir, os.listdir(cache.cache_dir)[0])
+    os.utime(old, (time.time() - 100, time.time() - 100))
+    cache.max_bytes = os.path.getsize(old) + 1
+    cache.get_or_fit('DecisionTree', MEMBERS['DecisionTree'], X_train, y_train)
+    names = os.listdir(cache.cache_dir)
+    assert len(names) == 1 and names[0].startswith('DecisionTree-')
+
+def test_fit_cache_evicts_expired_entries(tmp_path, split):
+    _, X_train, _, y_train, _, _, _ = split
+    cache = FitCache(str(tmp_path / "cache"), max_age_days=1)
+    cache.get_or_fit('DecisionTree', MEMBERS['DecisionTree'], X_train, y_train)
+    path = os.path.join(cache.cache_dir, os.listdir(cache.cache_dir)[0])
+    os.utime(path, (time.time() - 3 * 86400, time.time() - 3 * 86400))
+    assert cache.prune() == 1 and not os.listdir(cache.cache_dir)
+
+def test_fit_cache_concurrent_writers_of_one_key(tmp_path, split):
+    _, X_train, _, y_train, _, _, _ = split
+    cache_dir = str(tmp_path / "cache")
+    barrier, errors = threading.Barrier(8, timeout=30), []
+
+    def fit():
+        try:
+            for r in range(5):
+                barrier.wait()  # every thread misses the same key, then they all write it
+                FitCache(cache_dir).get_or_fit('DecisionTree', MEMBERS['DecisionTree'], X_train, y_train,
+                                               data_key=f"round{r}")
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=fit) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(60)
+    assert errors == []
+    names = sorted(os.listdir(cache_dir))
+    assert len(names) == 5 and all(n.endswith('.pkl') for n in names)
+    cache = FitCache(cache_dir)
+    cache.get_or_fit('DecisionTree', MEMBERS['DecisionTree'], X_train, y_train, data_key="round0")
+    assert cache.hits == 1
@@ -0,0 +1,30 @@
+import os
+import threading
+import numpy as np
+from verdict_cache import VerdictCache
+
+def test_concurrent_saves_leave_a_complete_file(tmp_path):
+    path = str(tmp_path / "verdict_cache.pkl")
+    cache = VerdictCache(path=path)
+    rows = np.random.default_rng(0).normal(size=(2000, 8))
+    keys = cache.keys_for(rows, "v1")
+    errors = []
+
+    def worker(i):
+        try:
+            for j in range(20):
+                cache.put_many({keys[(i * 20 + j) % len(keys)]: {'status': 'Benign', 'n': j}})
+                cache.save()
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert not errors
+    assert [f for f in os.listdir(tmp_path) if f != "verdict_cache.pkl"] == []
+    reloaded = VerdictCache(path=path)
+    assert len(reloaded.entries) == len(cache.entries)
@@ -0,0 +1,54 @@
+import json
+import os
+from types import SimpleNamespace
+from watcher import DirectoryWatcher
+
+class FakeScanner:
+    batch_size = 3
+    preprocessor = SimpleNamespace(feature_names=['x'], transform=lambda frame: frame.to_numpy())
+
+    def score_batch(self, scaled, offset=0):
+        return [{'sample_id': offset + i, 'status': 'Malware' if v > 3 else 'Benign'} for i, v in enumerate(scaled[:, 0])]
+
+def _watcher(tmp_path, history):
+    drop = tmp_path / "drop"
+    drop.mkdir(exist_ok=True)
+    return DirectoryWatcher(str(drop), FakeScanner(), on_batch=history.extend, settle_seconds=0), drop
+
+def test_bad_rows_are_quarantined_not_rescored(tmp_path):
+    history = []
+    watcher, drop = _watcher(tmp_path, history)
+    (drop / "dump.csv").write_text("x\n1\n2\n3\n4\nabc\n6\n")
+    for _ in range(3):
+        watcher.poll_once()
+    assert [r['sample_id'] for r in history] == [0, 1, 2, 3, 5]
+    assert (drop / "rejected" / "dump.csv").read_text() == "x\nabc\n"
+    state = json.load(open(watcher.checkpoint_path))[os.path.abspath(drop / "dump.csv")]
+    assert state['offset'] == os.path.getsize(drop / "dump.csv") and state['rows'] == 6
+
+def test_failed_batch_does_not_repeat_earlier_batches(tmp_path):
+    history, calls = [], []
+
+    def flaky(records):
+        calls.append(len(records))
+        if len(calls) == 2:
+            raise RuntimeError("history locked")
+        history.extend(records)
+
+    watcher, drop = _watcher(tmp_path, history)
+    watcher.on_batch = flaky
+    (drop / "dump.csv").write_text("x\n1\n2\n3\n4\n5\n6\n7\n")
+    watcher.poll_once()
+    assert [r['sample_id'] for r in history] == [0, 1, 2]
+    watcher.poll_once()
+    watcher.poll_once()
+    assert [r['sample_id'] for r in history] == [0, 1, 2, 3, 4, 5, 6]
+
+def test_file_without_feature_columns_is_given_up(tmp_path):
+    history = []
+    watcher, drop = _watcher(tmp_path, history)
+    (drop / "other.csv").write_text("y\n1\n2\n")
+    assert watcher.poll_once() == 0
+    assert watcher.poll_once() == 0
+    assert history == []
+    assert "missing feature columns" in watcher.checkpoint[os.path.abspath(drop / "other.csv")]['rejected']